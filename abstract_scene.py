@@ -1,6 +1,10 @@
 from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from random import Random
 
 from game_object import GameObject
+from profiler import TickProfiler
+from scene_config import SceneConfig
 
 
 class AbstractScene(ABC):
@@ -32,12 +36,23 @@ class AbstractScene(ABC):
         ...
 
     @abstractmethod
-    def get_map(self) -> list[list[GameObject]]:
+    def get_config(self) -> SceneConfig:
+        """
+        Get parameters the scene was created with
+
+        Returns:
+            SceneConfig: scene parameters
+        """
+        ...
+
+    @abstractmethod
+    def get_map(self) -> Sequence[Sequence[GameObject | None]]:
         """
         Get internal scene's map
 
         Returns:
-            list[list[GameObject]]: map
+            Sequence[Sequence[GameObject | None]]: rows of the map, objects in
+            occupied cells and None in empty ones
         """
         ...
 
@@ -74,6 +89,85 @@ class AbstractScene(ABC):
         """
         ...
 
+    @abstractmethod
+    def update_agent_level(self, agent: GameObject, last_level: int) -> None:
+        """
+        Notify the scene that agent's level has changed
+
+        Args:
+            agent (GameObject): agent which level has changed
+            last_level (int): level of the agent before the change
+        """
+        ...
+
+    @abstractmethod
+    def update_agent_saturation(
+        self, agent: GameObject, last_saturation: float
+    ) -> None:
+        """
+        Notify the scene that agent's saturation has changed
+
+        Args:
+            agent (GameObject): agent which saturation has changed
+            last_saturation (float): saturation of the agent before the change
+        """
+        ...
+
+    @abstractmethod
+    def get_agents_levels(self) -> dict[int, int]:
+        """
+        Get amounts of agents by level
+
+        Returns:
+            dict[int, int]: amount of agents of every present level
+        """
+        ...
+
+    @abstractmethod
+    def get_food_levels(self) -> dict[int, int]:
+        """
+        Get amounts of food by level, counted if TelemetryGroup.FOOD_LEVELS is
+        enabled in the config
+
+        Returns:
+            dict[int, int]: amount of food of every present level
+        """
+        ...
+
+    @abstractmethod
+    def get_mean_saturation(self) -> float:
+        """
+        Get mean saturation of agents, counted if TelemetryGroup.MEAN_SATURATION
+        is enabled in the config
+
+        Returns:
+            float: mean saturation, 0 if there are no agents or it isn't
+                counted
+        """
+        ...
+
+    @abstractmethod
+    def get_births_count(self) -> int:
+        """
+        Get amount of agents added during the last tick, counted if
+        TelemetryGroup.BIRTHS_AND_DEATHS is enabled in the config
+
+        Returns:
+            int: amount of born agents
+        """
+        ...
+
+    @abstractmethod
+    def get_deaths_count(self) -> int:
+        """
+        Get amount of agents removed during the last tick, counted if
+        TelemetryGroup.BIRTHS_AND_DEATHS is enabled in the config
+
+        Returns:
+            int: amount of dead agents
+        """
+        ...
+
     @abstractmethod
     def get_width(self) -> int:
         """
@@ -132,6 +226,20 @@ class AbstractScene(ABC):
         """
         ...
 
+    @abstractmethod
+    def add_game_objects(self, objects: list[GameObject]) -> None:
+        """
+        Add game objects to the map at their coordinates at once
+
+        Args:
+            objects (list[GameObject]): game objects
+
+        Raises:
+            ValueError: a cell of an object is taken or shared by several
+                objects, nothing is added then
+        """
+        ...
+
     @abstractmethod
     def remove_game_object(self, game_object: GameObject) -> None:
         """
@@ -155,6 +263,18 @@ class AbstractScene(ABC):
         """
         ...
 
+    @abstractmethod
+    def get_random(self) -> Random:
+        """
+        Get random generator of the scene. It's seeded from the config, and
+        factories and objects of the scene draw all their random choices from
+        it, so a run with a seed is reproducible
+
+        Returns:
+            Random: random generator
+        """
+        ...
+
     @abstractmethod
     def get_random_empty_cell(self) -> tuple[int, int] | None:
         """
@@ -165,6 +285,20 @@ class AbstractScene(ABC):
         """
         ...
 
+    @abstractmethod
+    def get_random_empty_cells(self, amount: int) -> list[tuple[int, int]]:
+        """
+        Get several distinct random empty cells at once
+
+        Args:
+            amount (int): amount of cells to pick
+
+        Returns:
+            list[tuple[int, int]]: coordinates of empty cells, fewer than amount
+            if there are not enough of them
+        """
+        ...
+
     @abstractmethod
     def is_agent_near(self, coords: tuple[int, int]) -> bool:
         """
@@ -224,5 +358,41 @@ class AbstractScene(ABC):
     def update(self) -> None:
         """
         Proceed and increase ticks count. Update every game object in the scene
+
+        Objects act once per tick in row-major order of their positions at the
+        start of the tick. An object removed during the tick doesn't act if its
+        turn hasn't come yet, and an object added during the tick first acts on
+        the next tick. Factories are updated after all objects.
+        """
+        ...
+
+    @abstractmethod
+    def track_dirty_cells(self) -> None:
+        """
+        Start recording cells whose look changes: an object is added, removed
+        or moved, or changes its level. Cells aren't recorded until a renderer
+        asks for them, so headless runs don't pay for it
+        """
+        ...
+
+    @abstractmethod
+    def pop_dirty_cells(self) -> set[tuple[int, int]]:
+        """
+        Get cells changed since the tracking started or the last call, and
+        start recording anew
+
+        Returns:
+            set[tuple[int, int]]: coordinates of changed cells
+        """
+        ...
+
+    @abstractmethod
+    def set_profiler(self, profiler: TickProfiler | None) -> None:
+        """
+        Set profiler to record phases of update in. Update isn't profiled
+        when the profiler is None
+
+        Args:
+            profiler (TickProfiler | None): profiler
         """
         ...
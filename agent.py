@@ -1,36 +1,53 @@
 from abc import ABC, abstractmethod
 from copy import deepcopy
 from math import copysign
-from random import choice
 
 from abstract_scene import AbstractScene
 from game_object import GameObject
+from scene_config import SceneConfig
+from spawn_distribution import SpawnDistribution, UniformDistribution
 
 # oxo
 # xox
 # oxo
 _WALKING_VECTORS = [(0, 1), (0, -1), (1, 0), (-1, 0)]
 
+_UNIFORM_DISTRIBUTION = UniformDistribution()
+
 
 class UnableToSpawnException(Exception): ...
 
 
 class AgentFactory:
-    def __init__(self, scene: AbstractScene) -> None:
+    def __init__(self, scene: AbstractScene, config: SceneConfig | None = None) -> None:
         self._scene = scene
+        self._config = config or scene.get_config()
 
         scene.add_factory(self)
 
-    def spawn_radom(self, amount: int) -> None:
+    def spawn_initial(self) -> None:
+        """
+        Spawn initial population of agents from the config at random positions
+        """
+        self.spawn_radom(self._config.initial_agents)
+
+    def spawn_radom(
+        self, amount: int, distribution: SpawnDistribution | None = None
+    ) -> None:
         """
-        Spawn amount of agents at random positions
+        Spawn amount of agents at random positions, they're added to the scene
+        at once
 
         Args:
             amount (int): amount of agents to spawn
+            distribution (SpawnDistribution | None, optional): positions of the
+                agents. Defaults to uniformly random empty cells.
         """
-        for _ in range(amount):
-            coords = self._scene.get_random_empty_cell()
-            self.spawn(coords)
+        cells = (distribution or _UNIFORM_DISTRIBUTION).sample(self._scene, amount)
+
+        self._scene.add_game_objects(
+            [Agent(coords, self._scene, self) for coords in cells]
+        )
 
     def spawn(self, coords: tuple[int, int], agent=None):
         """
@@ -55,9 +72,7 @@ class AgentFactory:
         Raises:
             UnableToSpawnException: can't spawn agent near parent agent
         """
-        self._scene.increment_spawned_from()
-
-        square_coords = self._scene.get_square_coords(agent._coords)
+        square_coords = self._scene.get_square_coords_in_bounds(agent._coords)
 
         square_coords = list(
             filter(lambda c: self._scene.is_cell_empty(c), square_coords)
@@ -66,7 +81,9 @@ class AgentFactory:
         if not square_coords:
             raise UnableToSpawnException(f"Can't spawn agent near {agent.get_coords()}")
 
-        random_coords = choice(square_coords)
+        self._scene.increment_spawned_from()
+
+        random_coords = self._scene.get_random().choice(square_coords)
 
         new_agent = Agent(random_coords, agent._scene, self, level=agent._level)
         new_agent._saturation = agent._saturation // 2
@@ -79,6 +96,16 @@ class AgentFactory:
 
 
 class Agent(GameObject):
+    __slots__ = (
+        "_level",
+        "_saturation",
+        "_scene",
+        "_agent_factory",
+        "_experience",
+        "_random_walk_vector",
+        "_state",
+    )
+
     def __init__(
         self,
         coords: tuple[int, int],
@@ -96,6 +123,36 @@ class Agent(GameObject):
 
         self.update_state()
 
+    @classmethod
+    def restore(
+        cls,
+        coords: tuple[int, int],
+        scene,
+        agent_factory: AgentFactory | None,
+        level: int,
+        saturation: float,
+        experience: int,
+        random_walk_vector: tuple[int, int] | None,
+    ) -> "Agent":
+        """
+        Create an agent in the given state, e.g. loaded from a snapshot
+
+        Returns:
+            Agent: restored agent
+        """
+        agent = cls.__new__(cls)
+        agent._coords = coords
+        agent._level = level
+        agent._saturation = saturation
+        agent._scene = scene
+        agent._agent_factory = agent_factory
+        agent._experience = experience
+        agent._random_walk_vector = random_walk_vector
+        agent._is_asleep = False
+        agent.update_state()
+
+        return agent
+
     def get_saturation(self) -> float:
         """
         Get level of saturation
@@ -103,6 +160,9 @@ class Agent(GameObject):
         Returns:
             float: saturation of the agent
         """
+        if self._is_asleep:
+            self._scene.catch_up(self)
+
         return self._saturation
 
     def get_level(self) -> int:
@@ -176,13 +236,13 @@ class Agent(GameObject):
         max_saturation = self.get_max_saturation()
 
         if max_saturation * 0.8 <= self._saturation <= max_saturation:
-            self._state = AgentSaturatedState(self)
+            self._state = AGENT_SATURATED_STATE
         elif max_saturation * 0.3 <= self._saturation <= max_saturation * 0.8:
-            self._state = AgentHungryState(self)
+            self._state = AGENT_HUNGRY_STATE
         elif self._saturation > 0:
-            self._state = AgentExhastedState(self)
+            self._state = AGENT_EXHAUSTED_STATE
         else:
-            self._state = AgentDeadState(self)
+            self._state = AGENT_DEAD_STATE
 
     def _levelup(self) -> None:
         """
@@ -190,6 +250,8 @@ class Agent(GameObject):
         """
         self._level += 1
 
+        self._scene.update_agent_level(self, self._level - 1)
+
     def _can_move(self, vector) -> bool:
         coords = (self._coords[0] + vector[0], self._coords[1] + vector[1])
 
@@ -240,7 +302,7 @@ class Agent(GameObject):
         vectors = deepcopy(_WALKING_VECTORS)
 
         while vectors:
-            vector = choice(vectors)
+            vector = self._scene.get_random().choice(vectors)
 
             self._random_walk_vector = vector
 
@@ -284,6 +346,7 @@ class Agent(GameObject):
         Make agents to act
         """
         last_coords = self._coords
+        last_saturation = self._saturation
 
         # try eat another agent
         if self._scene.is_agent_near(self._coords):
@@ -304,10 +367,11 @@ class Agent(GameObject):
                         self._scene.move_game_object(last_coords, coords)
                         self._scene.increment_agents_ate_count()
                         self._experience = agent.get_experience()
+                        self._scene.update_agent_saturation(self, last_saturation)
                         return
 
         self.update_state()
-        self._state.update()
+        self._state.update(self)
 
         # eating
         if self._scene.is_food_near_coords(self._coords):
@@ -329,55 +393,134 @@ class Agent(GameObject):
             self._saturation -= self.get_exhaustion()
             self._scene.move_game_object(last_coords, self._coords)
 
+        self._scene.update_agent_saturation(self, last_saturation)
+
+    def can_sleep(self) -> bool:
+        """
+        Check if the agent would only stand and starve on its next updates,
+        until an agent steps next to it or food appears in its field of view
+
+        Returns:
+            bool: can the agent skip its updates
+        """
+        # saturated and hungry agents walk, so most agents are told apart by
+        # the state of their last update
+        if self._state is not AGENT_EXHAUSTED_STATE:
+            return False
+
+        if not 0 < self._saturation < self.get_max_saturation() * 0.3:
+            return False
+
+        if self._experience >= self.get_exp_requirement():
+            return False
+
+        if self._scene.is_agent_near(self._coords):
+            return False
+
+        return (
+            self._scene.get_nearest_food_coords_by_radius(
+                self._coords, round(self.get_fov())
+            )
+            is None
+        )
+
+    def get_sleep_turns(self) -> int:
+        """
+        Get amount of next updates on which the sleeping agent surely only
+        starves, it dies a few updates after them
+
+        Returns:
+            int: amount of updates
+        """
+        # the agent starves while its saturation is positive, a couple of
+        # updates are kept for rounding errors of repeated subtractions
+        return max(int(self._saturation / self.get_waitng_hunger()) - 2, 0)
+
+    def decay(self, turns: int) -> None:
+        """
+        Starve for the skipped updates as if the agent stood on every one of them
+
+        Args:
+            turns (int): amount of skipped updates
+        """
+        if not turns:
+            return
+
+        last_saturation = self._saturation
+        waiting_hunger = self.get_waitng_hunger()
+
+        # subtracted one by one to get the same float as the updates would
+        for _ in range(turns):
+            self._saturation -= waiting_hunger
+
+        self._scene.update_agent_saturation(self, last_saturation)
+
 
 class AgentState(ABC):
-    """Abstract agent's state"""
+    """
+    Abstract agent's state.
 
-    def __init__(self, agent: Agent) -> None:
-        self._agent = agent
+    States keep no data of their own, so every agent shares the same instance
+    of a state and gets it passed on update.
+    """
 
     @abstractmethod
-    def update(self) -> None:
+    def update(self, agent: Agent) -> None:
         """
         Update agent's internal state according to current agent state
+
+        Args:
+            agent (Agent): agent in this state
         """
         ...
 
 
 class AgentSaturatedState(AgentState):
-    def update(self) -> None:
-        if self._agent._saturation >= self._agent.get_max_saturation() * 0.85:
-            self._agent._agent_factory.spawn_from(self._agent)
-            self._agent._saturation //= 2
+    def update(self, agent: Agent) -> None:
+        if agent._saturation >= agent.get_max_saturation() * 0.85:
+            try:
+                agent._agent_factory.spawn_from(agent)
+            except UnableToSpawnException:
+                # surrounded agent looks for food instead
+                AGENT_HUNGRY_STATE.update(agent)
+                return
+
+            agent._saturation //= 2
         else:
-            AgentHungryState(self._agent).update()
+            AGENT_HUNGRY_STATE.update(agent)
 
 
 class AgentHungryState(AgentState):
-    def update(self) -> None:
-        coords = self._agent._scene.get_nearest_food_coords_by_radius(
-            self._agent._coords, round(self._agent.get_fov())
+    def update(self, agent: Agent) -> None:
+        coords = agent._scene.get_nearest_food_coords_by_radius(
+            agent._coords, round(agent.get_fov())
         )
 
         if coords:
-            self._agent._walk_to(coords)
+            agent._walk_to(coords)
         else:
-            self._agent._walk_random()
+            agent._walk_random()
 
 
 class AgentExhastedState(AgentState):
-    def update(self) -> None:
-        coords = self._agent._scene.get_nearest_food_coords_by_radius(
-            self._agent._coords, round(self._agent.get_fov())
+    def update(self, agent: Agent) -> None:
+        coords = agent._scene.get_nearest_food_coords_by_radius(
+            agent._coords, round(agent.get_fov())
         )
 
         if coords:
-            self._agent._walk_to(coords)
+            agent._walk_to(coords)
         else:
             # just stay and wait
             return
 
 
 class AgentDeadState(AgentState):
-    def update(self) -> None:
-        self._agent._scene.remove_game_object(self._agent)
+    def update(self, agent: Agent) -> None:
+        agent._scene.remove_game_object(agent)
+
+
+AGENT_SATURATED_STATE = AgentSaturatedState()
+AGENT_HUNGRY_STATE = AgentHungryState()
+AGENT_EXHAUSTED_STATE = AgentExhastedState()
+AGENT_DEAD_STATE = AgentDeadState()
@@ -0,0 +1,202 @@
+import threading
+from collections import deque
+from dataclasses import replace
+from enum import Enum
+
+from data_dumper import DataDumper, DataDumpInfo
+
+_DEFAULT_QUEUE_SIZE = 4096
+
+# stats counted per tick, which are added up when records are coalesced
+_PER_TICK_FIELDS = ("births", "deaths", "tick_time")
+
+
+class BackpressurePolicy(Enum):
+    """
+    What to do with a new record when the queue is full
+    """
+
+    # wait until the writer takes a record from the queue
+    BLOCK = "block"
+    # discard the new record
+    DROP = "drop"
+    # merge the new record into the newest queued one, which then covers the
+    # ticks of both: stats of the new record are kept, except for the per tick
+    # ones like births, deaths and tick time, which are added up
+    COALESCE = "coalesce"
+
+
+class DumperClosedException(Exception): ...
+
+
+class BackgroundDataDumper(DataDumper):
+    """
+    Wraps another dumper and passes records to it from a writer thread.
+
+    Dumped records are put into a bounded queue, so the simulation doesn't wait
+    for the wrapped dumper unless the queue is full and the policy is to block.
+    An error raised by the wrapped dumper stops the writer and is raised again
+    from the next call to the background dumper.
+    """
+
+    def __init__(
+        self,
+        dumper: DataDumper,
+        queue_size: int = _DEFAULT_QUEUE_SIZE,
+        policy: BackpressurePolicy = BackpressurePolicy.BLOCK,
+    ) -> None:
+        """
+        Args:
+            dumper (DataDumper): dumper to pass records to, closed on close
+            queue_size (int, optional): max amount of queued records.
+                Defaults to 4096.
+            policy (BackpressurePolicy, optional): what to do with a record
+                when the queue is full. Defaults to BackpressurePolicy.BLOCK.
+        """
+        if queue_size <= 0:
+            raise ValueError(f"Queue size should be positive, got {queue_size}")
+
+        self._dumper = dumper
+        self._queue_size = queue_size
+        self._policy = policy
+
+        self._queue: deque[DataDumpInfo] = deque()
+        self._condition = threading.Condition()
+        self._is_writing = False
+        self._is_closing = False
+        self._is_closed = False
+        self._error: BaseException | None = None
+
+        self._max_queue_depth = 0
+        self._dropped_count = 0
+        self._coalesced_count = 0
+
+        self._writer = threading.Thread(
+            target=self._write, name="BackgroundDataDumper", daemon=True
+        )
+        self._writer.start()
+
+    def get_queue_depth(self) -> int:
+        return len(self._queue)
+
+    def get_max_queue_depth(self) -> int:
+        return self._max_queue_depth
+
+    def get_dropped_count(self) -> int:
+        return self._dropped_count
+
+    def get_coalesced_count(self) -> int:
+        return self._coalesced_count
+
+    def dump(self, data: DataDumpInfo) -> None:
+        with self._condition:
+            self._raise_if_failed()
+
+            if self._is_closing:
+                raise DumperClosedException("Tried to dump to a closed dumper")
+
+            if len(self._queue) >= self._queue_size:
+                if self._policy is BackpressurePolicy.DROP:
+                    self._dropped_count += 1
+                    return
+
+                if self._policy is BackpressurePolicy.COALESCE:
+                    self._queue[-1] = _coalesce(self._queue[-1], data)
+                    self._coalesced_count += 1
+                    return
+
+                self._condition.wait_for(
+                    lambda: len(self._queue) < self._queue_size or self._error
+                )
+                self._raise_if_failed()
+
+            self._queue.append(data)
+            self._max_queue_depth = max(self._max_queue_depth, len(self._queue))
+
+            # the writer only waits for records when the queue is empty
+            if len(self._queue) == 1:
+                self._condition.notify_all()
+
+    def flush(self) -> None:
+        """
+        Wait until the writer passes all queued records and flush the wrapped
+        dumper
+        """
+        with self._condition:
+            self._condition.wait_for(self._is_idle)
+            self._raise_if_failed()
+
+            # the writer waits for new records, so the dumper isn't in use
+            self._dumper.flush()
+
+    def close(self) -> None:
+        """
+        Pass all queued records, stop the writer and close the wrapped dumper
+        """
+        with self._condition:
+            if self._is_closed:
+                return
+
+            self._is_closing = True
+            self._condition.notify_all()
+
+        self._writer.join()
+        self._is_closed = True
+
+        try:
+            self._raise_if_failed()
+        finally:
+            self._dumper.close()
+
+    def _write(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._queue or self._is_closing)
+
+                if not self._queue:
+                    return
+
+                # take all queued records at once, so the writer locks the queue
+                # once per batch instead of once per record
+                batch = list(self._queue)
+                self._queue.clear()
+                self._is_writing = True
+                self._condition.notify_all()
+
+            try:
+                for data in batch:
+                    self._dumper.dump(data)
+            except BaseException as error:
+                with self._condition:
+                    self._error = error
+                    self._is_writing = False
+                    self._queue.clear()
+                    self._condition.notify_all()
+
+                return
+
+            with self._condition:
+                self._is_writing = False
+
+                if not self._queue:
+                    self._condition.notify_all()
+
+    def _is_idle(self) -> bool:
+        return self._error is not None or (not self._queue and not self._is_writing)
+
+    def _raise_if_failed(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+
+def _coalesce(last: DataDumpInfo, data: DataDumpInfo) -> DataDumpInfo:
+    per_tick = {}
+
+    for name in _PER_TICK_FIELDS:
+        last_value = getattr(last, name)
+        value = getattr(data, name)
+
+        if last_value is not None and value is not None:
+            per_tick[name] = last_value + value
+
+    return replace(data, **per_tick)
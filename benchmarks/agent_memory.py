@@ -0,0 +1,104 @@
+"""
+Measures memory taken by game objects and speed of the agents update.
+
+The world keeps the densities of the default 20x20 world and is sized to hold
+the requested amount of agents. Memory is traced while the initial population
+is spawned, so it covers agents, food and their entries in the scene. Agent
+state updates are also timed on their own, apart from the scene queries.
+
+Usage:
+    python -m benchmarks.agent_memory [--ticks N] [agents ...]
+"""
+
+import argparse
+import math
+import time
+import tracemalloc
+
+from agent import Agent, AgentFactory
+from benchmarks.scaling import make_config
+from food import FoodFactory
+from scene import Scene
+
+_DEFAULT_POPULATIONS = [100_000]
+
+
+def measure(agents: int, ticks: int, seed: int = 0) -> dict[str, float]:
+    """
+    Populate a scene and run it for a given amount of ticks
+
+    Args:
+        agents (int): amount of initial agents
+        ticks (int): amount of ticks to run
+        seed (int, optional): random seed. Defaults to 0.
+
+    Returns:
+        dict[str, float]: bytes per game object, peak of a tick in megabytes,
+        ticks per second and agent state updates per second
+    """
+    config = make_config(math.ceil(math.sqrt(agents * 40)), seed)
+    scene = Scene(config)
+
+    tracemalloc.start()
+
+    AgentFactory(scene, config).spawn_initial()
+    FoodFactory(scene, config).spawn_initial()
+
+    objects_memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+
+    scene.update()
+
+    _, tick_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+
+    for _ in range(ticks):
+        scene.update()
+
+    duration = time.perf_counter() - start
+
+    agents_list = [
+        obj for row in scene.get_map() for obj in row if isinstance(obj, Agent)
+    ]
+
+    start = time.perf_counter()
+
+    for agent in agents_list:
+        agent.update_state()
+
+    state_duration = time.perf_counter() - start
+
+    return {
+        "agents": config.initial_agents,
+        "object_bytes": objects_memory / (config.initial_agents + config.initial_food),
+        "tick_peak_mb": (tick_peak - objects_memory) / 2**20,
+        "ticks_per_second": ticks / duration,
+        "state_updates_per_second": len(agents_list) / state_duration,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("agents", nargs="*", type=int, default=_DEFAULT_POPULATIONS)
+    parser.add_argument("--ticks", type=int, default=5)
+    args = parser.parse_args()
+
+    print(
+        f"{'agents':>8} {'B/object':>10} {'tick peak, MB':>14} {'ticks/s':>10} "
+        f"{'states/s':>12}"
+    )
+
+    for agents in args.agents:
+        result = measure(agents, args.ticks)
+
+        print(
+            f"{result['agents']:>8} {result['object_bytes']:>10.1f} "
+            f"{result['tick_peak_mb']:>14.2f} {result['ticks_per_second']:>10.3f} "
+            f"{result['state_updates_per_second']:>12.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Measures a tick in which thousands of agents starve at once.
+
+Every agent is spawned with empty stomach, so the whole population dies
+during the first tick.
+
+Usage:
+    python -m benchmarks.die_off [agents ...]
+"""
+
+import argparse
+import math
+import time
+
+from agent import AgentFactory
+from scene import Scene
+from scene_config import SceneConfig
+
+_DEFAULT_POPULATIONS = [1_000, 5_000, 20_000]
+
+
+def measure(agents: int, seed: int = 0) -> float:
+    """
+    Measure the die-off tick
+
+    Args:
+        agents (int): amount of starving agents
+        seed (int, optional): random seed. Defaults to 0.
+
+    Returns:
+        float: duration of the tick in seconds
+    """
+    # keep the map 10% occupied
+    size = math.ceil(math.sqrt(agents * 10))
+    scene = Scene(
+        SceneConfig(
+            width=size, height=size, initial_agents=agents, initial_food=0, seed=seed
+        )
+    )
+    AgentFactory(scene).spawn_initial()
+
+    for row in scene.get_map():
+        for agent in row:
+            if agent:
+                agent._saturation = 0
+
+    start = time.perf_counter()
+    scene.update()
+    duration = time.perf_counter() - start
+
+    assert scene.get_agents_count() == 0
+
+    return duration
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("agents", nargs="*", type=int, default=_DEFAULT_POPULATIONS)
+    args = parser.parse_args()
+
+    print(f"{'deaths':>8} {'tick, s':>10}")
+
+    for agents in args.agents:
+        print(f"{agents:>8} {measure(agents):>10.4f}")
+
+
+if __name__ == "__main__":
+    main()
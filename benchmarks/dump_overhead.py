@@ -0,0 +1,84 @@
+"""
+Measures the time CSVDumper takes to dump a row of simulation stats.
+
+Rows are prepared in advance, so only the dumping is timed. With --background
+the dumper is wrapped into BackgroundDataDumper and the time the simulation
+thread spends in dump is reported apart from the total time, which includes
+draining the queue and the final flush on close.
+
+Usage:
+    python -m benchmarks.dump_overhead [--rows N] [--background] [flush_every ...]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from background_dumper import BackgroundDataDumper
+from csv_dumper import CSVDumper
+from data_dumper import DataDumpInfo
+
+_DEFAULT_FLUSH_SIZES = [1, 64, 1024, 16384]
+
+
+def measure(
+    rows: list[DataDumpInfo], flush_every: int, background: bool = False
+) -> tuple[float, float]:
+    """
+    Dump rows into a temporary csv file
+
+    Args:
+        rows (list[DataDumpInfo]): rows to dump
+        flush_every (int): amount of rows the dumper buffers
+        background (bool, optional): dump from a writer thread. Defaults to False.
+
+    Returns:
+        tuple[float, float]: time of a single dump call and total time per row
+        including close, in nanoseconds
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        dumper = CSVDumper(os.path.join(directory, "stat.csv"), flush_every)
+
+        if background:
+            dumper = BackgroundDataDumper(dumper)
+
+        start = time.perf_counter()
+
+        with dumper:
+            for row in rows:
+                dumper.dump(row)
+
+            dumped = time.perf_counter()
+
+        closed = time.perf_counter()
+
+        return (
+            (dumped - start) / len(rows) * 1e9,
+            (closed - start) / len(rows) * 1e9,
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "flush_sizes", nargs="*", type=int, default=_DEFAULT_FLUSH_SIZES
+    )
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--background", action="store_true")
+    args = parser.parse_args()
+
+    rows = [
+        DataDumpInfo(tick, tick * 2, tick * 3, tick % 7) for tick in range(args.rows)
+    ]
+
+    print(f"{'flush every':>12} {'ns/dump':>10} {'ns/row total':>13}")
+
+    for flush_every in args.flush_sizes:
+        dump_time, total_time = measure(rows, flush_every, args.background)
+
+        print(f"{flush_every:>12} {dump_time:>10.0f} {total_time:>13.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Compares NumpyScene with the reference Scene on the same worlds.
+
+Worlds keep the densities of the default 20x20 world and grow with the amount
+of agents. For every world both scenes report ticks per second and mean
+population statistics.
+
+Usage:
+    python -m benchmarks.numpy_scene [--ticks N] [agents ...]
+"""
+
+import argparse
+import math
+import time
+
+from agent import AgentFactory
+from benchmarks.scaling import make_config
+from food import FoodFactory
+from numpy_scene import NumpyScene
+from scene import Scene
+
+_DEFAULT_POPULATIONS = [1_000, 10_000, 100_000]
+
+
+def measure(scene_class, size: int, ticks: int, seed: int = 0) -> dict[str, float]:
+    """
+    Populate a scene and run it for a given amount of ticks
+
+    Args:
+        scene_class: scene implementation
+        size (int): map side in cells
+        ticks (int): amount of ticks to run
+        seed (int, optional): random seed. Defaults to 0.
+
+    Returns:
+        dict[str, float]: ticks per second and mean population statistics
+    """
+    config = make_config(size, seed)
+    scene = scene_class(config)
+    AgentFactory(scene, config).spawn_initial()
+    FoodFactory(scene, config).spawn_initial()
+
+    agents_count = 0
+    max_level = 0
+
+    start = time.perf_counter()
+
+    for _ in range(ticks):
+        scene.update()
+
+        agents_count += scene.get_agents_count()
+        max_level += scene.get_max_agents_level()
+
+    duration = time.perf_counter() - start
+
+    return {
+        "ticks_per_second": ticks / duration,
+        "agents": agents_count / ticks,
+        "max_level": max_level / ticks,
+        "eaten": scene.get_agents_ate_count(),
+        "spawned": scene.get_spawned_from(),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("agents", nargs="*", type=int, default=_DEFAULT_POPULATIONS)
+    parser.add_argument("--ticks", type=int, default=5)
+    args = parser.parse_args()
+
+    base_config = make_config(20)
+    density = base_config.initial_agents / (base_config.width * base_config.height)
+
+    print(
+        f"{'agents':>8} {'scene':>12} {'ticks/s':>10} {'mean agents':>12} "
+        f"{'max level':>10} {'eaten':>8} {'spawned':>8}"
+    )
+
+    for agents in args.agents:
+        size = math.ceil(math.sqrt(agents / density))
+        results = {}
+
+        for scene_class in (Scene, NumpyScene):
+            stats = measure(scene_class, size, args.ticks)
+            results[scene_class] = stats
+
+            print(
+                f"{agents:>8} {scene_class.__name__:>12} "
+                f"{stats['ticks_per_second']:>10.2f} {stats['agents']:>12.1f} "
+                f"{stats['max_level']:>10.2f} {stats['eaten']:>8} "
+                f"{stats['spawned']:>8}"
+            )
+
+        speedup = (
+            results[NumpyScene]["ticks_per_second"] / results[Scene]["ticks_per_second"]
+        )
+        print(f"{'':>8} {'speedup':>12} {speedup:>10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Measures speedup of ParallelNumpyScene with the amount of worker processes.
+
+The world keeps the densities of the default 20x20 world and is sized to hold
+the requested amount of agents. Speedup is reported against the serial
+NumpyScene on the same world.
+
+Usage:
+    python -m benchmarks.parallel_scene [--agents N] [--ticks N] [workers ...]
+"""
+
+import argparse
+import math
+import os
+import time
+
+from agent import AgentFactory
+from benchmarks.scaling import make_config
+from food import FoodFactory
+from numpy_scene import NumpyScene
+from parallel_scene import ParallelNumpyScene
+
+
+def measure(scene, ticks: int) -> float:
+    """
+    Populate a scene and run it for a given amount of ticks
+
+    Args:
+        scene: empty scene to run
+        ticks (int): amount of ticks to run
+
+    Returns:
+        float: ticks per second
+    """
+    AgentFactory(scene).spawn_initial()
+    FoodFactory(scene).spawn_initial()
+
+    # the first tick also starts worker processes
+    scene.update()
+
+    start = time.perf_counter()
+
+    for _ in range(ticks):
+        scene.update()
+
+    return ticks / (time.perf_counter() - start)
+
+
+def _get_default_workers() -> list[int]:
+    cpu_count = os.cpu_count() or 1
+
+    return [
+        2**power for power in range(cpu_count.bit_length()) if 2**power < cpu_count
+    ] + [cpu_count]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("workers", nargs="*", type=int)
+    parser.add_argument("--agents", type=int, default=100_000)
+    parser.add_argument("--ticks", type=int, default=10)
+    parser.add_argument("--tile-size", type=int)
+    args = parser.parse_args()
+
+    base_config = make_config(20)
+    density = base_config.initial_agents / (base_config.width * base_config.height)
+    config = make_config(math.ceil(math.sqrt(args.agents / density)))
+
+    serial = measure(NumpyScene(config), args.ticks)
+
+    print(f"{config.width}x{config.height} map, {config.initial_agents} agents")
+    print(f"{'workers':>8} {'ticks/s':>10} {'speedup':>8}")
+    print(f"{'serial':>8} {serial:>10.2f} {1:>7.2f}x")
+
+    for workers in args.workers or _get_default_workers():
+        with ParallelNumpyScene(config, workers, args.tile_size) as scene:
+            ticks_per_second = measure(scene, args.ticks)
+
+        print(
+            f"{workers:>8} {ticks_per_second:>10.2f} {ticks_per_second / serial:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Profiles phases of a headless run and the scene queries called in them.
+
+Prints time spent in every phase of the game loop and the scene update, and
+how many times expensive scene queries were called. The same run is timed
+without the profiler too, to show its overhead. Self times of the phases can
+be written in the folded stacks format for flamegraph.pl or speedscope.
+
+Usage:
+    python -m benchmarks.profile_run [--ticks N] [--numpy] [--folded PATH] [size]
+"""
+
+import argparse
+import time
+
+from benchmarks.scaling import make_config
+from data_dumper import NullDataDumper
+from game import Game
+from null_client import NullGraphicalClient
+from numpy_scene import NumpyScene
+from profiler import TickProfiler
+from scene import Scene
+from scene_config import SceneConfig
+
+
+def measure(
+    config: SceneConfig,
+    ticks: int,
+    scene_class: type = Scene,
+    profiler: TickProfiler | None = None,
+) -> float:
+    """
+    Run a headless game
+
+    Args:
+        config (SceneConfig): world config
+        ticks (int): amount of ticks to run
+        scene_class (type, optional): scene to simulate. Defaults to Scene.
+        profiler (TickProfiler | None, optional): profiler to record the run
+            in. Defaults to None.
+
+    Returns:
+        float: ticks per second
+    """
+    game = Game(NullGraphicalClient(), NullDataDumper(), config, scene_class, profiler)
+
+    start = time.perf_counter()
+    summary = game.run(max_ticks=ticks)
+
+    return summary.ticks / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("size", nargs="?", type=int, default=100)
+    parser.add_argument("--ticks", type=int, default=50)
+    parser.add_argument("--numpy", action="store_true")
+    parser.add_argument("--folded")
+    args = parser.parse_args()
+
+    config = make_config(args.size)
+    scene_class = NumpyScene if args.numpy else Scene
+    profiler = TickProfiler()
+
+    plain_speed = measure(config, args.ticks, scene_class)
+    profiled_speed = measure(config, args.ticks, scene_class, profiler)
+
+    print(profiler.get_summary())
+    print()
+    print(f"ticks/s without profiler: {plain_speed:.3f}")
+    print(f"ticks/s with profiler:    {profiled_speed:.3f}")
+
+    if args.folded:
+        profiler.export_folded(args.folded)
+
+
+if __name__ == "__main__":
+    main()
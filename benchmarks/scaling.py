@@ -0,0 +1,92 @@
+"""
+Measures simulation speed on square worlds of growing size.
+
+Population densities and food spawn rate are scaled from the default 20x20
+world, so every size simulates the same kind of world.
+
+Usage:
+    python -m benchmarks.scaling [--ticks N] [size ...]
+"""
+
+import argparse
+import time
+
+from agent import AgentFactory
+from food import FoodFactory
+from scene import Scene
+from scene_config import SceneConfig
+
+_DEFAULT_SIZES = [20, 50, 100, 150]
+_BASE_CONFIG = SceneConfig()
+
+
+def make_config(size: int, seed: int = 0) -> SceneConfig:
+    """
+    Create config of a square world with default densities
+
+    Args:
+        size (int): map side in cells
+        seed (int, optional): random seed. Defaults to 0.
+
+    Returns:
+        SceneConfig: world config
+    """
+    scale = (size * size) / (_BASE_CONFIG.width * _BASE_CONFIG.height)
+
+    return SceneConfig(
+        width=size,
+        height=size,
+        initial_agents=round(_BASE_CONFIG.initial_agents * scale),
+        initial_food=round(_BASE_CONFIG.initial_food * scale),
+        food_spawn_rate=_BASE_CONFIG.food_spawn_rate * scale,
+        seed=seed,
+    )
+
+
+def measure(config: SceneConfig, ticks: int) -> tuple[float, float]:
+    """
+    Populate a scene and run it for a given amount of ticks
+
+    Args:
+        config (SceneConfig): world config
+        ticks (int): amount of ticks to run
+
+    Returns:
+        tuple[float, float]: setup time in seconds and ticks per second
+    """
+    setup_start = time.perf_counter()
+
+    scene = Scene(config)
+    AgentFactory(scene, config).spawn_initial()
+    FoodFactory(scene, config).spawn_initial()
+
+    run_start = time.perf_counter()
+
+    for _ in range(ticks):
+        scene.update()
+
+    run_end = time.perf_counter()
+
+    return run_start - setup_start, ticks / (run_end - run_start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("sizes", nargs="*", type=int, default=_DEFAULT_SIZES)
+    parser.add_argument("--ticks", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'size':>8} {'agents':>8} {'food':>8} {'setup, s':>10} {'ticks/s':>10}")
+
+    for size in args.sizes:
+        config = make_config(size)
+        setup_time, ticks_per_second = measure(config, args.ticks)
+
+        print(
+            f"{size:>8} {config.initial_agents:>8} {config.initial_food:>8} "
+            f"{setup_time:>10.3f} {ticks_per_second:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Measures saving and restoring scene snapshots of growing maps.
+
+Worlds keep the densities of the default 20x20 world and run a few ticks
+before the snapshot, so agents have walk vectors and food is partly eaten.
+
+Usage:
+    python -m benchmarks.snapshot [--repeat N] [size ...]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from agent import AgentFactory
+from benchmarks.scaling import make_config
+from food import FoodFactory
+from scene import Scene
+
+_DEFAULT_SIZES = [100, 300, 1000]
+
+
+def measure(size: int, repeat: int) -> dict[str, float]:
+    """
+    Save and restore a snapshot of a populated scene
+
+    Args:
+        size (int): map side in cells
+        repeat (int): amount of timed saves and restores, the fastest ones
+            are reported
+
+    Returns:
+        dict[str, float]: amount of objects, size of the file in megabytes,
+        save and restore times in seconds
+    """
+    config = make_config(size)
+    scene = Scene(config)
+    AgentFactory(scene, config).spawn_initial()
+    FoodFactory(scene, config).spawn_initial()
+
+    for _ in range(3):
+        scene.update()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "scene.snapshot")
+        save_time = load_time = float("inf")
+
+        for _ in range(repeat):
+            start = time.perf_counter()
+            scene.save_snapshot(path)
+            save_time = min(save_time, time.perf_counter() - start)
+
+            start = time.perf_counter()
+            Scene.load_snapshot(path)
+            load_time = min(load_time, time.perf_counter() - start)
+
+        file_size = os.path.getsize(path)
+
+    return {
+        "objects": scene.get_agents_count() + len(scene._food_index),
+        "file_mb": file_size / 2**20,
+        "save_time": save_time,
+        "load_time": load_time,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("sizes", nargs="*", type=int, default=_DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'size':>8} {'objects':>9} {'file, MB':>9} {'save, s':>9} {'load, s':>9}")
+
+    for size in args.sizes:
+        result = measure(size, args.repeat)
+
+        print(
+            f"{size:>8} {result['objects']:>9} {result['file_mb']:>9.2f} "
+            f"{result['save_time']:>9.4f} {result['load_time']:>9.4f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Measures loading of dumped stats by the plotters, CSV against NPY columns.
+
+Usage:
+    python -m benchmarks.stats_loading [--rows N]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from csv_dumper import CSVDumper
+from data_dumper import DataDumpInfo
+from npy_dumper import NPYDumper
+from plot_drawer import CSVPlotDrawer, NPYPlotDrawer
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path = os.path.join(directory, "stat.csv")
+        npy_directory = os.path.join(directory, "stat")
+
+        with CSVDumper(csv_path) as csv_dumper, NPYDumper(npy_directory) as npy_dumper:
+            for tick in range(args.rows):
+                row = DataDumpInfo(tick % 1000, tick, tick // 2, tick % 7)
+                csv_dumper.dump(row)
+                npy_dumper.dump(row)
+
+        paths = {"csv": csv_path, "npy": npy_directory}
+        drawers = {
+            "csv": CSVPlotDrawer(csv_path, directory),
+            "npy": NPYPlotDrawer(npy_directory, directory),
+        }
+
+        print(f"{args.rows} rows")
+        print(f"{'format':>8} {'size, MB':>10} {'load, s':>10}")
+
+        for name, drawer in drawers.items():
+            start = time.perf_counter()
+            # touch every value, memory-mapped columns are read lazily
+            total = sum(_sum_column(column) for column in drawer._read_data().values())
+            duration = time.perf_counter() - start
+
+            assert total > 0
+
+            print(
+                f"{name:>8} {_get_size(paths[name]) / 2**20:>10.1f} {duration:>10.3f}"
+            )
+
+
+def _sum_column(column) -> int:
+    if isinstance(column, np.ndarray):
+        return int(column.sum())
+
+    return sum(column)
+
+
+def _get_size(path: str) -> int:
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+
+    return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+
+
+if __name__ == "__main__":
+    main()
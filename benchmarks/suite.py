@@ -0,0 +1,282 @@
+"""
+Runs seeded benchmark scenarios of Scene and compares them with a baseline.
+
+Every scenario measures ticks per second (the best of several runs), peak
+memory of the populated and running scene, and latency of the scene queries
+agents and food call every tick. Results are written as JSON, and a saved
+result can be passed as the baseline, then every metric worse than the
+baseline by more than the threshold is reported and the exit status is 1.
+
+Usage:
+    python -m benchmarks.suite [--repeat N] [--output PATH]
+        [--baseline PATH] [--threshold RATIO] [scenario ...]
+"""
+
+import argparse
+import json
+import math
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from agent import Agent, AgentFactory
+from benchmarks.scaling import make_config
+from food import FoodFactory
+from scene import Scene
+from scene_config import SceneConfig
+
+_QUERY_SAMPLES = 2000
+_QUERY_RADIUS = 3
+
+# metrics which are better when they are higher, the rest are better lower
+_HIGHER_IS_BETTER = {"ticks_per_second"}
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """
+    Attributes:
+        config (SceneConfig): world config, its seed makes the run reproducible
+        ticks (int): amount of ticks to run
+        prepare (Callable[[Scene], None] | None): called on the populated scene
+            before the run
+    """
+
+    config: SceneConfig
+    ticks: int
+    prepare: Callable[[Scene], None] | None = None
+
+
+def _starve_agents(scene: Scene) -> None:
+    for row in scene.get_map():
+        for obj in row:
+            if isinstance(obj, Agent):
+                obj._saturation = 0
+
+
+def _make_dense_config(size: int) -> SceneConfig:
+    cells = size * size
+
+    return SceneConfig(
+        width=size,
+        height=size,
+        initial_agents=cells // 10,
+        initial_food=cells // 10,
+        food_spawn_rate=cells / 100,
+        seed=0,
+    )
+
+
+def _make_food_scarce_config(size: int) -> SceneConfig:
+    config = make_config(size)
+
+    return SceneConfig(
+        width=size,
+        height=size,
+        initial_agents=config.initial_agents,
+        initial_food=config.initial_food // 10,
+        food_spawn_rate=config.food_spawn_rate / 10,
+        seed=0,
+    )
+
+
+SCENARIOS = {
+    "small": Scenario(SceneConfig(seed=0), 500),
+    "dense": Scenario(_make_dense_config(500), 3),
+    "die_off": Scenario(
+        SceneConfig(width=224, height=224, initial_agents=5000, initial_food=0, seed=0),
+        1,
+        _starve_agents,
+    ),
+    "food_scarce": Scenario(_make_food_scarce_config(150), 50),
+}
+
+QUERIES: dict[str, Callable[[Scene, tuple[int, int]], object]] = {
+    "get_nearest_food_coords_by_radius": lambda scene, coords: (
+        scene.get_nearest_food_coords_by_radius(coords, _QUERY_RADIUS)
+    ),
+    "is_food_near_coords": lambda scene, coords: scene.is_food_near_coords(coords),
+    "is_agent_near": lambda scene, coords: scene.is_agent_near(coords),
+    "get_agent_in_coords": lambda scene, coords: scene.get_agent_in_coords(coords),
+    "is_cell_empty": lambda scene, coords: scene.is_cell_empty(coords),
+    "get_random_empty_cell": lambda scene, coords: scene.get_random_empty_cell(),
+}
+
+
+def _populate(scenario: Scenario) -> Scene:
+    scene = Scene(scenario.config)
+    AgentFactory(scene, scenario.config).spawn_initial()
+    FoodFactory(scene, scenario.config).spawn_initial()
+
+    if scenario.prepare is not None:
+        scenario.prepare(scene)
+
+    return scene
+
+
+def _run(scene: Scene, ticks: int) -> float:
+    start = time.perf_counter()
+
+    for _ in range(ticks):
+        scene.update()
+
+    return ticks / (time.perf_counter() - start)
+
+
+def _measure_queries(scene: Scene, seed: int, repeat: int) -> dict[str, float]:
+    rng = random.Random(seed)
+    coords = [
+        (rng.randrange(scene.get_width()), rng.randrange(scene.get_height()))
+        for _ in range(_QUERY_SAMPLES)
+    ]
+    latencies = {}
+
+    for name, query in QUERIES.items():
+        best = math.inf
+
+        for _ in range(repeat):
+            start = time.perf_counter()
+
+            for cell in coords:
+                query(scene, cell)
+
+            best = min(best, time.perf_counter() - start)
+
+        latencies[name] = best / len(coords) * 1e6
+
+    return latencies
+
+
+def measure(scenario: Scenario, repeat: int) -> dict:
+    """
+    Run a scenario
+
+    Args:
+        scenario (Scenario): scenario to run
+        repeat (int): amount of timed runs and passes over the queries, the
+            fastest ones are reported
+
+    Returns:
+        dict: ticks per second, peak memory in megabytes and latencies of
+        queries in microseconds by names of queries
+    """
+    ticks_per_second = 0.0
+
+    for _ in range(repeat):
+        scene = _populate(scenario)
+        ticks_per_second = max(ticks_per_second, _run(scene, scenario.ticks))
+
+    # the run is repeated under tracemalloc, it slows down allocations
+    tracemalloc.start()
+
+    _run(_populate(scenario), scenario.ticks)
+
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "ticks_per_second": ticks_per_second,
+        "peak_memory_mb": peak_memory / 2**20,
+        "query_us": _measure_queries(scene, scenario.config.seed or 0, repeat),
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """
+    Find metrics which got worse than in the baseline
+
+    Args:
+        results (dict): results of the scenarios
+        baseline (dict): saved results of the scenarios
+        threshold (float): allowed relative change, e.g. 0.1 for 10%
+
+    Returns:
+        list[str]: descriptions of regressions, scenarios and metrics missing
+        from any of the results are skipped
+    """
+    current = _flatten(results["scenarios"])
+    saved = _flatten(baseline["scenarios"])
+    regressions = []
+
+    for key in sorted(current.keys() & saved.keys()):
+        value = current[key]
+        base = saved[key]
+
+        if base == 0:
+            continue
+
+        change = (value - base) / base
+
+        if key.rsplit(".", 1)[-1] in _HIGHER_IS_BETTER:
+            change = -change
+
+        if change > threshold:
+            regressions.append(
+                f"{key}: {base:.4g} -> {value:.4g} ({change * 100:+.1f}% worse)"
+            )
+
+    return regressions
+
+
+def _flatten(metrics: dict, prefix: str = "") -> dict[str, float]:
+    flat = {}
+
+    for name, value in metrics.items():
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{prefix}{name}."))
+        else:
+            flat[prefix + name] = value
+
+    return flat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("scenarios", nargs="*", default=list(SCENARIOS))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output")
+    parser.add_argument("--baseline")
+    parser.add_argument("--threshold", type=float, default=0.1)
+    args = parser.parse_args()
+
+    for name in args.scenarios:
+        if name not in SCENARIOS:
+            parser.error(f"unknown scenario {name}, choose from {', '.join(SCENARIOS)}")
+
+    results = {"python": platform.python_version(), "scenarios": {}}
+
+    print(f"{'scenario':>12} {'ticks/s':>10} {'peak, MB':>10} {'query, us':>10}")
+
+    for name in args.scenarios:
+        result = measure(SCENARIOS[name], args.repeat)
+        results["scenarios"][name] = result
+        mean_query = math.fsum(result["query_us"].values()) / len(QUERIES)
+
+        print(
+            f"{name:>12} {result['ticks_per_second']:>10.2f} "
+            f"{result['peak_memory_mb']:>10.2f} {mean_query:>10.2f}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+
+        regressions = compare(results, baseline, args.threshold)
+
+        for regression in regressions:
+            print(f"regression: {regression}")
+
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,55 +1,268 @@
-import os
+import shutil
+import sys
 import time
+from enum import Enum
+from math import ceil
+from typing import TextIO
 
 from abstract_scene import AbstractScene
 from agent import Agent
 from food import Food
+from game_object import GameObject
 from graphical_client import GraphicalClient
+from occupancy_grid import AGENT, EMPTY, FOOD
+
+_CLEAR_SCREEN = "\x1b[2J"
+_CLEAR_LINE_END = "\x1b[K"
+
+# rows of the terminal taken by the stats and the line of the cursor below them
+_STATS_ROWS = 6
+# characters of a cell, a letter of the object and a digit of its level
+_CELL_WIDTH = 2
+_EMPTY_GLYPH = " " * _CELL_WIDTH
+
+
+class CliView(Enum):
+    """
+    How a map bigger than the terminal is shown
+    """
+
+    # cells from the origin which fit the terminal
+    VIEWPORT = "viewport"
+    # the whole map, a cell shows how many agents or, if there are none, food
+    # a square block of the map holds
+    DOWNSAMPLED = "downsampled"
 
 
 class CliAgentGame(GraphicalClient):
-    """Console line graphical client"""
+    """
+    Console line graphical client.
+
+    A frame is written with a single write of ANSI escape sequences which
+    redraw only lines changed since the last frame, so a run may be watched
+    over a slow connection. The viewport reads only the visible cells of the
+    map, and counts of blocks of the downsampled view are updated from the
+    cells changed since the last frame.
+    """
 
-    def __init__(self, scene: AbstractScene = None) -> None:
+    def __init__(
+        self,
+        scene: AbstractScene = None,
+        view: CliView = CliView.VIEWPORT,
+        origin: tuple[int, int] = (0, 0),
+        frame_time: float = 0.8,
+        stream: TextIO | None = None,
+    ) -> None:
         super().__init__(scene)
+        self._view = view
+        self._origin = origin
+        self._frame_time = frame_time
+        self._stream = stream or sys.stdout
+
+        # lines on the terminal, the screen is cleared if there are none
+        self._lines: list[str] = []
+        self._terminal_size: tuple[int, int] | None = None
+
+        # the downsampled view is counted again if the block size is 0
+        self._block_size = 0
+        self._blocks_width = 0
+        self._kinds = bytearray()
+        self._agents_counts: list[int] = []
+        self._food_counts: list[int] = []
+
+    def set_scene(self, scene: AbstractScene) -> None:
+        super().set_scene(scene)
+
+        self._lines = []
+        self._block_size = 0
 
     def update(self) -> None:
-        os.system("cls")
+        super().update()
+
+        terminal_size = tuple(shutil.get_terminal_size())
+
+        if terminal_size != self._terminal_size:
+            self._terminal_size = terminal_size
+            self._lines = []
+            self._block_size = 0
+
+        columns, rows = terminal_size
+        row_cells = max((columns - 2) // _CELL_WIDTH, 1)
+        map_rows = max(rows - _STATS_ROWS, 1)
+
+        if self._view is CliView.DOWNSAMPLED:
+            lines = self._render_downsampled(row_cells, map_rows)
+        else:
+            lines = self._render_viewport(row_cells, map_rows)
+
+        lines.extend(self._render_stats())
+
+        self._write(lines)
+
+    def delay(self) -> None:
+        time.sleep(self._frame_time)
+
+    def _write(self, lines: list[str]) -> None:
+        """
+        Write lines which differ from the ones on the terminal
+
+        Args:
+            lines (list[str]): lines of the frame
+        """
+        parts = [] if self._lines else [_CLEAR_SCREEN]
+
+        for row, line in enumerate(lines):
+            if row < len(self._lines) and self._lines[row] == line:
+                continue
+
+            parts.append(f"\x1b[{row + 1};1H{line}{_CLEAR_LINE_END}")
+
+        # the cursor is left below the frame
+        parts.append(f"\x1b[{len(lines) + 1};1H")
+
+        self._stream.write("".join(parts))
+        self._stream.flush()
+
+        self._lines = lines
+
+    def _render_viewport(self, row_cells: int, map_rows: int) -> list[str]:
+        width = self._scene.get_width()
+        height = self._scene.get_height()
+
+        # the viewport is moved back to fit the map if the origin is too far
+        left = max(min(self._origin[0], width - row_cells), 0)
+        top = max(min(self._origin[1], height - map_rows), 0)
+        right = min(left + row_cells, width)
+        bottom = min(top + map_rows, height)
 
         scene_map = self._scene.get_map()
-        agents_count = 0
+        lines = []
 
-        agents = []
+        for y in range(top, bottom):
+            glyphs = [_get_object_glyph(obj) for obj in scene_map[y][left:right]]
+            lines.append(f"[{''.join(glyphs)}]")
 
-        for row in scene_map:
-            print("[", end="")
+        return lines
 
-            for obj in row:
-                if isinstance(obj, Food):
-                    print(f"f{obj.get_level()}", end="")
-                elif isinstance(obj, Agent):
-                    print(f"A{obj.get_level()}", end="")
-                    agents_count += 1
-                    agents.append(obj)
-                else:
-                    print("  ", end="")
+    def _render_downsampled(self, row_cells: int, map_rows: int) -> list[str]:
+        width = self._scene.get_width()
+        height = self._scene.get_height()
+        block_size = max(ceil(width / row_cells), ceil(height / map_rows), 1)
 
-            print("]\n", end="")
+        if block_size != self._block_size:
+            self._count_blocks(block_size)
+        else:
+            scene_map = self._scene.get_map()
 
-        most_experienced_agent = (
-            max(agents, key=lambda a: a.get_level()) if agents else None
-        )
-        max_agents_level = (
-            str(most_experienced_agent.get_level())
-            if most_experienced_agent
-            else "NO ALIVE"
+            for x, y in self._scene.pop_dirty_cells():
+                self._set_kind(x, y, scene_map[y][x])
+
+        lines = []
+
+        for start in range(0, len(self._agents_counts), self._blocks_width):
+            end = start + self._blocks_width
+            glyphs = [
+                _get_block_glyph(agents, food)
+                for agents, food in zip(
+                    self._agents_counts[start:end],
+                    self._food_counts[start:end],
+                    strict=True,
+                )
+            ]
+            lines.append(f"[{''.join(glyphs)}]")
+
+        return lines
+
+    def _count_blocks(self, block_size: int) -> None:
+        """
+        Count agents and food in every block of the map from scratch
+
+        Args:
+            block_size (int): side of a block in cells
+        """
+        width = self._scene.get_width()
+        height = self._scene.get_height()
+
+        self._block_size = block_size
+        self._blocks_width = ceil(width / block_size)
+
+        blocks_count = self._blocks_width * ceil(height / block_size)
+        self._kinds = bytearray(width * height)
+        self._agents_counts = [0] * blocks_count
+        self._food_counts = [0] * blocks_count
+
+        # only cells changed after the count are counted again
+        self._scene.track_dirty_cells()
+        self._scene.pop_dirty_cells()
+
+        for y, row in enumerate(self._scene.get_map()):
+            for x, obj in enumerate(row):
+                if obj:
+                    self._set_kind(x, y, obj)
+
+    def _set_kind(self, x: int, y: int, obj: GameObject | None) -> None:
+        cell = y * self._scene.get_width() + x
+        block = (y // self._block_size) * self._blocks_width + x // self._block_size
+
+        if isinstance(obj, Agent):
+            kind = AGENT
+        elif isinstance(obj, Food):
+            kind = FOOD
+        else:
+            kind = EMPTY
+
+        last_kind = self._kinds[cell]
+
+        if kind == last_kind:
+            return
+
+        if last_kind == AGENT:
+            self._agents_counts[block] -= 1
+        elif last_kind == FOOD:
+            self._food_counts[block] -= 1
+
+        if kind == AGENT:
+            self._agents_counts[block] += 1
+        elif kind == FOOD:
+            self._food_counts[block] += 1
+
+        self._kinds[cell] = kind
+
+    def _render_stats(self) -> list[str]:
+        max_agents_level = self._scene.get_max_agents_level()
+        max_agents_level_str = (
+            str(max_agents_level) if max_agents_level != 0 else "NO ALIVE"
         )
 
-        print(f"Ticks past: {self._scene.get_ticks()}")
-        print(f"Agents left: {agents_count}")
-        print(f"Agents ate count: {self._scene.get_agents_ate_count()}")
-        print(f"Agents spawned from other: {self._scene.get_spawned_from()}")
-        print(f"Max agent's level: {max_agents_level}")
+        return [
+            f"Ticks past: {self._scene.get_ticks()}",
+            f"Agents left: {self._scene.get_agents_count()}",
+            f"Agents ate count: {self._scene.get_agents_ate_count()}",
+            f"Agents spawned from other: {self._scene.get_spawned_from()}",
+            f"Max agent's level: {max_agents_level_str}",
+        ]
 
-    def delay(self) -> None:
-        time.sleep(0.8)
+
+def _get_glyph(letter: str, value: int) -> str:
+    # values which don't fit a digit are shown as "+" to keep the columns
+    return letter + (str(value) if value < 10 else "+")
+
+
+def _get_object_glyph(obj: GameObject | None) -> str:
+    if isinstance(obj, Food):
+        return _get_glyph("f", obj.get_level())
+
+    if isinstance(obj, Agent):
+        return _get_glyph("A", obj.get_level())
+
+    return _EMPTY_GLYPH
+
+
+def _get_block_glyph(agents_count: int, food_count: int) -> str:
+    if agents_count:
+        return _get_glyph("A", agents_count)
+
+    if food_count:
+        return _get_glyph("f", food_count)
+
+    return _EMPTY_GLYPH
@@ -1,26 +1,49 @@
 import csv
-import dataclasses
-import os
 
-from data_dumper import DataDumper, DataDumpInfo
+from data_dumper import (
+    _DEFAULT_FLUSH_EVERY,
+    _DEFAULT_FLUSH_INTERVAL,
+    BufferedDataDumper,
+)
 
 
-class CSVDumper(DataDumper):
+class CSVDumper(BufferedDataDumper):
     """Dumps data to csv file"""
 
-    def __init__(self, file_path: str) -> None:
+    def __init__(
+        self,
+        file_path: str,
+        flush_every: int = _DEFAULT_FLUSH_EVERY,
+        flush_interval: float | None = _DEFAULT_FLUSH_INTERVAL,
+    ) -> None:
+        """
+        Args:
+            file_path (str): path of the csv file, overwritten if it exists
+            flush_every (int, optional): amount of rows to buffer before writing
+                them. Defaults to 1024.
+            flush_interval (float | None, optional): max amount of seconds rows
+                stay in the buffer. Defaults to 5.0.
+        """
+        super().__init__(flush_every, flush_interval)
+
         self._file_path = file_path
 
-        os.remove(file_path)
+        self._csvfile = open(self._file_path, "w", newline="")
+        self._csvwriter = csv.writer(self._csvfile)
+        self._is_header_written = False
 
-        self._csvfile = open(self._file_path, "w+", newline="")
-        self._csvwriter = csv.DictWriter(
-            self._csvfile, fieldnames=[f.name for f in dataclasses.fields(DataDumpInfo)]
-        )
-        self._csvwriter.writeheader()
+    def _write_columns(self, columns: dict[str, list]) -> None:
+        self._write_header()
+        self._csvwriter.writerows(zip(*columns.values(), strict=True))
 
-    def dump(self, data: DataDumpInfo) -> None:
-        self._csvwriter.writerow(dataclasses.asdict(data))
+    def _sync(self) -> None:
+        self._csvfile.flush()
 
-    def close(self) -> None:
+    def _close_output(self) -> None:
+        self._write_header()
         self._csvfile.close()
+
+    def _write_header(self) -> None:
+        if not self._is_header_written:
+            self._csvwriter.writerow(self._get_column_names())
+            self._is_header_written = True
@@ -1,22 +1,264 @@
+import time
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import MISSING, dataclass, field, fields
+
+# agents of this level and higher are counted in the last bucket of the histogram
+AGENTS_LEVELS_SIZE = 10
+FOOD_LEVELS_SIZE = 5
 
 
 @dataclass
 class DataDumpInfo:
+    """
+    Stats of a simulation tick.
+
+    Optional stats are None unless their telemetry group is enabled in the
+    scene config. Histograms hold amounts of objects of levels from 1 up.
+    """
+
     agents_left: int
     eaten_agents: int
     spawned_agents: int
     max_agents_level: int
+    agents_levels: tuple[int, ...] | None = field(
+        default=None, metadata={"size": AGENTS_LEVELS_SIZE}
+    )
+    food_levels: tuple[int, ...] | None = field(
+        default=None, metadata={"size": FOOD_LEVELS_SIZE}
+    )
+    mean_saturation: float | None = None
+    births: int | None = None
+    deaths: int | None = None
+    tick_time: float | None = None
+
+    @classmethod
+    def get_all_columns(cls) -> list[str]:
+        """
+        Get names of all the columns a row can have
+
+        Returns:
+            list[str]: names of columns
+        """
+        columns = []
+
+        for info_field in fields(cls):
+            columns.extend(_get_field_columns(info_field))
+
+        return columns
+
+    def get_columns(self) -> list[str]:
+        """
+        Get names of the columns of stats present in this row
+
+        Returns:
+            list[str]: names of columns
+        """
+        columns = []
+
+        for info_field in fields(self):
+            if getattr(self, info_field.name) is not None:
+                columns.extend(_get_field_columns(info_field))
+
+        return columns
+
+    def to_row(self) -> list[int | float]:
+        """
+        Get values of the stats present in this row, histograms are flattened
+
+        Returns:
+            list[int | float]: values in the order of get_columns
+        """
+        row = []
+
+        for info_field in fields(self):
+            value = getattr(self, info_field.name)
+
+            if value is None:
+                continue
+
+            if isinstance(value, tuple):
+                row.extend(value)
+            else:
+                row.append(value)
+
+        return row
+
+
+def make_histogram(amounts: dict[int, int], size: int) -> tuple[int, ...]:
+    """
+    Pack amounts of objects by level into a histogram of a fixed size
+
+    Args:
+        amounts (dict[int, int]): amounts of objects by level, levels start at 1
+        size (int): amount of buckets, the last one also counts higher levels
+
+    Returns:
+        tuple[int, ...]: amounts of objects of levels from 1 up
+    """
+    histogram = [0] * size
+
+    for level, amount in amounts.items():
+        histogram[min(level, size) - 1] += amount
+
+    return tuple(histogram)
+
+
+def _get_field_columns(info_field) -> list[str]:
+    size = info_field.metadata.get("size")
+
+    if size is None:
+        return [info_field.name]
+
+    return [f"{info_field.name}_{level}" for level in range(1, size + 1)]
+
+
+# columns of the stats which are always present
+BASE_COLUMNS = tuple(f.name for f in fields(DataDumpInfo) if f.default is MISSING)
+
+_DEFAULT_FLUSH_EVERY = 1024
+_DEFAULT_FLUSH_INTERVAL = 5.0
 
 
 class DataDumper(ABC):
     """
-    Used to save dump of the simulation progress
+    Used to save dump of the simulation progress.
+
+    Dumpers may buffer dumped data, it is guaranteed to be saved after flush or
+    close. Dumpers can be used as context managers, which close them on exit.
     """
 
+    def __enter__(self) -> "DataDumper":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
     @abstractmethod
     def dump(self, data: DataDumpInfo) -> None: ...
 
+    def flush(self) -> None:  # noqa: B027
+        """
+        Save all the buffered data
+        """
+        pass
+
     @abstractmethod
     def close(self) -> None: ...
+
+
+class NullDataDumper(DataDumper):
+    """Dumper which saves nothing, used for runs whose stats aren't needed"""
+
+    def dump(self, data: DataDumpInfo) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class BufferedDataDumper(DataDumper):
+    """
+    Dumper which collects dumped values in a preallocated buffer with a column
+    per field and writes them in batches, once the buffer is full or the flush
+    interval has passed since the last flush.
+    """
+
+    def __init__(
+        self,
+        flush_every: int = _DEFAULT_FLUSH_EVERY,
+        flush_interval: float | None = _DEFAULT_FLUSH_INTERVAL,
+    ) -> None:
+        """
+        Args:
+            flush_every (int, optional): amount of rows to buffer before writing
+                them. Defaults to 1024.
+            flush_interval (float | None, optional): max amount of seconds rows
+                stay in the buffer, only checked on dump. Never flushed by time
+                if None. Defaults to 5.0.
+        """
+        if flush_every <= 0:
+            raise ValueError(f"Flush size should be positive, got {flush_every}")
+
+        self._flush_every = flush_every
+        self._flush_interval = flush_interval
+
+        # columns are known from the first dumped row
+        self._column_names: list[str] | None = None
+        self._columns: list[list] = []
+        self._buffered = 0
+        self._last_flush_time = time.monotonic()
+        self._is_closed = False
+
+    def dump(self, data: DataDumpInfo) -> None:
+        if self._column_names is None:
+            self._column_names = data.get_columns()
+            self._columns = [[0] * self._flush_every for _ in self._column_names]
+
+        row = self._buffered
+
+        for column, value in zip(self._columns, data.to_row(), strict=True):
+            column[row] = value
+
+        self._buffered = row + 1
+
+        if self._buffered == self._flush_every or (
+            self._flush_interval is not None
+            and time.monotonic() - self._last_flush_time >= self._flush_interval
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        if self._buffered:
+            self._write_columns(
+                dict(
+                    zip(
+                        self._column_names,
+                        (column[: self._buffered] for column in self._columns),
+                        strict=True,
+                    )
+                )
+            )
+            self._buffered = 0
+
+        self._sync()
+        self._last_flush_time = time.monotonic()
+
+    def close(self) -> None:
+        if self._is_closed:
+            return
+
+        self.flush()
+        self._close_output()
+        self._is_closed = True
+
+    def _get_column_names(self) -> list[str]:
+        """
+        Get names of the dumped columns
+
+        Returns:
+            list[str]: names of columns, only the base ones until the first dump
+        """
+        if self._column_names is None:
+            return list(BASE_COLUMNS)
+
+        return self._column_names
+
+    @abstractmethod
+    def _write_columns(self, columns: dict[str, list]) -> None:
+        """
+        Write a batch of buffered rows
+
+        Args:
+            columns (dict[str, list]): values of the rows by field names
+        """
+        ...
+
+    @abstractmethod
+    def _sync(self) -> None:
+        """
+        Make written rows visible to readers of the output
+        """
+        ...
+
+    @abstractmethod
+    def _close_output(self) -> None: ...
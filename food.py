@@ -1,14 +1,19 @@
-from random import random
-
 from game_object import GameObject
+from scene_config import SceneConfig
+from spawn_distribution import SpawnDistribution, UniformDistribution
 
+# cumulative probabilities of food levels
 _FOOD_SPAWN_PROBABILITIES = {
     1: 0.4,
     2: 0.7,
     3: 0.85,
     4: 0.95,
-    5: 100,
+    5: 1.0,
 }
+_FOOD_LEVELS = list(_FOOD_SPAWN_PROBABILITIES)
+_FOOD_CUM_WEIGHTS = list(_FOOD_SPAWN_PROBABILITIES.values())
+
+_UNIFORM_DISTRIBUTION = UniformDistribution()
 
 
 class FoodFactory:
@@ -16,46 +21,91 @@ class FoodFactory:
     Creates a food on a scene
     """
 
-    def __init__(self, scene) -> None:
+    def __init__(self, scene, config: SceneConfig | None = None) -> None:
         self._scene = scene
+        self._config = config or scene.get_config()
+        self._random = scene.get_random()
+        self._spawn_accumulator = 0.0
 
         scene.add_factory(self)
 
+    def get_spawn_accumulator(self) -> float:
+        return self._spawn_accumulator
+
+    def set_spawn_accumulator(self, spawn_accumulator: float) -> None:
+        self._spawn_accumulator = spawn_accumulator
+
     def update(self) -> None:
         """
-        Spawns food in random localion at every tick
+        Spawns food in random localions at every tick according to the spawn rate
         """
-        self.spawn_radom_food()
+        self._spawn_accumulator += self._config.food_spawn_rate
+
+        amount = int(self._spawn_accumulator)
+        self._spawn_accumulator -= amount
+
+        self.spawn_bunch(amount)
+
+    def spawn_initial(self) -> None:
+        """
+        Spawns initial amount of food from the config
+        """
+        self.spawn_bunch(self._config.initial_food)
 
     def spawn_radom_food(self) -> None:
         """
         Spawns food in radom location according to probabilities
         """
-        random_number = random()
+        coords = self._scene.get_random_empty_cell()
 
-        for level, food_spawn_probability in _FOOD_SPAWN_PROBABILITIES.items():
-            if random_number <= food_spawn_probability:
-                self._spawn_food(level)
-                return
+        if coords is None:
+            return
+
+        self._spawn_food(self._get_random_levels(1)[0], coords)
 
-    def spawn_bunch(self, amount: int = 1) -> None:
+    def spawn_bunch(
+        self, amount: int = 1, distribution: SpawnDistribution | None = None
+    ) -> None:
         """
-        Spawns several food units
+        Spawns several food units, they're added to the scene at once
 
         Args:
             amount (int, optional): Amount of food to spawn. Defaults to 1.
+            distribution (SpawnDistribution | None, optional): positions of the
+                food. Defaults to uniformly random empty cells.
+        """
+        cells = (distribution or _UNIFORM_DISTRIBUTION).sample(self._scene, amount)
+        levels = self._get_random_levels(len(cells))
+
+        self._scene.add_game_objects(
+            [
+                Food(coords, level, self._scene)
+                for coords, level in zip(cells, levels, strict=True)
+            ]
+        )
+
+    def _get_random_levels(self, amount: int) -> list[int]:
+        """
+        Get random food levels according to probabilities, drawn in one call
+
+        Args:
+            amount (int): amount of levels
+
+        Returns:
+            list[int]: levels of food
         """
-        for _ in range(amount):
-            self.spawn_radom_food()
+        return self._random.choices(
+            _FOOD_LEVELS, cum_weights=_FOOD_CUM_WEIGHTS, k=amount
+        )
 
-    def _spawn_food(self, level: int) -> None:
+    def _spawn_food(self, level: int, coords: tuple[int, int]) -> None:
         """
-        Spawns food in radom localtion of scene with a given level
+        Spawns food in the given localtion of scene with a given level
 
         Args:
             level (int): Level of food to be spawned
+            coords (tuple[int, int]): coordinates of the food
         """
-        coords = self._scene.get_random_empty_cell()
         self._scene.add_game_object(Food(coords, level, self._scene), coords)
 
 
@@ -64,6 +114,8 @@ class Food(GameObject):
     Represents a food
     """
 
+    __slots__ = ("_level", "_scene", "_capacity")
+
     def __init__(self, coords: tuple[int, int], level: int, scene) -> None:
         super().__init__(coords)
 
@@ -71,9 +123,40 @@ class Food(GameObject):
         self._scene = scene
         self._capacity = self.get_max_capacity()
 
+    @classmethod
+    def restore(
+        cls, coords: tuple[int, int], level: int, scene, capacity: float
+    ) -> "Food":
+        """
+        Create food in the given state, e.g. loaded from a snapshot
+
+        Returns:
+            Food: restored food
+        """
+        food = cls.__new__(cls)
+        food._coords = coords
+        food._level = level
+        food._scene = scene
+        food._capacity = capacity
+        food._is_asleep = False
+
+        return food
+
     def get_level(self) -> int:
         return self._level
 
+    def get_capacity(self) -> float:
+        """
+        Get food capacity left
+
+        Returns:
+            float: food capacity
+        """
+        if self._is_asleep:
+            self._scene.catch_up(self)
+
+        return self._capacity
+
     def get_max_capacity(self) -> float:
         """
         Get food max capacity
@@ -102,3 +185,37 @@ class Food(GameObject):
 
         if self._scene.is_agent_near(self._coords):
             self._capacity -= 1
+
+    def can_sleep(self) -> bool:
+        """
+        Check if the food would only decay on its next updates, until an agent
+        steps next to it
+
+        Returns:
+            bool: can the food skip its updates
+        """
+        return not self._scene.is_agent_near(self._coords)
+
+    def get_sleep_turns(self) -> int:
+        """
+        Get amount of next updates on which the sleeping food surely only
+        decays, it's eaten up a few updates after them
+
+        Returns:
+            int: amount of updates
+        """
+        # the food is removed on the update which leaves no capacity, a couple
+        # of updates are kept for rounding errors of repeated subtractions
+        return max(int(self._capacity / self.get_exhaustion()) - 3, 0)
+
+    def decay(self, turns: int) -> None:
+        """
+        Decay for the skipped updates
+
+        Args:
+            turns (int): amount of skipped updates
+        """
+        exhaustion = self.get_exhaustion()
+
+        for _ in range(turns):
+            self._capacity -= exhaustion
@@ -1,10 +1,34 @@
-from typing import NoReturn
+import time
+from contextlib import AbstractContextManager, nullcontext
+from dataclasses import dataclass
 
+from abstract_scene import AbstractScene
 from agent import AgentFactory
-from data_dumper import DataDumper, DataDumpInfo
+from data_dumper import (
+    AGENTS_LEVELS_SIZE,
+    FOOD_LEVELS_SIZE,
+    DataDumper,
+    DataDumpInfo,
+    make_histogram,
+)
 from food import FoodFactory
 from graphical_client import GraphicalClient
+from profiler import TickProfiler
 from scene import Scene
+from scene_config import SceneConfig, TelemetryGroup
+
+_NO_PHASE = nullcontext()
+
+
+@dataclass
+class GameSummary:
+    ticks: int
+    agents_left: int
+    eaten_agents: int
+    spawned_agents: int
+    max_agents_level: int
+    elapsed_time: float
+    ticks_per_second: float
 
 
 class Game:
@@ -12,39 +36,192 @@ class Game:
         self,
         graphical_client: GraphicalClient,
         datadumper: DataDumper,
+        config: SceneConfig | None = None,
+        scene_class: type[AbstractScene] = Scene,
+        profiler: TickProfiler | None = None,
+        snapshot: str | None = None,
     ) -> None:
+        if snapshot is not None and not hasattr(scene_class, "load_snapshot"):
+            raise ValueError(f"{scene_class.__name__} can't be loaded from snapshots")
+
+        # the config of a snapshot's scene is saved with it
+        if snapshot is not None and config is not None:
+            raise ValueError("Config can't be set for a run continuing a snapshot")
+
         self._datadumper = datadumper
         self._graphical_client = graphical_client
+        self._config = config or SceneConfig()
+        self._scene_class = scene_class
+        self._profiler = profiler
+        # the run continues the snapshot's scene instead of a new one if set
+        self._snapshot = snapshot
         self._scene = None
 
-    def run(self) -> NoReturn:
-        """Run the simulation"""
+        self._is_timing_ticks = False
+        self._tick_time = 0.0
+
+    def get_scene(self) -> AbstractScene | None:
+        return self._scene
+
+    def run(
+        self, max_ticks: int | None = None, until_extinct: bool = False
+    ) -> GameSummary:
+        """
+        Run the simulation
+
+        Args:
+            max_ticks (int | None, optional): amount of ticks to simulate,
+                runs forever if None. Defaults to None.
+            until_extinct (bool, optional): stop when there are no agents left.
+                Defaults to False.
+
+        Returns:
+            GameSummary: stats of the finished run
+        """
 
-        self._scene = Scene()
+        if self._snapshot is None:
+            self._scene = self._scene_class(self._config)
+        else:
+            self._scene = self._scene_class.load_snapshot(self._snapshot)
+            self._config = self._scene.get_config()
+
+        if self._profiler is not None:
+            self._profiler.instrument_queries(self._scene)
+            self._scene.set_profiler(self._profiler)
 
         self._graphical_client.set_scene(self._scene)
 
-        agent_factory = AgentFactory(self._scene)
-        food_factory = FoodFactory(self._scene)
+        if self._snapshot is None:
+            with self._phase("setup"):
+                agent_factory = AgentFactory(self._scene, self._config)
+                food_factory = FoodFactory(self._scene, self._config)
+
+                agent_factory.spawn_initial()
+                food_factory.spawn_initial()
+
+        return self._loop(max_ticks, until_extinct)
+
+    def _loop(self, max_ticks: int | None, until_extinct: bool) -> GameSummary:
+        ticks_run = 0
+        start_time = time.perf_counter()
+        is_extinct = False
+
+        self._is_timing_ticks = TelemetryGroup.TICK_TIME in self._config.telemetry
+        self._tick_time = 0.0
+
+        try:
+            while not is_extinct and (max_ticks is None or ticks_run < max_ticks):
+                with self._phase("frame"):
+                    with self._phase("render"):
+                        self._graphical_client.update()
+
+                    # frames are rendered between whole ticks only, so the
+                    # client always sees a consistent scene
+                    frame_ticks = self._graphical_client.ticks_per_frame
+
+                    if max_ticks is not None:
+                        frame_ticks = min(frame_ticks, max_ticks - ticks_run)
+
+                    for _ in range(frame_ticks):
+                        if not self._tick(until_extinct):
+                            is_extinct = True
+                            break
 
-        agent_factory.spawn_radom(10)
-        food_factory.spawn_bunch(16)
+                        ticks_run += 1
 
-        self._loop()
+                    if not is_extinct:
+                        with self._phase("delay"):
+                            self._graphical_client.delay()
+        finally:
+            self._datadumper.close()
 
-    def _loop(self) -> NoReturn:
-        while True:
-            self._graphical_client.update()
+        elapsed_time = time.perf_counter() - start_time
 
-            self._datadumper.dump(
-                data=DataDumpInfo(
-                    self._scene.get_agents_count(),
-                    self._scene.get_agents_ate_count(),
-                    self._scene.get_spawned_from(),
-                    self._scene.get_max_agents_level(),
-                )
+        return GameSummary(
+            ticks=ticks_run,
+            agents_left=self._scene.get_agents_count(),
+            eaten_agents=self._scene.get_agents_ate_count(),
+            spawned_agents=self._scene.get_spawned_from(),
+            max_agents_level=self._scene.get_max_agents_level(),
+            elapsed_time=elapsed_time,
+            ticks_per_second=ticks_run / elapsed_time if elapsed_time else 0.0,
+        )
+
+    def _tick(self, until_extinct: bool) -> bool:
+        """
+        Dump stats of the scene and update it
+
+        Args:
+            until_extinct (bool): don't update the scene without agents
+
+        Returns:
+            bool: False if the scene wasn't updated as there are no agents left
+        """
+        with self._phase("tick"):
+            agents_count = self._scene.get_agents_count()
+
+            with self._phase("dump"):
+                self._datadumper.dump(data=self._make_dump_info(self._tick_time))
+
+            if until_extinct and agents_count == 0:
+                return False
+
+            with self._phase("scene"):
+                if self._is_timing_ticks:
+                    tick_start_time = time.perf_counter()
+                    self._scene.update()
+                    self._tick_time = time.perf_counter() - tick_start_time
+                else:
+                    self._scene.update()
+
+        return True
+
+    def _phase(self, name: str) -> AbstractContextManager:
+        if self._profiler is None:
+            return _NO_PHASE
+
+        return self._profiler.phase(name)
+
+    def _make_dump_info(self, tick_time: float) -> DataDumpInfo:
+        """
+        Collect stats of the scene, optional stats are collected only for the
+        enabled telemetry groups
+
+        Args:
+            tick_time (float): duration of the last tick in seconds
+
+        Returns:
+            DataDumpInfo: stats of the current tick
+        """
+        scene = self._scene
+        telemetry = self._config.telemetry
+
+        data = DataDumpInfo(
+            scene.get_agents_count(),
+            scene.get_agents_ate_count(),
+            scene.get_spawned_from(),
+            scene.get_max_agents_level(),
+        )
+
+        if not telemetry:
+            return data
+
+        if TelemetryGroup.AGENTS_LEVELS in telemetry:
+            data.agents_levels = make_histogram(
+                scene.get_agents_levels(), AGENTS_LEVELS_SIZE
             )
 
-            self._scene.update()
+        if TelemetryGroup.FOOD_LEVELS in telemetry:
+            data.food_levels = make_histogram(scene.get_food_levels(), FOOD_LEVELS_SIZE)
+
+        if TelemetryGroup.MEAN_SATURATION in telemetry:
+            data.mean_saturation = scene.get_mean_saturation()
+
+        if TelemetryGroup.BIRTHS_AND_DEATHS in telemetry:
+            data.births = scene.get_births_count()
+            data.deaths = scene.get_deaths_count()
+
+        if TelemetryGroup.TICK_TIME in telemetry:
+            data.tick_time = tick_time
 
-            self._graphical_client.delay()
+        return data
@@ -1,6 +1,9 @@
 class GameObject:
+    __slots__ = ("_coords", "_is_asleep")
+
     def __init__(self, coords: tuple[int, int]) -> None:
         self._coords = coords
+        self._is_asleep = False
 
     def get_coords(self) -> tuple[int, int]:
         """
@@ -10,3 +13,41 @@ class GameObject:
             tuple[int, int]: coordinates
         """
         return self._coords
+
+    def can_sleep(self) -> bool:
+        """
+        Check if the object would only decay on its next updates until something
+        comes close to it, so the scene may skip them
+
+        Returns:
+            bool: can the object skip its updates
+        """
+        return False
+
+    def get_sleep_turns(self) -> int:
+        """
+        Get amount of next updates the sleeping object may skip, it's woken
+        for the update after them
+
+        Returns:
+            int: amount of updates
+        """
+        return 0
+
+    def set_asleep(self, is_asleep: bool) -> None:
+        """
+        Mark the object as skipped by updates of the scene, its decaying values
+        are brought up to date by the scene when they're read
+
+        Args:
+            is_asleep (bool): is the object asleep
+        """
+        self._is_asleep = is_asleep
+
+    def decay(self, turns: int) -> None:
+        """
+        Change the object as the skipped updates would
+
+        Args:
+            turns (int): amount of skipped updates
+        """
@@ -2,6 +2,9 @@ from abc import ABC, abstractmethod
 
 from abstract_scene import AbstractScene
 
+# the fastest speed of the simulation clients may set
+MAX_TICKS_PER_FRAME = 1024
+
 
 class NoSceneProvidedException(Exception): ...
 
@@ -9,10 +12,22 @@ class NoSceneProvidedException(Exception): ...
 class GraphicalClient(ABC):
     """
     Renders scene
+
+    The game simulates ticks_per_frame ticks of the scene between updates of
+    the client, so speed of the simulation doesn't depend on the frame rate.
     """
 
     def __init__(self, scene: AbstractScene = None) -> None:
         self._scene = scene
+        self._ticks_per_frame = 1
+
+    @property
+    def ticks_per_frame(self) -> int:
+        return self._ticks_per_frame
+
+    @ticks_per_frame.setter
+    def ticks_per_frame(self, value: int) -> None:
+        self._ticks_per_frame = min(max(value, 1), MAX_TICKS_PER_FRAME)
 
     def set_scene(self, scene: AbstractScene) -> None:
         self._scene = scene
@@ -1,3 +1,4 @@
+from background_dumper import BackgroundDataDumper
 from cli import CliAgentGame
 from csv_dumper import CSVDumper
 from data_dumper import DataDumper
@@ -15,7 +16,7 @@ def main() -> None:
 
     # graphical = CliAgentGame()
     # dumper = DumperMock()
-    dumper = CSVDumper("stat.csv")
+    dumper = BackgroundDataDumper(CSVDumper("stat.csv"))
 
     game = Game(graphical, dumper)
 
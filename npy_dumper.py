@@ -0,0 +1,154 @@
+import os
+from dataclasses import fields
+from typing import get_args
+
+import numpy as np
+
+from data_dumper import BufferedDataDumper, DataDumpInfo, _get_field_columns
+
+_DEFAULT_CHUNK_SIZE = 65536
+
+_MAGIC = b"\x93NUMPY\x01\x00"
+# header of npy format 1.0 padded to a fixed size, so it can be rewritten with
+# the new amount of rows after every flush without moving the data
+_HEADER_SIZE = 128
+
+
+class InvalidStatsException(Exception): ...
+
+
+class NPYDumper(BufferedDataDumper):
+    """
+    Dumps data to a directory with a .npy file per field.
+
+    Values are appended to the files in chunks as raw little-endian numbers, so
+    a column is loaded back with a memory map and no parsing. Every flush
+    rewrites the headers with the current amount of rows, so the files can be
+    read while the simulation still runs.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        flush_every: int = _DEFAULT_CHUNK_SIZE,
+        flush_interval: float | None = None,
+    ) -> None:
+        """
+        Args:
+            directory (str): directory of the column files, created if missing,
+                column files of an earlier run are removed
+            flush_every (int, optional): amount of rows to buffer before writing
+                them. Defaults to 65536.
+            flush_interval (float | None, optional): max amount of seconds rows
+                stay in the buffer. Defaults to None.
+        """
+        super().__init__(flush_every, flush_interval)
+
+        self._directory = directory
+        self._rows = 0
+
+        os.makedirs(directory, exist_ok=True)
+
+        # columns missing from this run must not be read along with it
+        for name in _DTYPES:
+            path = _get_column_path(directory, name)
+
+            if os.path.exists(path):
+                os.remove(path)
+
+        self._files = {}
+        self._sync()
+
+    def _write_columns(self, columns: dict[str, list]) -> None:
+        rows = len(next(iter(columns.values())))
+
+        for name, values in columns.items():
+            self._get_file(name).write(
+                np.asarray(values, dtype=_DTYPES[name]).tobytes()
+            )
+
+        self._rows += rows
+
+    def _sync(self) -> None:
+        for name in self._get_column_names():
+            file = self._get_file(name)
+            file.seek(0)
+            file.write(_make_header(_DTYPES[name], self._rows))
+            file.seek(0, os.SEEK_END)
+            file.flush()
+
+    def _close_output(self) -> None:
+        for file in self._files.values():
+            file.close()
+
+    def _get_file(self, name: str):
+        file = self._files.get(name)
+
+        if file is None:
+            file = open(_get_column_path(self._directory, name), "wb")
+            file.write(bytes(_HEADER_SIZE))
+            self._files[name] = file
+
+        return file
+
+
+def read_npy_stats(directory: str) -> dict[str, np.ndarray]:
+    """
+    Load columns written by NPYDumper. Columns are memory-mapped, so values are
+    read from the disk only when they're accessed.
+
+    Args:
+        directory (str): directory of the column files
+
+    Raises:
+        InvalidStatsException: the directory has no column files
+
+    Returns:
+        dict[str, np.ndarray]: read-only columns by names
+    """
+    columns = {}
+
+    for name in DataDumpInfo.get_all_columns():
+        path = _get_column_path(directory, name)
+
+        if os.path.exists(path):
+            columns[name] = np.load(path, mmap_mode="r")
+
+    if not columns:
+        raise InvalidStatsException(f"No stats columns found in {directory}")
+
+    return columns
+
+
+def _get_column_path(directory: str, name: str) -> str:
+    return os.path.join(directory, name + ".npy")
+
+
+def _get_field_dtype(info_field) -> np.dtype:
+    if info_field.type is float or float in get_args(info_field.type):
+        return np.dtype("<f8")
+
+    return np.dtype("<i8")
+
+
+# dtypes of all the columns by names, from the types of their stats
+_DTYPES = {
+    name: _get_field_dtype(info_field)
+    for info_field in fields(DataDumpInfo)
+    for name in _get_field_columns(info_field)
+}
+
+
+def _make_header(dtype: np.dtype, rows: int) -> bytes:
+    header = repr(
+        {"descr": dtype.str, "fortran_order": False, "shape": (rows,)}
+    ).encode("latin1")
+    padding = _HEADER_SIZE - len(_MAGIC) - 2 - len(header) - 1
+
+    return (
+        _MAGIC
+        + (_HEADER_SIZE - len(_MAGIC) - 2).to_bytes(2, "little")
+        + header
+        + b" " * padding
+        + b"\n"
+    )
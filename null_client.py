@@ -0,0 +1,15 @@
+from abstract_scene import AbstractScene
+from graphical_client import GraphicalClient
+
+
+class NullGraphicalClient(GraphicalClient):
+    """Graphical client which renders nothing, used for headless runs"""
+
+    def __init__(self, scene: AbstractScene = None) -> None:
+        super().__init__(scene)
+
+    def update(self) -> None:
+        pass
+
+    def delay(self) -> None:
+        pass
@@ -0,0 +1,1111 @@
+from collections.abc import Iterator, Mapping
+from contextlib import AbstractContextManager, nullcontext
+from functools import cache
+from random import Random
+
+import numpy as np
+
+from abstract_scene import AbstractScene
+from agent import _WALKING_VECTORS, Agent
+from food import Food
+from game_object import GameObject
+from occupancy_grid import AGENT, EMPTY, FOOD, MapView
+from profiler import TickProfiler
+from scene_config import SceneConfig
+from square_rings import get_ring_offsets
+
+_NO_WALK = -1
+_WALKING_DX = np.array([v[0] for v in _WALKING_VECTORS])
+_WALKING_DY = np.array([v[1] for v in _WALKING_VECTORS])
+
+# while at least 1/_SPARSE_FREE_RATIO of the map is free, empty cells are found
+# by sampling random cells
+_SPARSE_FREE_RATIO = 8
+
+_NO_PHASE = nullcontext()
+
+
+@cache
+def _get_ring_offsets(radius: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Get offsets of the square ring cells in the order Scene scans them
+
+    Args:
+        radius (int): square radius
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: x and y offsets
+    """
+    offsets = get_ring_offsets(radius)
+
+    return (
+        np.array([dx for dx, _ in offsets]),
+        np.array([dy for _, dy in offsets]),
+    )
+
+
+class NumpyScene(AbstractScene):
+    """
+    Scene which keeps agents and food in flat NumPy grids and updates them in
+    batches instead of calling update of every game object.
+
+    Every cell stores the kind of its content and the state of the agent or the
+    food in it, so moving an object moves its values between cells. A tick runs
+    food decay, hunting, state transitions, spawning, targeting and movement as
+    array operations with the same rules Agent and Food follow. Agents act
+    before food, and agents which compete for the same cell are resolved in
+    row-major order of their positions, the order Scene updates objects in.
+
+    Game objects passed to add_game_object are only used to read the initial
+    state. The map is a view over the grids, which builds a detached copy of
+    the object in a cell when the cell is read.
+    """
+
+    def __init__(self, config: SceneConfig | None = None) -> None:
+        self._config = config or SceneConfig()
+        self._field_width = self._config.width
+        self._field_height = self._config.height
+
+        size = self._field_width * self._field_height
+
+        self._kind = self._make_grid(size, np.int8, EMPTY)
+        self._level = self._make_grid(size, np.int32, 0)
+        # saturation of agents and capacity of food
+        self._amount = self._make_grid(size, np.float64, 0)
+        self._experience = self._make_grid(size, np.int64, 0)
+        self._walk = self._make_grid(size, np.int8, _NO_WALK)
+        self._acted = self._make_grid(size, np.bool_, False)
+
+        self._rng = np.random.default_rng(self._config.seed)
+        # generator of the factories, the scene draws its choices from _rng
+        self._random = Random(self._config.seed)
+        self._factories = []
+        self._agents_ate_count = 0
+        self._spawned_from_count = 0
+        self._ticks = 1
+        self._free_count = size
+        # prefix sums of food cells, None once food has been added or removed
+        self._food_prefix_sums: np.ndarray | None = None
+        self._map_view = MapView(
+            _GridObjects(self), self._field_width, self._field_height
+        )
+        self._agents_count = 0
+        self._max_agents_level = 0
+        self._is_max_level_outdated = False
+
+        # births and deaths of the tick are derived from the counters at its start
+        self._tick_start_agents_count = 0
+        self._tick_start_spawned_from_count = 0
+        self._added_agents_count = 0
+
+        self._profiler: TickProfiler | None = None
+        # grids as of the last pop_dirty_cells, None while dirty cells aren't
+        # tracked, changed cells are found by comparing them with the scene
+        self._tracked_kind: np.ndarray | None = None
+        self._tracked_level: np.ndarray | None = None
+
+    def get_agents_ate_count(self) -> int:
+        return self._agents_ate_count
+
+    def increment_agents_ate_count(self) -> None:
+        self._agents_ate_count += 1
+
+    def get_ticks(self) -> int:
+        return self._ticks
+
+    def get_config(self) -> SceneConfig:
+        return self._config
+
+    def get_map(self) -> MapView:
+        return self._map_view
+
+    def get_width(self) -> int:
+        return self._field_width
+
+    def get_height(self) -> int:
+        return self._field_height
+
+    def add_factory(self, factory) -> None:
+        self._factories.append(factory)
+
+    def get_spawned_from(self) -> int:
+        return self._spawned_from_count
+
+    def increment_spawned_from(self) -> None:
+        self._spawned_from_count += 1
+
+    def add_game_object(self, game_object, coords: tuple[int, int]) -> None:
+        if not game_object:
+            return
+
+        cell = self._to_cell(coords)
+
+        if self._kind[cell] != EMPTY:
+            raise ValueError("Tried to put object on the scene to not empty cell")
+
+        if isinstance(game_object, Agent):
+            self._kind[cell] = AGENT
+            self._amount[cell] = game_object.get_saturation()
+            self._experience[cell] = game_object.get_experience()
+
+            self._agents_count += 1
+            self._added_agents_count += 1
+            self._max_agents_level = max(
+                self._max_agents_level, game_object.get_level()
+            )
+        elif isinstance(game_object, Food):
+            self._kind[cell] = FOOD
+            self._amount[cell] = game_object.get_capacity()
+            self._food_prefix_sums = None
+        else:
+            raise ValueError(f"Unsupported game object {type(game_object).__name__}")
+
+        self._level[cell] = game_object.get_level()
+        self._free_count -= 1
+
+    def add_game_objects(self, objects: list[GameObject]) -> None:
+        kinds = []
+        amounts = []
+        experience = []
+
+        for obj in objects:
+            if isinstance(obj, Agent):
+                kinds.append(AGENT)
+                amounts.append(obj.get_saturation())
+                experience.append(obj.get_experience())
+            elif isinstance(obj, Food):
+                kinds.append(FOOD)
+                amounts.append(obj.get_capacity())
+                experience.append(0)
+            else:
+                raise ValueError(f"Unsupported game object {type(obj).__name__}")
+
+        cells = np.array(
+            [self._to_cell(obj.get_coords()) for obj in objects], dtype=np.int64
+        )
+
+        if len(np.unique(cells)) != len(cells) or np.any(self._kind[cells] != EMPTY):
+            raise ValueError("Tried to put object on the scene to not empty cell")
+
+        kinds = np.array(kinds, dtype=self._kind.dtype)
+        levels = np.array([obj.get_level() for obj in objects], dtype=np.int32)
+        is_agent = kinds == AGENT
+        agents_count = int(np.count_nonzero(is_agent))
+
+        self._kind[cells] = kinds
+        self._level[cells] = levels
+        self._amount[cells] = amounts
+        self._experience[cells] = experience
+
+        self._agents_count += agents_count
+        self._added_agents_count += agents_count
+        self._free_count -= len(cells)
+
+        if agents_count < len(cells):
+            self._food_prefix_sums = None
+
+        if agents_count:
+            self._max_agents_level = max(
+                self._max_agents_level, int(levels[is_agent].max())
+            )
+
+    def remove_game_object(self, game_object: GameObject) -> None:
+        cell = self._to_cell(game_object.get_coords())
+        kind = AGENT if isinstance(game_object, Agent) else FOOD
+
+        # objects are copies of cells, a copy made before the cell was taken by
+        # another object isn't in the scene anymore
+        if self._kind[cell] != kind or self._level[cell] != game_object.get_level():
+            return
+
+        if kind == AGENT:
+            self._agents_count -= 1
+            self._is_max_level_outdated = True
+
+        self._clear(cell)
+        self._free_count += 1
+
+    def move_game_object(
+        self, last_coords: tuple[int, int], new_coords: tuple[int, int]
+    ) -> None:
+        self._move(self._to_cell(last_coords), self._to_cell(new_coords))
+
+    def is_cell_empty(self, coords: tuple[int, int]) -> bool:
+        if self._is_in_bounds(coords):
+            return self._kind[self._to_cell(coords)] == EMPTY
+
+        return False
+
+    def get_max_agents_level(self) -> int:
+        if self._is_max_level_outdated:
+            agents_levels = self._level[self._kind == AGENT]
+            self._max_agents_level = int(agents_levels.max(initial=0))
+            self._is_max_level_outdated = False
+
+        return self._max_agents_level
+
+    def get_agents_count(self) -> int:
+        return self._agents_count
+
+    def update_agent_level(self, agent: GameObject, last_level: int) -> None:
+        # agents live in the grids, objects handed out by the scene are copies
+        pass
+
+    def update_agent_saturation(
+        self, agent: GameObject, last_saturation: float
+    ) -> None:
+        pass
+
+    def get_agents_levels(self) -> dict[int, int]:
+        return self._count_levels(AGENT)
+
+    def get_food_levels(self) -> dict[int, int]:
+        return self._count_levels(FOOD)
+
+    def get_mean_saturation(self) -> float:
+        if not self._agents_count:
+            return 0.0
+
+        return float(self._amount[self._kind == AGENT].mean())
+
+    def get_births_count(self) -> int:
+        return (
+            self._spawned_from_count
+            - self._tick_start_spawned_from_count
+            + self._added_agents_count
+        )
+
+    def get_deaths_count(self) -> int:
+        return self.get_births_count() - (
+            self._agents_count - self._tick_start_agents_count
+        )
+
+    def get_random(self) -> Random:
+        return self._random
+
+    def get_random_empty_cell(self) -> tuple[int, int] | None:
+        cells = self.get_random_empty_cells(1)
+
+        return cells[0] if cells else None
+
+    def get_random_empty_cells(self, amount: int) -> list[tuple[int, int]]:
+        amount = min(amount, self._free_count)
+
+        if amount <= 0:
+            return []
+
+        size = self._kind.size
+
+        if (self._free_count - amount) * _SPARSE_FREE_RATIO < size:
+            cells = self._rng.choice(
+                np.flatnonzero(self._kind == EMPTY), amount, replace=False
+            )
+        else:
+            cells = np.empty(0, dtype=np.int64)
+
+            while len(cells) < amount:
+                drawn = self._rng.integers(0, size, 2 * (amount - len(cells)) + 8)
+                cells = np.concatenate([cells, drawn[self._kind[drawn] == EMPTY]])
+
+                _, first_occurrences = np.unique(cells, return_index=True)
+                cells = cells[np.sort(first_occurrences)]
+
+            cells = cells[:amount]
+
+        return [self._to_coords(cell) for cell in cells.tolist()]
+
+    def is_agent_near(self, coords: tuple[int, int]) -> bool:
+        xs, ys = self._to_arrays(coords)
+
+        return bool(self._is_kind_near(xs, ys, AGENT)[0])
+
+    def get_agent_in_coords(self, coords: tuple[int, int]) -> GameObject | None:
+        if not self._is_in_bounds(coords):
+            return None
+
+        cell = self._to_cell(coords)
+
+        return self._make_game_object(cell) if self._kind[cell] == AGENT else None
+
+    def get_nearest_food_coords_by_radius(
+        self, coords_from: tuple[int, int], radius: int
+    ) -> tuple[int, int] | None:
+        if radius < 1:
+            return None
+
+        xs, ys = self._to_arrays(coords_from)
+        has_food, dxs, dys = self._find_nearest_food(
+            xs, ys, np.array([radius]), self._get_food_prefix_sums()
+        )
+
+        if not has_food[0]:
+            return None
+
+        return coords_from[0] + int(dxs[0]), coords_from[1] + int(dys[0])
+
+    def is_food_near_coords(self, coords: tuple[int, int]) -> bool:
+        xs, ys = self._to_arrays(coords)
+
+        return bool(self._is_kind_near(xs, ys, FOOD)[0])
+
+    def update(self) -> None:
+        self._start_tick()
+
+        with self._phase("agents"):
+            self._update_agents(np.flatnonzero(self._kind == AGENT), self._rng)
+
+        with self._phase("food"):
+            self._update_food()
+
+        self._is_max_level_outdated = True
+
+        with self._phase("factories"):
+            for factory in self._factories:
+                factory.update()
+
+    def set_profiler(self, profiler: TickProfiler | None) -> None:
+        self._profiler = profiler
+
+    def track_dirty_cells(self) -> None:
+        if self._tracked_kind is None:
+            self._tracked_kind = self._kind.copy()
+            self._tracked_level = self._level.copy()
+
+    def pop_dirty_cells(self) -> set[tuple[int, int]]:
+        if self._tracked_kind is None:
+            self.track_dirty_cells()
+            return set()
+
+        changed = np.flatnonzero(
+            (self._kind != self._tracked_kind) | (self._level != self._tracked_level)
+        )
+        self._tracked_kind[changed] = self._kind[changed]
+        self._tracked_level[changed] = self._level[changed]
+
+        ys, xs = np.divmod(changed, self._field_width)
+
+        return set(zip(xs.tolist(), ys.tolist(), strict=True))
+
+    def _phase(self, name: str) -> AbstractContextManager:
+        if self._profiler is None:
+            return _NO_PHASE
+
+        return self._profiler.phase(name)
+
+    def _start_tick(self) -> None:
+        self._ticks += 1
+
+        self._acted.fill(False)
+
+        self._tick_start_agents_count = self._agents_count
+        self._tick_start_spawned_from_count = self._spawned_from_count
+        self._added_agents_count = 0
+
+    def _count_levels(self, kind: int) -> dict[int, int]:
+        levels, amounts = np.unique(self._level[self._kind == kind], return_counts=True)
+
+        return dict(zip(levels.tolist(), amounts.tolist(), strict=True))
+
+    def _make_grid(self, size: int, dtype, fill_value) -> np.ndarray:
+        """
+        Allocate a grid of the scene
+
+        Args:
+            size (int): amount of cells
+            dtype: type of cell values
+            fill_value: initial value of every cell
+
+        Returns:
+            np.ndarray: flat grid
+        """
+        return np.full(size, fill_value, dtype=dtype)
+
+    def _update_food(self) -> None:
+        """
+        Decay every food, remove exhausted ones and let agents around eat the rest
+        """
+        food = np.flatnonzero(self._kind == FOOD)
+
+        self._amount[food] -= 0.1 * self._level[food]
+
+        is_exhausted = self._amount[food] <= 0
+        self._clear(food[is_exhausted])
+        self._free_count += int(np.count_nonzero(is_exhausted))
+
+        food = food[~is_exhausted]
+        xs, ys = self._split(food)
+
+        self._amount[food[self._is_kind_near(xs, ys, AGENT)]] -= 1
+
+    def _update_agents(self, agents: np.ndarray, rng: np.random.Generator) -> None:
+        """
+        Make agents to act
+
+        Args:
+            agents (np.ndarray): sorted cells of agents to update
+            rng (np.random.Generator): random generator for agents' choices
+        """
+        self._hunt(agents)
+
+        # predators have acted already and their prey is gone
+        agents = agents[(self._kind[agents] == AGENT) & ~self._acted[agents]]
+
+        level = self._level[agents]
+        saturation = self._amount[agents]
+        max_saturation = level * 10
+
+        is_saturated = (max_saturation * 0.8 <= saturation) & (
+            saturation <= max_saturation
+        )
+        is_hungry = (
+            ~is_saturated
+            & (max_saturation * 0.3 <= saturation)
+            & (saturation <= max_saturation * 0.8)
+        )
+        is_dead = ~is_saturated & ~is_hungry & (saturation <= 0)
+        is_exhausted = ~is_saturated & ~is_hungry & ~is_dead
+
+        dead = agents[is_dead]
+        self._clear(dead)
+        self._agents_count -= len(dead)
+        self._free_count += len(dead)
+
+        children = self._spawn_children(
+            agents, is_saturated & (saturation >= max_saturation * 0.85), rng
+        )
+        is_spawning = children >= 0
+
+        is_seeking = ~is_dead & ~is_spawning
+        seekers = agents[is_seeking]
+        walk = self._walk[agents]
+        is_moved = self._walk_agents(seekers, is_exhausted[is_seeking], rng)
+
+        self._feed(agents[is_spawning], np.zeros(np.count_nonzero(is_spawning), bool))
+        self._feed(seekers, is_moved)
+
+        cells = agents.copy()
+        cells[is_seeking] = seekers
+        alive = ~is_dead
+
+        self._hunt_acted_prey(
+            agents[alive],
+            cells[alive],
+            children[alive],
+            level[alive],
+            saturation[alive],
+            walk[alive],
+        )
+
+    def _hunt(self, agents: np.ndarray) -> None:
+        """
+        Let agents eat weaker agents next to them whose turn comes later, so the
+        prey is still in its cell at the turn of the predator. Prey acting
+        earlier in the tick is hunted after its turn, see _hunt_acted_prey.
+
+        Candidates are found with array operations, but eating is resolved one by
+        one in row-major order, because eaten predators and moved prey change the
+        options of the next candidates.
+
+        Args:
+            agents (np.ndarray): sorted cells of agents
+        """
+        xs, ys = self._split(agents)
+        levels = self._level[agents]
+
+        has_prey = np.zeros(len(agents), dtype=np.bool_)
+
+        for dx, dy in _WALKING_VECTORS:
+            cells, is_valid = self._shift(xs, ys, dx, dy)
+            has_prey |= (
+                is_valid
+                & (cells > agents)
+                & (self._kind[cells] == AGENT)
+                & (self._level[cells] < levels)
+            )
+
+        kind = self._kind
+        level = self._level
+        width = self._field_width
+        height = self._field_height
+
+        for cell in agents[has_prey].tolist():
+            if kind[cell] != AGENT or self._acted[cell]:
+                # eaten earlier in this tick
+                continue
+
+            y, x = divmod(cell, width)
+
+            for dx, dy in _WALKING_VECTORS:
+                if not (0 <= x + dx < width and 0 <= y + dy < height):
+                    continue
+
+                prey = cell + dy * width + dx
+
+                if prey > cell and kind[prey] == AGENT and level[prey] < level[cell]:
+                    # predator takes prey's cell and experience
+                    self._amount[prey] += self._amount[cell]
+                    level[prey] = level[cell]
+                    self._walk[prey] = self._walk[cell]
+                    self._clear(cell)
+                    self._acted[prey] = True
+
+                    self._agents_ate_count += 1
+                    self._agents_count -= 1
+                    self._free_count += 1
+                    break
+
+    def _hunt_acted_prey(
+        self,
+        origins: np.ndarray,
+        agents: np.ndarray,
+        children: np.ndarray,
+        level: np.ndarray,
+        saturation: np.ndarray,
+        walk: np.ndarray,
+    ) -> None:
+        """
+        Let agents eat weaker agents next to them whose turn came earlier in
+        the tick, at the cells the prey has stepped or stayed in.
+
+        Turns of a batch are only known after all of them, so such a predator
+        gives up the step, the feeding and the child it made in the batch and
+        eats the prey instead, resolved one by one in row-major order of the
+        predators.
+
+        Args:
+            origins (np.ndarray): sorted cells of agents at the start of the tick
+            agents (np.ndarray): cells of the agents after their turns
+            children (np.ndarray): cells of the agents' children spawned in
+                their turns, -1 for agents which haven't spawned a child
+            level (np.ndarray): levels of the agents at the start of the tick
+            saturation (np.ndarray): saturation of the agents at the start of
+                the tick
+            walk (np.ndarray): random walk directions of the agents at the
+                start of the tick
+        """
+        if not len(agents):
+            return
+
+        xs, ys = self._split(agents)
+        prey_levels = self._level[agents]
+        predators = []
+
+        for dx, dy in _WALKING_VECTORS:
+            cells, is_valid = self._shift(xs, ys, -dx, -dy)
+            found = np.minimum(np.searchsorted(origins, cells), len(origins) - 1)
+            predators.append(
+                found[
+                    is_valid
+                    & (origins[found] == cells)
+                    & (origins < cells)
+                    & (level[found] > prey_levels)
+                ]
+            )
+
+        width = self._field_width
+        height = self._field_height
+        kind = self._kind
+        # agents by their cells after their turns, predators by the cells of
+        # their prey
+        by_cell = dict(zip(agents.tolist(), range(len(agents)), strict=True))
+        is_eaten = np.zeros(len(agents), dtype=np.bool_)
+
+        for predator in np.unique(np.concatenate(predators)).tolist():
+            if is_eaten[predator]:
+                continue
+
+            y, x = divmod(int(origins[predator]), width)
+
+            for dx, dy in _WALKING_VECTORS:
+                if not (0 <= x + dx < width and 0 <= y + dy < height):
+                    continue
+
+                cell = (y + dy) * width + x + dx
+                prey = by_cell.get(cell)
+
+                if (
+                    prey is None
+                    or is_eaten[prey]
+                    or origins[prey] > origins[predator]
+                    or kind[cell] != AGENT
+                    or self._level[cell] >= level[predator]
+                ):
+                    continue
+
+                # predator takes prey's cell and experience, its state is the
+                # one from before its own turn
+                amount = saturation[predator] + self._amount[cell]
+                experience = self._experience[cell]
+                by_cell.pop(int(agents[predator]), None)
+
+                if children[predator] >= 0:
+                    self._clear(children[predator])
+                    self._spawned_from_count -= 1
+                    self._agents_count -= 1
+                    self._free_count += 1
+
+                self._move(agents[predator], cell)
+                self._amount[cell] = amount
+                self._level[cell] = level[predator]
+                self._experience[cell] = experience
+                self._walk[cell] = walk[predator]
+
+                agents[predator] = cell
+                by_cell[cell] = predator
+                is_eaten[prey] = True
+
+                self._agents_ate_count += 1
+                self._agents_count -= 1
+                self._free_count += 1
+                break
+
+    def _spawn_children(
+        self, agents: np.ndarray, is_ready: np.ndarray, rng: np.random.Generator
+    ) -> np.ndarray:
+        """
+        Spawn children of saturated agents in random empty cells around them
+
+        Args:
+            agents (np.ndarray): sorted cells of agents
+            is_ready (np.ndarray): mask of agents ready to spawn a child
+            rng (np.random.Generator): random generator for children's cells
+
+        Returns:
+            np.ndarray: cells of the agents' children, -1 for agents which
+                haven't spawned a child
+        """
+        parents_indices = np.flatnonzero(is_ready)
+        parents = agents[parents_indices]
+        xs, ys = self._split(parents)
+
+        offsets = _get_ring_offsets(1)
+        cells = np.empty((len(parents), len(offsets[0])), dtype=np.int64)
+        is_free = np.empty(cells.shape, dtype=np.bool_)
+
+        for index, (dx, dy) in enumerate(zip(*offsets, strict=True)):
+            cells[:, index], is_free[:, index] = self._get_free_in_direction(
+                xs, ys, dx, dy
+            )
+
+        children = cells[
+            np.arange(len(parents)), self._choose_random_column(is_free, rng)
+        ]
+
+        # agents with no free cell around look for food instead, as do agents
+        # whose cell was taken by the child of an agent acting earlier
+        candidates = np.flatnonzero(is_free.any(axis=1))
+        _, first_occurrences = np.unique(children[candidates], return_index=True)
+        spawned = candidates[first_occurrences]
+
+        parents = parents[spawned]
+        children = children[spawned]
+        half_saturation = self._amount[parents] // 2
+
+        self._kind[children] = AGENT
+        self._level[children] = self._level[parents]
+        self._amount[children] = half_saturation
+        self._experience[children] = self._experience[parents]
+        self._walk[children] = _NO_WALK
+        self._acted[children] = True
+
+        self._amount[parents] = half_saturation
+
+        self._spawned_from_count += len(spawned)
+        self._agents_count += len(spawned)
+        self._free_count -= len(spawned)
+
+        agents_children = np.full(len(agents), -1, dtype=np.int64)
+        agents_children[parents_indices[spawned]] = children
+
+        return agents_children
+
+    def _walk_agents(
+        self, agents: np.ndarray, is_exhausted: np.ndarray, rng: np.random.Generator
+    ) -> np.ndarray:
+        """
+        Move agents a step to the nearest food or a random step. Exhausted agents
+        without food in view stay.
+
+        Moves are made in two rounds, so agents can step into cells left earlier
+        in the tick like they do in Scene. In the first round agents step to food
+        through cells which are free at the start of the tick. In the second one
+        the rest try their step to food again and walk randomly if it's still
+        blocked.
+
+        Args:
+            agents (np.ndarray): sorted cells of agents, updated with new cells
+            is_exhausted (np.ndarray): mask of exhausted agents
+            rng (np.random.Generator): random generator for random steps
+
+        Returns:
+            np.ndarray: mask of agents which have moved
+        """
+        xs, ys = self._split(agents)
+        fov = 3 + self._level[agents]
+
+        has_food, dxs, dys = self._find_nearest_food(
+            xs, ys, fov, self._get_food_prefix_sums()
+        )
+
+        is_horizontal = np.abs(dxs) > np.abs(dys)
+        step_dxs = np.where(is_horizontal, np.sign(dxs), 0)
+        step_dys = np.where(is_horizontal, 0, np.where(dys < 0, -1, 1))
+
+        step_cells, is_step_free = self._get_free_in_direction(
+            xs, ys, step_dxs, step_dys
+        )
+        is_moved = self._resolve_moves(
+            agents, np.where(has_food & is_step_free, step_cells, -1)
+        )
+
+        waiting = np.flatnonzero(~is_moved & (has_food | ~is_exhausted))
+        xs = xs[waiting]
+        ys = ys[waiting]
+
+        step_cells, is_step_free = self._get_free_in_direction(
+            xs, ys, step_dxs[waiting], step_dys[waiting]
+        )
+        walks_to_food = has_food[waiting] & is_step_free
+
+        destinations = np.where(walks_to_food, step_cells, -1)
+        destinations[~walks_to_food] = self._choose_random_steps(
+            agents[waiting[~walks_to_food]],
+            xs[~walks_to_food],
+            ys[~walks_to_food],
+            rng,
+        )
+
+        waiting_agents = agents[waiting]
+        is_moved[waiting] = self._resolve_moves(waiting_agents, destinations)
+        agents[waiting] = waiting_agents
+
+        return is_moved
+
+    def _resolve_moves(
+        self, agents: np.ndarray, destinations: np.ndarray
+    ) -> np.ndarray:
+        """
+        Move agents to their destinations. The first agent in row-major order
+        takes the contested cell, the others stay.
+
+        Args:
+            agents (np.ndarray): sorted cells of agents, updated with new cells
+            destinations (np.ndarray): destination cells, -1 for agents which stay
+
+        Returns:
+            np.ndarray: mask of agents which have moved
+        """
+        moving = np.flatnonzero(destinations >= 0)
+        _, first_occurrences = np.unique(destinations[moving], return_index=True)
+        movers = moving[first_occurrences]
+
+        self._move(agents[movers], destinations[movers])
+        agents[movers] = destinations[movers]
+
+        is_moved = np.zeros(len(agents), dtype=np.bool_)
+        is_moved[movers] = True
+
+        return is_moved
+
+    def _choose_random_steps(
+        self,
+        agents: np.ndarray,
+        xs: np.ndarray,
+        ys: np.ndarray,
+        rng: np.random.Generator,
+    ) -> np.ndarray:
+        """
+        Keep walking in the current random direction or choose a new one
+
+        Args:
+            agents (np.ndarray): cells of agents
+            xs (np.ndarray): x coordinates of agents
+            ys (np.ndarray): y coordinates of agents
+            rng (np.random.Generator): random generator for new directions
+
+        Returns:
+            np.ndarray: destination cells, -1 for agents which can't move
+        """
+        walk = self._walk[agents].astype(np.int64)
+        has_walk = walk != _NO_WALK
+        current = np.where(has_walk, walk, 0)
+
+        current_cells, is_current_free = self._get_free_in_direction(
+            xs, ys, _WALKING_DX[current], _WALKING_DY[current]
+        )
+        keeps_walk = has_walk & is_current_free
+
+        cells = np.empty((len(agents), len(_WALKING_VECTORS)), dtype=np.int64)
+        is_free = np.empty(cells.shape, dtype=np.bool_)
+
+        for index, (dx, dy) in enumerate(_WALKING_VECTORS):
+            cells[:, index], is_free[:, index] = self._get_free_in_direction(
+                xs, ys, dx, dy
+            )
+
+        new_walk = self._choose_random_column(is_free, rng)
+        can_walk = is_free.any(axis=1)
+
+        self._walk[agents] = np.where(
+            keeps_walk, walk, np.where(can_walk, new_walk, _NO_WALK)
+        )
+
+        return np.where(
+            keeps_walk,
+            current_cells,
+            np.where(can_walk, cells[np.arange(len(agents)), new_walk], -1),
+        )
+
+    def _feed(self, agents: np.ndarray, is_moved: np.ndarray) -> None:
+        """
+        Let agents eat food around them, level up and spend saturation
+
+        Args:
+            agents (np.ndarray): cells of agents
+            is_moved (np.ndarray): mask of agents which moved during the tick
+        """
+        xs, ys = self._split(agents)
+        level = self._level[agents]
+        saturation = self._amount[agents]
+        experience = self._experience[agents]
+
+        is_fed = self._is_kind_near(xs, ys, FOOD)
+        experience += is_fed
+        saturation = np.where(
+            is_fed, np.minimum(saturation + 1, level * 10), saturation
+        )
+
+        level = np.where(experience >= level * 10, level + 1, level)
+
+        exhaustion = (0.12 * level) / 4
+        saturation -= np.where(is_moved, exhaustion, exhaustion / 4)
+
+        self._level[agents] = level
+        self._amount[agents] = saturation
+        self._experience[agents] = experience
+
+    def _find_nearest_food(
+        self, xs: np.ndarray, ys: np.ndarray, radii: np.ndarray, prefix: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Find the nearest food for every position in the same order Scene does.
+
+        The amount of food in a square is read from 2D prefix sums, so the ring
+        of the nearest food is found with a binary search and only that ring is
+        scanned.
+
+        Args:
+            xs (np.ndarray): x coordinates of square centers
+            ys (np.ndarray): y coordinates of square centers
+            radii (np.ndarray): square radii
+            prefix (np.ndarray): prefix sums of food cells
+
+        Returns:
+            tuple[np.ndarray, np.ndarray, np.ndarray]: mask of positions with food
+            in view, x and y offsets of the nearest food
+        """
+        dxs = np.zeros(len(xs), dtype=np.int64)
+        dys = np.zeros(len(xs), dtype=np.int64)
+
+        has_food = self._count_in_squares(prefix, xs, ys, radii) > 0
+        found = np.flatnonzero(has_food)
+
+        found_xs = xs[found]
+        found_ys = ys[found]
+        low = np.ones(len(found), dtype=np.int64)
+        high = radii[found].astype(np.int64)
+
+        while True:
+            is_searching = low < high
+
+            if not is_searching.any():
+                break
+
+            middle = (low + high) // 2
+            has_food_inside = (
+                self._count_in_squares(prefix, found_xs, found_ys, middle) > 0
+            )
+            high = np.where(is_searching & has_food_inside, middle, high)
+            low = np.where(is_searching & ~has_food_inside, middle + 1, low)
+
+        for radius in np.unique(low).tolist():
+            selected = np.flatnonzero(low == radius)
+            offset_xs, offset_ys = _get_ring_offsets(radius)
+
+            cells, is_valid = self._shift(
+                found_xs[selected, None],
+                found_ys[selected, None],
+                offset_xs,
+                offset_ys,
+            )
+            first_food = (is_valid & (self._kind[cells] == FOOD)).argmax(axis=1)
+
+            dxs[found[selected]] = offset_xs[first_food]
+            dys[found[selected]] = offset_ys[first_food]
+
+        return has_food, dxs, dys
+
+    def _get_food_prefix_sums(self) -> np.ndarray:
+        """
+        Get 2D prefix sums of food cells, built once for every change of food,
+        so they're shared by queries until food is added or removed
+
+        Returns:
+            np.ndarray: prefix sums with a zero first row and column
+        """
+        if self._food_prefix_sums is not None:
+            return self._food_prefix_sums
+
+        is_food = (self._kind == FOOD).reshape(self._field_height, self._field_width)
+
+        prefix = np.zeros(
+            (self._field_height + 1, self._field_width + 1), dtype=np.int32
+        )
+        np.cumsum(is_food, axis=0, dtype=np.int32, out=prefix[1:, 1:])
+        np.cumsum(prefix[1:, 1:], axis=1, out=prefix[1:, 1:])
+        self._food_prefix_sums = prefix
+
+        return prefix
+
+    def _count_in_squares(
+        self, prefix: np.ndarray, xs: np.ndarray, ys: np.ndarray, radii: np.ndarray
+    ) -> np.ndarray:
+        min_xs = np.maximum(xs - radii, 0)
+        max_xs = np.minimum(xs + radii, self._field_width - 1) + 1
+        min_ys = np.maximum(ys - radii, 0)
+        max_ys = np.minimum(ys + radii, self._field_height - 1) + 1
+
+        return (
+            prefix[max_ys, max_xs]
+            - prefix[min_ys, max_xs]
+            - prefix[max_ys, min_xs]
+            + prefix[min_ys, min_xs]
+        )
+
+    def _is_kind_near(self, xs: np.ndarray, ys: np.ndarray, kind: int) -> np.ndarray:
+        is_near = np.zeros(len(xs), dtype=np.bool_)
+
+        for dx, dy in zip(*_get_ring_offsets(1), strict=True):
+            cells, is_valid = self._shift(xs, ys, dx, dy)
+            is_near |= is_valid & (self._kind[cells] == kind)
+
+        return is_near
+
+    def _get_free_in_direction(
+        self, xs: np.ndarray, ys: np.ndarray, dx, dy
+    ) -> tuple[np.ndarray, np.ndarray]:
+        cells, is_valid = self._shift(xs, ys, dx, dy)
+
+        return cells, is_valid & (self._kind[cells] == EMPTY)
+
+    def _shift(
+        self, xs: np.ndarray, ys: np.ndarray, dx, dy
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Get cells shifted by the given offsets
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: shifted cells (0 if out of the map) and
+            mask of cells inside the map
+        """
+        new_xs = xs + dx
+        new_ys = ys + dy
+
+        is_valid = (
+            (new_xs >= 0)
+            & (new_xs < self._field_width)
+            & (new_ys >= 0)
+            & (new_ys < self._field_height)
+        )
+
+        return np.where(is_valid, new_ys * self._field_width + new_xs, 0), is_valid
+
+    def _choose_random_column(
+        self, is_allowed: np.ndarray, rng: np.random.Generator
+    ) -> np.ndarray:
+        keys = rng.random(is_allowed.shape)
+        keys[~is_allowed] = -1
+
+        return keys.argmax(axis=1)
+
+    def _move(self, sources, destinations) -> None:
+        self._kind[destinations] = self._kind[sources]
+        self._level[destinations] = self._level[sources]
+        self._amount[destinations] = self._amount[sources]
+        self._experience[destinations] = self._experience[sources]
+        self._walk[destinations] = self._walk[sources]
+
+        self._clear(sources)
+
+    def _clear(self, cells) -> None:
+        if self._food_prefix_sums is not None and np.any(self._kind[cells] == FOOD):
+            self._food_prefix_sums = None
+
+        self._kind[cells] = EMPTY
+        self._level[cells] = 0
+        self._amount[cells] = 0
+        self._experience[cells] = 0
+        self._walk[cells] = _NO_WALK
+
+    def _make_game_object(self, cell: int) -> GameObject:
+        coords = self._to_coords(cell)
+        level = int(self._level[cell])
+
+        if self._kind[cell] == FOOD:
+            food = Food(coords, level, self)
+            food._capacity = float(self._amount[cell])
+
+            return food
+
+        agent = Agent(coords, self, None, level=level)
+        agent._saturation = float(self._amount[cell])
+        agent._experience = int(self._experience[cell])
+
+        walk = int(self._walk[cell])
+        agent._random_walk_vector = None if walk == _NO_WALK else _WALKING_VECTORS[walk]
+        agent.update_state()
+
+        return agent
+
+    def _split(self, cells: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        ys, xs = np.divmod(cells, self._field_width)
+
+        return xs, ys
+
+    def _to_arrays(self, coords: tuple[int, int]) -> tuple[np.ndarray, np.ndarray]:
+        return np.array([coords[0]]), np.array([coords[1]])
+
+    def _to_cell(self, coords: tuple[int, int]) -> int:
+        return coords[1] * self._field_width + coords[0]
+
+    def _to_coords(self, cell: int) -> tuple[int, int]:
+        y, x = divmod(cell, self._field_width)
+
+        return x, y
+
+    def _is_in_bounds(self, coords: tuple[int, int]) -> bool:
+        return (
+            0 <= coords[0] < self._field_width and 0 <= coords[1] < self._field_height
+        )
+
+
+class _GridObjects(Mapping):
+    """
+    Objects of the occupied cells of NumpyScene by cell index, built from the
+    grids on every lookup
+    """
+
+    def __init__(self, scene: NumpyScene) -> None:
+        self._scene = scene
+
+    def __getitem__(self, cell: int) -> GameObject:
+        if self._scene._kind[cell] == EMPTY:
+            raise KeyError(cell)
+
+        return self._scene._make_game_object(cell)
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self._scene._kind))
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(np.flatnonzero(self._scene._kind).tolist())
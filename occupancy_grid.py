@@ -0,0 +1,91 @@
+"""
+Kinds of cells of flat occupancy grids and lazy map views over them.
+
+Scenes keep the kind of every cell in a flat row-major grid of bytes, so
+checking a cell doesn't touch game objects, and keep objects only for the
+occupied cells.
+"""
+
+from collections.abc import Iterator, Mapping, Sequence
+
+from game_object import GameObject
+
+EMPTY = 0
+FOOD = 1
+AGENT = 2
+# game objects which are neither agents nor food
+OTHER = 3
+
+
+class MapView(Sequence):
+    """
+    Rows of the map of objects in occupied cells, with None in empty ones.
+
+    Rows are views too, so reading a cell doesn't build its row, and the view
+    follows changes of the objects. Objects are looked up by cell index in any
+    mapping, e.g. one which builds them from the grids of the scene.
+    """
+
+    def __init__(
+        self, cells: Mapping[int, GameObject], width: int, height: int
+    ) -> None:
+        self._cells = cells
+        self._width = width
+        self._height = height
+
+    def __len__(self) -> int:
+        return self._height
+
+    def __getitem__(self, y):
+        if isinstance(y, slice):
+            return [self._get_row(i) for i in range(*y.indices(self._height))]
+
+        if y < 0:
+            y += self._height
+
+        if not 0 <= y < self._height:
+            raise IndexError("Map row index out of range")
+
+        return self._get_row(y)
+
+    def __iter__(self) -> Iterator["MapRow"]:
+        for y in range(self._height):
+            yield self._get_row(y)
+
+    def _get_row(self, y: int) -> "MapRow":
+        return MapRow(self._cells, y * self._width, self._width)
+
+
+class MapRow(Sequence):
+    """
+    Objects of a row of the map, see MapView
+    """
+
+    def __init__(self, cells: Mapping[int, GameObject], start: int, width: int) -> None:
+        self._cells = cells
+        self._start = start
+        self._width = width
+
+    def __len__(self) -> int:
+        return self._width
+
+    def __getitem__(self, x):
+        if isinstance(x, slice):
+            get = self._cells.get
+            start = self._start
+
+            return [get(start + i) for i in range(*x.indices(self._width))]
+
+        if x < 0:
+            x += self._width
+
+        if not 0 <= x < self._width:
+            raise IndexError("Map cell index out of range")
+
+        return self._cells.get(self._start + x)
+
+    def __iter__(self) -> Iterator[GameObject | None]:
+        get = self._cells.get
+
+        for cell in range(self._start, self._start + self._width):
+            yield get(cell)
@@ -0,0 +1,291 @@
+import os
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from numpy_scene import AGENT, NumpyScene
+from scene_config import SceneConfig
+
+# by default the map is split into about _TILES_PER_SIDE x _TILES_PER_SIDE tiles,
+# so every tile has enough agents to outweigh the cost of a batch update
+_TILES_PER_SIDE = 8
+_MIN_TILE_SIZE = 16
+
+# an agent acting in a tick touches cells at most this far from its position:
+# it steps to a neighbour cell and eats food next to it
+_BORDER_WIDTH = 2
+
+# scene attached to the shared grids in a worker process
+_worker_scene = None
+
+
+class ParallelNumpyScene(NumpyScene):
+    """
+    NumpyScene which updates agents of different parts of the map in parallel
+    processes.
+
+    The map is split into square tiles. Agents at least _BORDER_WIDTH cells away
+    from the edges of their tile only touch cells of that tile, so interiors of
+    all tiles are updated concurrently by a pool of worker processes, which
+    work on the grids kept in shared memory. Agents near tile edges are updated
+    afterwards in a serial pass, so eating and spawning across tile edges
+    follow the same rules as inside tiles.
+
+    Every tile gets its own random stream derived from the scene seed, the tick
+    and the tile, so a run doesn't depend on the amount of workers. Tiles are
+    also sized by the map only, unless tile_size is given.
+    """
+
+    def __init__(
+        self,
+        config: SceneConfig | None = None,
+        workers: int | None = None,
+        tile_size: int | None = None,
+    ) -> None:
+        config = config or SceneConfig()
+
+        if tile_size is None:
+            tile_size = max(
+                -(-max(config.width, config.height) // _TILES_PER_SIDE),
+                _MIN_TILE_SIZE,
+            )
+
+        if tile_size <= 2 * _BORDER_WIDTH:
+            raise ValueError(
+                f"Tile size should be greater than {2 * _BORDER_WIDTH}, got {tile_size}"
+            )
+
+        self._shared_blocks: list[SharedMemory] = []
+        self._executors: list[ProcessPoolExecutor] = []
+
+        super().__init__(config)
+
+        self._workers = workers or os.cpu_count() or 1
+        self._tile_size = tile_size
+        self._food_prefix = _make_food_prefix_grid(self)
+        self._is_food_prefix_fixed = False
+        self._tiles, self._is_interior = self._split_into_tiles()
+        self._seed_sequence = np.random.SeedSequence(self._config.seed)
+        self._finalizer = weakref.finalize(
+            self, _release, self._shared_blocks, self._executors
+        )
+
+    def __enter__(self) -> "ParallelNumpyScene":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def get_workers(self) -> int:
+        return self._workers
+
+    def close(self) -> None:
+        """
+        Stop worker processes and free the shared memory
+        """
+        self._finalizer()
+
+    def update(self) -> None:
+        self._start_tick()
+
+        # food doesn't change while agents act, so the prefix sums of food cells
+        # are shared by all tiles
+        self._food_prefix[...] = super()._get_food_prefix_sums()
+        self._is_food_prefix_fixed = True
+
+        agents = np.flatnonzero(self._kind == AGENT)
+        is_interior = self._is_interior[agents]
+
+        with self._phase("tiles"):
+            self._update_tiles(agents[is_interior])
+
+        with self._phase("borders"):
+            self._update_agents(agents[~is_interior], self._rng)
+
+        self._is_food_prefix_fixed = False
+
+        with self._phase("food"):
+            self._update_food()
+
+        self._is_max_level_outdated = True
+
+        with self._phase("factories"):
+            for factory in self._factories:
+                factory.update()
+
+    def _update_tiles(self, agents: np.ndarray) -> None:
+        """
+        Update agents inside tiles, every tile on its own
+
+        Args:
+            agents (np.ndarray): sorted cells of agents inside tiles
+        """
+        tiles = self._tiles[agents]
+        order = np.argsort(tiles, kind="stable")
+        agents = agents[order]
+        tiles = tiles[order]
+
+        tile_ids, starts = np.unique(tiles, return_index=True)
+        groups = np.split(agents, starts[1:])
+        seeds = [
+            np.random.SeedSequence(
+                self._seed_sequence.entropy, spawn_key=(self._ticks, tile)
+            )
+            for tile in tile_ids.tolist()
+        ]
+
+        if self._workers == 1:
+            for group, seed in zip(groups, seeds, strict=True):
+                self._update_agents(group, np.random.default_rng(seed))
+
+            return
+
+        chunksize = max(1, len(groups) // (4 * self._workers))
+        deltas = self._get_executor().map(
+            _update_tile, groups, seeds, chunksize=chunksize
+        )
+
+        for ate, spawned, agents_count, free_count in deltas:
+            self._agents_ate_count += ate
+            self._spawned_from_count += spawned
+            self._agents_count += agents_count
+            self._free_count += free_count
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if not self._executors:
+            self._executors.append(
+                ProcessPoolExecutor(
+                    max_workers=self._workers,
+                    initializer=_init_worker,
+                    initargs=(
+                        self._config,
+                        [block.name for block in self._shared_blocks],
+                    ),
+                )
+            )
+
+        return self._executors[0]
+
+    def _split_into_tiles(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Assign cells to tiles
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: tile of every cell and mask of cells
+            far enough from the edges of their tile. Edges of the map aren't
+            shared with other tiles, so they don't count.
+        """
+        width = self._field_width
+        height = self._field_height
+        size = self._tile_size
+
+        ys, xs = np.divmod(np.arange(width * height), width)
+        tiles = (ys // size) * -(-width // size) + xs // size
+        is_interior = _is_far_from_tile_edges(xs, size, width)
+        is_interior &= _is_far_from_tile_edges(ys, size, height)
+
+        return tiles, is_interior
+
+    def _make_grid(self, size: int, dtype, fill_value) -> np.ndarray:
+        nbytes = max(size * np.dtype(dtype).itemsize, 1)
+        block = SharedMemory(create=True, size=nbytes)
+        self._shared_blocks.append(block)
+
+        grid = np.ndarray(size, dtype=dtype, buffer=block.buf)
+        grid.fill(fill_value)
+
+        return grid
+
+    def _get_food_prefix_sums(self) -> np.ndarray:
+        if self._is_food_prefix_fixed:
+            return self._food_prefix
+
+        return super()._get_food_prefix_sums()
+
+
+class _TileScene(NumpyScene):
+    """
+    Scene of a worker process attached to the grids of a ParallelNumpyScene
+    """
+
+    def __init__(self, config: SceneConfig, block_names: list[str]) -> None:
+        self._block_names = iter(block_names)
+        self._shared_blocks: list[SharedMemory] = []
+
+        super().__init__(config)
+
+        self._food_prefix = _make_food_prefix_grid(self)
+
+    def _make_grid(self, size: int, dtype, fill_value) -> np.ndarray:
+        # blocks are unlinked by the parent scene
+        block = SharedMemory(name=next(self._block_names))
+        self._shared_blocks.append(block)
+
+        return np.ndarray(size, dtype=dtype, buffer=block.buf)
+
+    def _get_food_prefix_sums(self) -> np.ndarray:
+        return self._food_prefix
+
+
+def _is_far_from_tile_edges(
+    values: np.ndarray, tile_size: int, limit: int
+) -> np.ndarray:
+    tile_start = values // tile_size * tile_size
+    tile_end = np.minimum(tile_start + tile_size, limit)
+
+    return ((values - tile_start >= _BORDER_WIDTH) | (tile_start == 0)) & (
+        (tile_end - 1 - values >= _BORDER_WIDTH) | (tile_end == limit)
+    )
+
+
+def _make_food_prefix_grid(scene: NumpyScene) -> np.ndarray:
+    shape = (scene.get_height() + 1, scene.get_width() + 1)
+
+    return scene._make_grid(shape[0] * shape[1], np.int32, 0).reshape(shape)
+
+
+def _init_worker(config: SceneConfig, block_names: list[str]) -> None:
+    global _worker_scene
+
+    _worker_scene = _TileScene(config, block_names)
+
+
+def _update_tile(
+    agents: np.ndarray, seed: np.random.SeedSequence
+) -> tuple[int, int, int, int]:
+    """
+    Update agents of one tile in a worker process
+
+    Args:
+        agents (np.ndarray): sorted cells of agents inside the tile
+        seed (np.random.SeedSequence): seed of the tile's random stream
+
+    Returns:
+        tuple[int, int, int, int]: changes of eaten agents, spawned agents,
+        agents and free cells counts
+    """
+    scene = _worker_scene
+
+    scene._agents_ate_count = 0
+    scene._spawned_from_count = 0
+    scene._agents_count = 0
+    scene._free_count = 0
+
+    scene._update_agents(agents, np.random.default_rng(seed))
+
+    return (
+        scene._agents_ate_count,
+        scene._spawned_from_count,
+        scene._agents_count,
+        scene._free_count,
+    )
+
+
+def _release(blocks: list[SharedMemory], executors: list[ProcessPoolExecutor]) -> None:
+    for executor in executors:
+        executor.shutdown()
+
+    for block in blocks:
+        block.unlink()
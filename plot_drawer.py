@@ -1,11 +1,12 @@
 import csv
 import os
-from dataclasses import fields
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
 from typing import Any
 
 import matplotlib.pyplot as plt
 
-from data_dumper import DataDumpInfo
+from npy_dumper import read_npy_stats
 
 
 class OSEntityExistsException(Exception): ...
@@ -14,7 +15,7 @@ class OSEntityExistsException(Exception): ...
 def _get_nearest_square(limit: int):
     result = 0
 
-    while (result + 1) ** 2 <= limit:
+    while result**2 < limit:
         result += 1
 
     return result
@@ -24,6 +25,13 @@ def _convert_from_snake_to_normal(string: str) -> str:
     return " ".join([s.title() for s in string.split("_")])
 
 
+def _parse_number(value: str) -> int | float:
+    try:
+        return int(value)
+    except ValueError:
+        return float(value)
+
+
 def _flatten(_list: list[list[Any]]) -> list[Any]:
     flat_list = []
 
@@ -33,13 +41,16 @@ def _flatten(_list: list[list[Any]]) -> list[Any]:
     return flat_list
 
 
-class CSVPlotDrawer:
-    def __init__(self, file_path: str, plot_directory: str) -> None:
-        self._file_path = file_path
+class PlotDrawer(ABC):
+    """
+    Draws a plot of every stats column and a combined plot of all of them
+    """
+
+    def __init__(self, plot_directory: str) -> None:
         self._plot_directory = plot_directory
 
     def draw(self) -> None:
-        data = self._read_data_from_csv()
+        data = self._read_data()
 
         self._ensure_directory_exists()
 
@@ -52,7 +63,8 @@ class CSVPlotDrawer:
         # print combined plot
         subplot_height = _get_nearest_square(len(data.keys()))
 
-        fig, axes = plt.subplots(subplot_height, subplot_height)
+        # axes are always a 2D array, a single subplot isn't wrapped otherwise
+        fig, axes = plt.subplots(subplot_height, subplot_height, squeeze=False)
 
         subplots = _flatten(axes)
 
@@ -63,24 +75,15 @@ class CSVPlotDrawer:
         fig.tight_layout()
         plt.savefig(os.path.join(self._plot_directory, "combined.png"))
 
-    def _read_data_from_csv(self) -> dict[str, Any]:
-        with open(self._file_path, "r") as csv_file:
-            reader = csv.DictReader(
-                csv_file, fieldnames=[f.name for f in fields(DataDumpInfo)]
-            )
-
-            full_data = {}
+    @abstractmethod
+    def _read_data(self) -> dict[str, Sequence]:
+        """
+        Read stats of the run
 
-            for data in reader:
-                for k, v in data.items():
-                    if k == v:
-                        continue
-                    if not full_data.get(k):
-                        full_data[k] = [int(v)]
-                    else:
-                        full_data[k].append(int(v))
-
-        return full_data
+        Returns:
+            dict[str, Sequence]: values of every stats column by its name
+        """
+        ...
 
     def _ensure_directory_exists(self) -> None:
         if os.path.exists(self._plot_directory):
@@ -94,5 +97,39 @@ class CSVPlotDrawer:
         os.mkdir(self._plot_directory)
 
 
+class CSVPlotDrawer(PlotDrawer):
+    def __init__(self, file_path: str, plot_directory: str) -> None:
+        super().__init__(plot_directory)
+
+        self._file_path = file_path
+
+    def _read_data(self) -> dict[str, Any]:
+        with open(self._file_path, "r") as csv_file:
+            reader = csv.reader(csv_file)
+            header = next(reader)
+
+            full_data = {k: [] for k in header}
+
+            for row in reader:
+                for k, v in zip(header, row, strict=True):
+                    full_data[k].append(_parse_number(v))
+
+        return full_data
+
+
+class NPYPlotDrawer(PlotDrawer):
+    """
+    Draws plots of stats written by NPYDumper
+    """
+
+    def __init__(self, stats_directory: str, plot_directory: str) -> None:
+        super().__init__(plot_directory)
+
+        self._stats_directory = stats_directory
+
+    def _read_data(self) -> dict[str, Sequence]:
+        return read_npy_stats(self._stats_directory)
+
+
 if __name__ == "__main__":
     CSVPlotDrawer("stat.csv", "plots").draw()
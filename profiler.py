@@ -0,0 +1,191 @@
+import functools
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+
+# scene queries counted by TickProfiler.instrument_queries
+_QUERIES = (
+    "get_nearest_food_coords_by_radius",
+    "is_food_near_coords",
+    "is_agent_near",
+    "get_agent_in_coords",
+    "is_cell_empty",
+    "get_square_coords",
+    "get_square_coords_in_bounds",
+    "_get_objects_in_square",
+    "get_random_empty_cell",
+    "get_random_empty_cells",
+)
+
+
+class TickProfiler:
+    """
+    Collects time spent in nested phases of the simulation.
+
+    Phases form a stack, a phase started inside another one is recorded under
+    its path, e.g. ("tick", "scene", "objects", "Agent"). Time of a phase
+    includes time of its nested phases, self time is what's left after them.
+
+    Instrumented scene queries are recorded as phases too, so a query shows up
+    under the phase which called it.
+    """
+
+    def __init__(self) -> None:
+        self._path: list[str] = []
+        self._starts: list[float] = []
+        self._totals: dict[tuple[str, ...], float] = {}
+        self._calls: dict[tuple[str, ...], int] = {}
+
+    def start(self, name: str) -> None:
+        """
+        Start a phase nested in the current one
+
+        Args:
+            name (str): name of the phase
+        """
+        self._path.append(name)
+        self._starts.append(time.perf_counter())
+
+    def stop(self) -> None:
+        """
+        Stop the current phase and record its time
+        """
+        elapsed = time.perf_counter() - self._starts.pop()
+        path = tuple(self._path)
+        self._path.pop()
+
+        self._totals[path] = self._totals.get(path, 0.0) + elapsed
+        self._calls[path] = self._calls.get(path, 0) + 1
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Record time of the with block as a phase
+
+        Args:
+            name (str): name of the phase
+        """
+        self.start(name)
+
+        try:
+            yield
+        finally:
+            self.stop()
+
+    def instrument_queries(self, scene) -> None:
+        """
+        Wrap query methods of the scene instance, so every call is recorded
+        as a phase named after the query. Other instances of the scene class
+        aren't affected.
+
+        Args:
+            scene (AbstractScene): scene to instrument
+        """
+        for name in _QUERIES:
+            method = getattr(scene, name, None)
+
+            if method is not None:
+                setattr(scene, name, self._wrap(name, method))
+
+    def get_totals(self) -> dict[tuple[str, ...], float]:
+        """
+        Get total time of every recorded phase
+
+        Returns:
+            dict[tuple[str, ...], float]: seconds by path of the phase
+        """
+        return dict(self._totals)
+
+    def get_calls(self) -> dict[tuple[str, ...], int]:
+        """
+        Get amount of times every phase was recorded
+
+        Returns:
+            dict[tuple[str, ...], int]: amount of calls by path of the phase
+        """
+        return dict(self._calls)
+
+    def get_self_times(self) -> dict[tuple[str, ...], float]:
+        """
+        Get time of every phase without time of its nested phases
+
+        Returns:
+            dict[tuple[str, ...], float]: seconds by path of the phase
+        """
+        self_times = dict(self._totals)
+
+        for path, total in self._totals.items():
+            parent = path[:-1]
+
+            if parent in self_times:
+                self_times[parent] -= total
+
+        return self_times
+
+    def get_summary(self) -> str:
+        """
+        Format a table of phases with their total time and calls, and a table
+        of calls of the instrumented queries summed over all callers
+
+        Returns:
+            str: summary report
+        """
+        root_time = sum(total for path, total in self._totals.items() if len(path) == 1)
+        lines = [
+            f"{'phase':<48} {'total, s':>10} {'%':>6} {'calls':>10} "
+            f"{'per call, us':>13}"
+        ]
+
+        for path in sorted(self._totals):
+            total = self._totals[path]
+            calls = self._calls[path]
+            name = "  " * (len(path) - 1) + path[-1]
+            share = total / root_time * 100 if root_time else 0.0
+
+            lines.append(
+                f"{name:<48} {total:>10.4f} {share:>6.1f} {calls:>10} "
+                f"{total / calls * 1e6:>13.2f}"
+            )
+
+        query_calls: dict[str, int] = {}
+
+        for path, calls in self._calls.items():
+            if path[-1] in _QUERIES:
+                query_calls[path[-1]] = query_calls.get(path[-1], 0) + calls
+
+        if query_calls:
+            lines.append("")
+            lines.append(f"{'query':<48} {'calls':>10}")
+
+            for name, calls in sorted(query_calls.items(), key=lambda q: -q[1]):
+                lines.append(f"{name:<48} {calls:>10}")
+
+        return "\n".join(lines)
+
+    def export_folded(self, file_path: str) -> None:
+        """
+        Write self times of phases in the folded stacks format, one
+        "phase;nested_phase microseconds" line per phase, which flamegraph.pl,
+        speedscope and inferno read
+
+        Args:
+            file_path (str): path of the output file
+        """
+        with open(file_path, "w") as file:
+            for path, self_time in sorted(self.get_self_times().items()):
+                microseconds = round(self_time * 1e6)
+
+                if microseconds > 0:
+                    file.write(f"{';'.join(path)} {microseconds}\n")
+
+    def _wrap(self, name: str, method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            self.start(name)
+
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.stop()
+
+        return wrapper
@@ -7,15 +7,50 @@ from agent import Agent
 from food import Food
 from graphical_client import GraphicalClient
 
+_SCREEN_SIZE = (1200, 800)
+_SCENE_SIZE = (750, 750)
+_SCENE_POSITION = (30, 30)
+_GUI_POSITION = (_SCENE_POSITION[0] + _SCENE_SIZE[0] + 10, _SCENE_POSITION[1])
+
+_BACKGROUND_COLOR = (0, 0, 0)
+_GRID_COLOR = (255, 255, 255)
+_TEXT_COLOR = (255, 255, 255)
+_FOOD_COLOR = (82, 190, 79)
+_AGENT_COLOR = (255, 0, 0)
+
+# cells of maps too large to fit the scene surface are kept this large, and
+# only the cells from the origin which fit are drawn
+_MIN_CELL_SIZE = 5
+
+# when more of the map than this changes, it's sent to the display as a whole
+# instead of a rect per cell
+_FULL_UPDATE_RATIO = 0.25
+
 
 class PygameClient(GraphicalClient):
+    """
+    Draws the scene with pygame.
+
+    The whole screen is drawn on the first frame of a scene. After that only
+    cells changed since the last frame are redrawn from the cached grid and
+    sprites of objects, and only they and the changed GUI lines are sent to
+    the display. Maps whose cells would be smaller than _MIN_CELL_SIZE are
+    shown through a viewport of the cells from the origin which fit.
+    """
+
     def __init__(self, scene: AbstractScene = None) -> None:
         super().__init__(scene)
-        self._screen = pygame.display.set_mode([1200, 800])
-        self._scene_surface = pygame.Surface((750, 750))
+        self._screen = pygame.display.set_mode(_SCREEN_SIZE)
+        self._scene_surface = pygame.Surface(_SCENE_SIZE)
         self._clock = pygame.time.Clock()
         self._fps = 10
 
+        self._is_drawn = False
+        self._grid_surface: pygame.Surface | None = None
+        # last drawn text of every GUI line and the screen area it took
+        self._gui_texts: dict[int, str] = {}
+        self._gui_rects: dict[int, pygame.Rect] = {}
+
         pygame.font.init()
 
     @property
@@ -29,6 +64,11 @@ class PygameClient(GraphicalClient):
         else:
             self._fps = value
 
+    def set_scene(self, scene: AbstractScene) -> None:
+        super().set_scene(scene)
+
+        self._is_drawn = False
+
     def update(self) -> None:
         super().update()
 
@@ -37,173 +77,241 @@ class PygameClient(GraphicalClient):
                 pygame.quit()
                 raise NotImplementedError("[DEV] Add here another exception!")
             elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_DOWN:
-                    self.fps -= 2
-                if event.key == pygame.K_UP:
-                    self.fps += 2
-
-        self._clear_screen()
-        self._clear_grid()
-
-        self._draw_grid()
-        self._draw_scene()
-        self._draw_gui()
-
-        self._screen.blit(
-            self._scene_surface,
-            (
-                30,
-                30,
-            ),
-        )
-
-        pygame.display.update()
+                self._handle_key(event.key)
+
+        if not self._is_drawn:
+            self._draw_all()
+            pygame.display.update()
+            return
+
+        rects = self._draw_dirty_cells()
+        rects.extend(self._draw_gui())
+
+        if rects:
+            pygame.display.update(rects)
+
+    def _handle_key(self, key: int) -> None:
+        # UP and DOWN change speed of the simulation, LEFT and RIGHT the frame
+        # rate, so the run may be fast-forwarded while it's drawn smoothly
+        if key == pygame.K_UP:
+            self.ticks_per_frame *= 2
+        elif key == pygame.K_DOWN:
+            self.ticks_per_frame //= 2
+        elif key == pygame.K_RIGHT:
+            self.fps += 2
+        elif key == pygame.K_LEFT:
+            self.fps -= 2
 
     def delay(self) -> None:
         self._clock.tick(self.fps)
 
     @cache
-    def _get_game_object_font(self) -> pygame.font.Font:
-        width, height = self._get_grid_dims()
-
-        return pygame.font.Font("assets/SpaceMono-Bold.ttf", min(width, height) - 6)
+    def _get_game_object_font(self, size: int) -> pygame.font.Font:
+        return pygame.font.Font("assets/SpaceMono-Bold.ttf", size)
 
     @cache
     def _get_gui_font(self) -> pygame.font.Font:
         return pygame.font.Font("assets/SpaceMono-Bold.ttf", 22)
 
-    def _clear_screen(self):
-        self._screen.fill((0, 0, 0))
+    @cache
+    def _get_object_sprite(
+        self, color: tuple[int, int, int], level: int, cell_size: tuple[int, int]
+    ) -> pygame.Surface:
+        """
+        Render a circle of the object with its level, transparent around it
+
+        Args:
+            color (tuple[int, int, int]): color of the circle
+            level (int): level of the object
+            cell_size (tuple[int, int]): size of a grid cell
+
+        Returns:
+            pygame.Surface: sprite of the cell size
+        """
+        width, height = cell_size
+        center = (width // 2, height // 2)
+        radius = max(min(width, height) // 2 - 3, 1)
 
-    def _clear_grid(self) -> None:
-        self._scene_surface.fill((0, 0, 0))
+        sprite = pygame.Surface(cell_size, pygame.SRCALPHA)
+        pygame.draw.circle(sprite, color, center, radius)
+
+        font = self._get_game_object_font(max(min(width, height) - 6, 1))
+        glyph = font.render(str(level), 0, _TEXT_COLOR)
+        sprite.blit(glyph, glyph.get_rect(center=center))
+
+        return sprite
 
     def _get_grid_dims(self) -> tuple[int, int]:
-        block_width = self._scene_surface.get_width() // self._scene.get_width()
-        block_height = self._scene_surface.get_height() // self._scene.get_height()
+        block_width = max(
+            self._scene_surface.get_width() // self._scene.get_width(), _MIN_CELL_SIZE
+        )
+        block_height = max(
+            self._scene_surface.get_height() // self._scene.get_height(),
+            _MIN_CELL_SIZE,
+        )
 
         return block_width, block_height
 
-    def _draw_grid(self) -> None:
+    def _get_visible_size(self) -> tuple[int, int]:
+        """
+        Get amounts of columns and rows of the map which fit the scene surface
+
+        Returns:
+            tuple[int, int]: width and height of the viewport in cells
+        """
+        block_width, block_height = self._get_grid_dims()
+
+        return (
+            min(
+                self._scene.get_width(), self._scene_surface.get_width() // block_width
+            ),
+            min(
+                self._scene.get_height(),
+                self._scene_surface.get_height() // block_height,
+            ),
+        )
+
+    def _draw_all(self) -> None:
+        # the scene is drawn from scratch, so earlier changes don't matter
+        self._scene.track_dirty_cells()
+        self._scene.pop_dirty_cells()
+
+        self._grid_surface = self._render_grid()
+        self._scene_surface.blit(self._grid_surface, (0, 0))
+
+        visible_width, visible_height = self._get_visible_size()
+        scene_map = self._scene.get_map()
+
+        for y in range(visible_height):
+            for x, obj in enumerate(scene_map[y][:visible_width]):
+                if obj:
+                    self._draw_cell(x, y, obj)
+
+        self._screen.fill(_BACKGROUND_COLOR)
+        self._screen.blit(self._scene_surface, _SCENE_POSITION)
+
+        self._gui_texts.clear()
+        self._gui_rects.clear()
+        self._draw_gui()
+
+        self._is_drawn = True
+
+    def _render_grid(self) -> pygame.Surface:
         block_width, block_height = self._get_grid_dims()
+        visible_width, visible_height = self._get_visible_size()
+        surface = pygame.Surface(_SCENE_SIZE)
+        surface.fill(_BACKGROUND_COLOR)
 
-        for x in range(0, self._scene.get_width() * block_width, block_width):
-            for y in range(0, self._scene.get_height() * block_height, block_height):
+        for x in range(0, visible_width * block_width, block_width):
+            for y in range(0, visible_height * block_height, block_height):
                 rect = pygame.Rect(x, y, block_width, block_height)
-                pygame.draw.rect(self._scene_surface, (255, 255, 255), rect, 1)
+                pygame.draw.rect(surface, _GRID_COLOR, rect, 1)
+
+        return surface
+
+    def _draw_dirty_cells(self) -> list[pygame.Rect]:
+        """
+        Redraw cells changed since the last frame
+
+        Returns:
+            list[pygame.Rect]: areas of the screen to update
+        """
+        visible_width, visible_height = self._get_visible_size()
+        dirty_cells = [
+            (x, y)
+            for x, y in self._scene.pop_dirty_cells()
+            if x < visible_width and y < visible_height
+        ]
+
+        if not dirty_cells:
+            return []
 
-    def _draw_scene(self) -> None:
         scene_map = self._scene.get_map()
-        agents_count = 0
-
-        agents = []
-
-        grid_cell_width, grid_cell_height = self._get_grid_dims()
-
-        circle_radius = min(grid_cell_width, grid_cell_height) // 2 - 3
-
-        for y, row in enumerate(scene_map):
-            for x, obj in enumerate(row):
-                if not obj:
-                    continue
-
-                obj_cell_center_coords = (
-                    x * grid_cell_width + grid_cell_width // 2,
-                    y * grid_cell_height + grid_cell_height // 2,
-                )
-
-                if isinstance(obj, Food):
-                    obj_circle = pygame.draw.circle(
-                        self._scene_surface,
-                        (82, 190, 79),
-                        obj_cell_center_coords,
-                        circle_radius,
-                    )
-                elif isinstance(obj, Agent):
-                    obj_circle = pygame.draw.circle(
-                        self._scene_surface,
-                        (255, 0, 0),
-                        obj_cell_center_coords,
-                        circle_radius,
-                    )
-                    agents_count += 1
-                    agents.append(obj)
-
-                font = self._get_game_object_font()
-                rendered_font = font.render(str(obj.get_level()), 0, (255, 255, 255))
-                self._scene_surface.blit(
-                    rendered_font,
-                    (
-                        obj_circle.topleft[0] + circle_radius // 2,
-                        obj_circle.topleft[1] - circle_radius // 2,
-                    ),
-                )
-
-    def _draw_gui(self) -> None:
+        rects = [self._draw_cell(x, y, scene_map[y][x]) for x, y in dirty_cells]
+
+        if len(dirty_cells) > visible_width * visible_height * _FULL_UPDATE_RATIO:
+            self._screen.blit(self._scene_surface, _SCENE_POSITION)
+
+            return [pygame.Rect(_SCENE_POSITION, _SCENE_SIZE)]
+
+        screen_rects = []
+
+        for rect in rects:
+            screen_rect = rect.move(_SCENE_POSITION)
+            self._screen.blit(self._scene_surface, screen_rect, rect)
+            screen_rects.append(screen_rect)
+
+        return screen_rects
+
+    def _draw_cell(self, x: int, y: int, obj) -> pygame.Rect:
+        """
+        Draw the cell on the scene surface
+
+        Args:
+            x (int): x coordinate of the cell
+            y (int): y coordinate of the cell
+            obj (GameObject | None): object in the cell
+
+        Returns:
+            pygame.Rect: area of the cell on the scene surface
+        """
+        cell_size = self._get_grid_dims()
+        rect = pygame.Rect((x * cell_size[0], y * cell_size[1]), cell_size)
+
+        self._scene_surface.blit(self._grid_surface, rect, rect)
+
+        if isinstance(obj, Food):
+            color = _FOOD_COLOR
+        elif isinstance(obj, Agent):
+            color = _AGENT_COLOR
+        else:
+            return rect
+
+        sprite = self._get_object_sprite(color, obj.get_level(), cell_size)
+        self._scene_surface.blit(sprite, rect)
+
+        return rect
+
+    def _draw_gui(self) -> list[pygame.Rect]:
+        """
+        Render GUI lines whose text changed since the last frame
+
+        Returns:
+            list[pygame.Rect]: areas of the screen to update
+        """
         font = self._get_gui_font()
+        rects = []
 
-        ticks_past_font = font.render(
-            f"Ticks past: {self._scene.get_ticks()}", 0, (255, 255, 255)
-        )
-        self._screen.blit(
-            ticks_past_font,
-            (
-                self._scene_surface.get_width() + 30 + 10,
-                30,
-            ),
-        )
+        for line, text in enumerate(self._get_gui_texts()):
+            if self._gui_texts.get(line) == text:
+                continue
 
-        agents_count = self._scene.get_agents_count()
-        agent_left_font = font.render(
-            f"Agents left: {agents_count}", 0, (255, 255, 255)
-        )
-        self._screen.blit(
-            agent_left_font,
-            (
-                self._scene_surface.get_width() + 30 + 10,
-                font.get_height() * 1 + 30,
-            ),
-        )
+            rendered = font.render(text, 0, _TEXT_COLOR)
+            rect = rendered.get_rect(
+                topleft=(_GUI_POSITION[0], _GUI_POSITION[1] + font.get_height() * line)
+            )
+            last_rect = self._gui_rects.get(line, rect)
 
-        agents_ate_count_font = font.render(
-            f"Agents ate count: {self._scene.get_agents_ate_count()}",
-            0,
-            (255, 255, 255),
-        )
-        self._screen.blit(
-            agents_ate_count_font,
-            (
-                self._scene_surface.get_width() + 30 + 10,
-                font.get_height() * 2 + 30,
-            ),
-        )
+            self._screen.fill(_BACKGROUND_COLOR, last_rect)
+            self._screen.blit(rendered, rect)
 
-        agents_spawned_from_count_font = font.render(
-            f"Agents spawned: {self._scene.get_spawned_from()}",
-            0,
-            (255, 255, 255),
-        )
-        self._screen.blit(
-            agents_spawned_from_count_font,
-            (
-                self._scene_surface.get_width() + 30 + 10,
-                font.get_height() * 3 + 30,
-            ),
-        )
+            self._gui_texts[line] = text
+            self._gui_rects[line] = rect
+            rects.append(rect.union(last_rect))
 
+        return rects
+
+    def _get_gui_texts(self) -> list[str]:
         max_agents_level = self._scene.get_max_agents_level()
         max_agents_level_str = (
             str(max_agents_level) if max_agents_level != 0 else "NO AGENTS"
         )
-        max_agents_level_font = font.render(
+
+        return [
+            f"Ticks past: {self._scene.get_ticks()}",
+            f"Agents left: {self._scene.get_agents_count()}",
+            f"Agents ate count: {self._scene.get_agents_ate_count()}",
+            f"Agents spawned: {self._scene.get_spawned_from()}",
             f"Max agent's level: {max_agents_level_str}",
-            0,
-            (255, 255, 255),
-        )
-        self._screen.blit(
-            max_agents_level_font,
-            (
-                self._scene_surface.get_width() + 30 + 10,
-                font.get_height() * 4 + 30,
-            ),
-        )
+            f"Speed: {self.ticks_per_frame} ticks/frame, {self.fps} FPS",
+        ]
@@ -1,29 +1,111 @@
-from itertools import product
-from random import choice
+import gc
+import json
+import struct
+import sys
+from array import array
+from contextlib import AbstractContextManager, nullcontext
+from dataclasses import asdict
+from random import Random
 
 from abstract_scene import AbstractScene
-from agent import Agent
-from food import Food
+from agent import _WALKING_VECTORS, Agent, AgentFactory
+from food import Food, FoodFactory
 from game_object import GameObject
-
-
-def _is_in_bound(value, max_value) -> bool:
-    return value >= 0 and value < max_value
+from occupancy_grid import AGENT, EMPTY, FOOD, OTHER, MapView
+from profiler import TickProfiler
+from scene_config import InvalidSceneConfigException, SceneConfig, TelemetryGroup
+from sleep_scheduler import SleepScheduler
+from spatial_index import SpatialIndex
+from square_rings import get_ring_coords, get_ring_coords_in_bounds
+
+_SNAPSHOT_MAGIC = b"AGSCENE\x00"
+_SNAPSHOT_VERSION = 1
+# magic, version and size of the JSON header with config, counters and RNG state
+_SNAPSHOT_PREFIX = struct.Struct("<8sHI")
+# columns of objects in the order of the scene's objects, stored little-endian
+_SNAPSHOT_COLUMNS = (
+    ("kind", "b"),
+    ("x", "i"),
+    ("y", "i"),
+    ("level", "i"),
+    # saturation of agents and capacity of food
+    ("amount", "d"),
+    ("experience", "q"),
+    ("walk", "b"),
+)
+# types of the header values
+_SNAPSHOT_HEADER = {
+    "config": dict,
+    "ticks": int,
+    "agents_ate_count": int,
+    "spawned_from_count": int,
+    "births_count": int,
+    "deaths_count": int,
+    "random_state": list,
+    "factories": list,
+    "objects": int,
+}
+_SNAPSHOT_AGENT = 0
+_SNAPSHOT_FOOD = 1
+# random walk vector codes besides indices of _WALKING_VECTORS
+_SNAPSHOT_NO_WALK = -1
+_SNAPSHOT_STUCK_WALK = len(_WALKING_VECTORS)
+
+_NO_PHASE = nullcontext()
+
+
+class InvalidSnapshotException(Exception): ...
+
+
+def _get_kind(game_object: GameObject) -> int:
+    if isinstance(game_object, Agent):
+        return AGENT
+
+    if isinstance(game_object, Food):
+        return FOOD
+
+    return OTHER
 
 
 class Scene(AbstractScene):
-    def __init__(self) -> None:
-        self._field_width = 20
-        self._field_height = 20
-        self._map = [
-            [None for _ in range(self._field_width)] for _ in range(self._field_height)
-        ]
+    def __init__(self, config: SceneConfig | None = None) -> None:
+        self._config = config or SceneConfig()
+        self._field_width = self._config.width
+        self._field_height = self._config.height
+        self._random = Random(self._config.seed)
+        # kinds of all cells, row-major, and objects of the occupied cells by
+        # their index in the grid
+        self._kinds = bytearray(self._field_width * self._field_height)
+        self._cells: dict[int, GameObject] = {}
+        self._map_view = MapView(self._cells, self._field_width, self._field_height)
         self._random_cell_picker = RandomCellPicker(self)
         self._factories = []
         self._agents_ate_count = 0
         self._spawned_from_count = 0
         self._ticks = 1
-        self._removed = []
+        self._objects: dict[GameObject, None] = {}
+        self._sleep_scheduler = SleepScheduler(self._field_width, self._field_height)
+        self._watchers = self._sleep_scheduler.get_watchers()
+        self._food_index = SpatialIndex()
+        self._agents_index = SpatialIndex()
+        self._agents_count = 0
+        self._agents_levels: dict[int, int] = {}
+        self._max_agents_level = 0
+
+        telemetry = self._config.telemetry
+        self._is_counting_saturation = TelemetryGroup.MEAN_SATURATION in telemetry
+        # saturation of agents as last reported by them, sleeping agents report
+        # their decay when they're caught up
+        self._saturation_sum = 0.0
+        self._is_counting_food_levels = TelemetryGroup.FOOD_LEVELS in telemetry
+        self._food_levels: dict[int, int] = {}
+        self._is_counting_births = TelemetryGroup.BIRTHS_AND_DEATHS in telemetry
+        self._births_count = 0
+        self._deaths_count = 0
+
+        self._profiler: TickProfiler | None = None
+        # cells changed since the last pop_dirty_cells, None while not tracked
+        self._dirty_cells: set[tuple[int, int]] | None = None
 
     def get_agents_ate_count(self) -> int:
         return self._agents_ate_count
@@ -34,8 +116,21 @@ class Scene(AbstractScene):
     def get_ticks(self) -> int:
         return self._ticks
 
-    def get_map(self) -> list[list[GameObject]]:
-        return self._map
+    def get_config(self) -> SceneConfig:
+        return self._config
+
+    def get_map(self) -> MapView:
+        return self._map_view
+
+    def get_cell_kinds(self) -> bytearray:
+        """
+        Get kinds of cells, see occupancy_grid. The grid is owned by the scene
+        and must not be changed.
+
+        Returns:
+            bytearray: kinds of cells in row-major order
+        """
+        return self._kinds
 
     def get_width(self) -> int:
         return self._field_width
@@ -56,112 +151,550 @@ class Scene(AbstractScene):
         if not game_object:
             return
 
-        if self._map[coords[1]][coords[0]]:
+        cell = coords[1] * self._field_width + coords[0]
+
+        if self._kinds[cell] != EMPTY:
             raise ValueError("Tried to put object on the scene to not empty cell")
 
-        self._map[coords[1]][coords[0]] = game_object
+        self._kinds[cell] = _get_kind(game_object)
+        self._cells[cell] = game_object
+        self._objects[game_object] = None
+        self._sleep_scheduler.add(game_object)
+        self._random_cell_picker.mark_taken(coords)
+
+        if self._dirty_cells is not None:
+            self._dirty_cells.add(coords)
+
+        index = self._get_spatial_index(game_object)
+        if index is not None:
+            index.add(coords)
+
+        if isinstance(game_object, Agent):
+            self._sleep_scheduler.wake_near_agent(coords)
+            self._agents_count += 1
+            self._register_agent_level(game_object.get_level())
+
+            if self._is_counting_saturation:
+                self._saturation_sum += game_object.get_saturation()
+
+            if self._is_counting_births:
+                self._births_count += 1
+        elif isinstance(game_object, Food):
+            self._sleep_scheduler.wake_near_food(coords)
+
+            if self._is_counting_food_levels:
+                level = game_object.get_level()
+                self._food_levels[level] = self._food_levels.get(level, 0) + 1
+
+    def add_game_objects(self, objects: list[GameObject]) -> None:
+        """
+        Same as add_game_object for every object, but counters of the scene are
+        updated once for all of them
+
+        Args:
+            objects (list[GameObject]): objects at their coordinates
+
+        Raises:
+            ValueError: a cell of an object is taken or shared by several
+                objects, nothing is added then
+        """
+        kinds = self._kinds
+        cells = self._cells
+        width = self._field_width
+        picker = self._random_cell_picker
+        scheduler = self._sleep_scheduler
+        objects_coords = [obj.get_coords() for obj in objects]
+        new_cells = [y * width + x for x, y in objects_coords]
+
+        if len(set(new_cells)) != len(new_cells) or any(
+            kinds[cell] != EMPTY for cell in new_cells
+        ):
+            raise ValueError("Tried to put object on the scene to not empty cell")
+
+        agents_levels: dict[int, int] = {}
+        food_levels: dict[int, int] = {}
+
+        for obj, coords, cell in zip(objects, objects_coords, new_cells, strict=True):
+            kinds[cell] = _get_kind(obj)
+            cells[cell] = obj
+            picker.mark_taken(coords)
+            scheduler.add(obj)
+
+            if self._dirty_cells is not None:
+                self._dirty_cells.add(coords)
+
+            if isinstance(obj, Agent):
+                self._agents_index.add(coords)
+                scheduler.wake_near_agent(coords)
+                level = obj.get_level()
+                agents_levels[level] = agents_levels.get(level, 0) + 1
+            elif isinstance(obj, Food):
+                self._food_index.add(coords)
+                scheduler.wake_near_food(coords)
+                level = obj.get_level()
+                food_levels[level] = food_levels.get(level, 0) + 1
+
+        self._objects.update(dict.fromkeys(objects))
+
+        if self._is_counting_saturation:
+            self._saturation_sum += sum(
+                obj.get_saturation() for obj in objects if isinstance(obj, Agent)
+            )
+
+        for level, amount in agents_levels.items():
+            self._agents_levels[level] = self._agents_levels.get(level, 0) + amount
+            self._max_agents_level = max(self._max_agents_level, level)
+            self._agents_count += amount
+
+            if self._is_counting_births:
+                self._births_count += amount
+
+        if self._is_counting_food_levels:
+            for level, amount in food_levels.items():
+                self._food_levels[level] = self._food_levels.get(level, 0) + amount
 
     def remove_game_object(self, game_object: GameObject) -> None:
+        if game_object not in self._objects:
+            return
+
         coords = game_object.get_coords()
+        cell = coords[1] * self._field_width + coords[0]
+
+        self._kinds[cell] = EMPTY
+        del self._cells[cell]
+        del self._objects[game_object]
+        self._sleep_scheduler.remove(game_object)
+        self._random_cell_picker.mark_free(coords)
+
+        if self._dirty_cells is not None:
+            self._dirty_cells.add(coords)
+
+        index = self._get_spatial_index(game_object)
+        if index is not None:
+            index.remove(coords)
 
-        self._map[coords[1]][coords[0]] = None
+        if isinstance(game_object, Agent):
+            self._agents_count -= 1
+            self._unregister_agent_level(game_object.get_level())
 
-        self._removed.append(game_object)
+            if self._is_counting_saturation:
+                self._saturation_sum -= game_object.get_saturation()
+
+            if self._is_counting_births:
+                self._deaths_count += 1
+        elif self._is_counting_food_levels and isinstance(game_object, Food):
+            level = game_object.get_level()
+            self._food_levels[level] -= 1
+
+            if self._food_levels[level] == 0:
+                del self._food_levels[level]
 
     def move_game_object(
         self, last_coords: tuple[int, int], new_coords: tuple[int, int]
     ) -> None:
-        obj = self._map[last_coords[1]][last_coords[0]]
-        self._map[last_coords[1]][last_coords[0]] = None
-        self._map[new_coords[1]][new_coords[0]] = obj
+        last_cell = last_coords[1] * self._field_width + last_coords[0]
+        new_cell = new_coords[1] * self._field_width + new_coords[0]
+
+        obj = self._cells.pop(last_cell)
+        self._cells[new_cell] = obj
+        self._kinds[new_cell] = self._kinds[last_cell]
+        self._kinds[last_cell] = EMPTY
+
+        index = self._get_spatial_index(obj)
+        if index is not None:
+            index.move(last_coords, new_coords)
+
+        if index is self._agents_index and self._watchers[new_cell]:
+            self._sleep_scheduler.wake_near_agent(new_coords)
+
+        if self._dirty_cells is not None:
+            self._dirty_cells.add(last_coords)
+            self._dirty_cells.add(new_coords)
 
     def is_cell_empty(self, coords: tuple[int, int]) -> bool:
-        if _is_in_bound(coords[0], self.get_width()) and _is_in_bound(
-            coords[1], self.get_height()
-        ):
-            return not bool(self._map[coords[1]][coords[0]])
+        x, y = coords
+
+        if 0 <= x < self._field_width and 0 <= y < self._field_height:
+            return self._kinds[y * self._field_width + x] == EMPTY
 
         return False
 
     def get_max_agents_level(self) -> int:
-        max_level = 0
+        return self._max_agents_level
 
-        for row in self._map:
-            for obj in row:
-                if isinstance(obj, Agent):
-                    level = obj.get_level()
+    def get_agents_count(self) -> int:
+        return self._agents_count
 
-                    if level > max_level:
-                        max_level = level
+    def update_agent_level(self, agent: GameObject, last_level: int) -> None:
+        if agent not in self._objects:
+            return
 
-        return max_level
+        self._unregister_agent_level(last_level)
+        self._register_agent_level(agent.get_level())
 
-    def get_agents_count(self) -> int:
-        agents_count = 0
+        if self._dirty_cells is not None:
+            self._dirty_cells.add(agent.get_coords())
+
+    def update_agent_saturation(
+        self, agent: GameObject, last_saturation: float
+    ) -> None:
+        if self._is_counting_saturation and agent in self._objects:
+            self._saturation_sum += agent.get_saturation() - last_saturation
+
+    def get_agents_levels(self) -> dict[int, int]:
+        return dict(self._agents_levels)
+
+    def get_food_levels(self) -> dict[int, int]:
+        return dict(self._food_levels)
+
+    def get_mean_saturation(self) -> float:
+        if not self._is_counting_saturation or not self._agents_count:
+            return 0.0
 
-        for row in self._map:
-            for obj in row:
-                if isinstance(obj, Agent):
-                    agents_count += 1
+        saturation = self._saturation_sum - self._sleep_scheduler.get_skipped_hunger()
 
-        return agents_count
+        return saturation / self._agents_count
+
+    def get_births_count(self) -> int:
+        return self._births_count
+
+    def get_deaths_count(self) -> int:
+        return self._deaths_count
+
+    def get_random(self) -> Random:
+        return self._random
 
     def get_random_empty_cell(self) -> tuple[int, int] | None:
         return self._random_cell_picker.get_random_cell()
 
-    def is_agent_near(self, coords: tuple[int, int]) -> bool:
-        objects = self._get_objects_in_square(coords)
-
-        for obj in objects:
-            if isinstance(obj, Agent):
-                return True
+    def get_random_empty_cells(self, amount: int) -> list[tuple[int, int]]:
+        return self._random_cell_picker.get_random_cells(amount)
 
-        return False
+    def is_agent_near(self, coords: tuple[int, int]) -> bool:
+        return self._agents_index.is_near(coords)
 
     def get_agent_in_coords(self, coords: tuple[int, int]) -> GameObject | None:
-        if _is_in_bound(coords[0], self.get_width()) and _is_in_bound(
-            coords[1], self.get_height()
-        ):
-            obj = self._map[coords[1]][coords[0]]
+        x, y = coords
+
+        if 0 <= x < self._field_width and 0 <= y < self._field_height:
+            cell = y * self._field_width + x
 
-            return obj if isinstance(obj, Agent) else None
+            if self._kinds[cell] == AGENT:
+                return self._cells[cell]
 
         return None
 
     def get_nearest_food_coords_by_radius(
         self, coords_from: tuple[int, int], radius: int
     ) -> tuple[int, int] | None:
-        for r in range(1, radius + 1):
-            objects = self._get_objects_in_square(coords_from, r)
-
-            for obj in objects:
-                if isinstance(obj, Food):
-                    return obj.get_coords()
-        return None
+        return self._food_index.get_nearest(coords_from, radius)
 
     def is_food_near_coords(self, coords: tuple[int, int]) -> bool:
-        food_coords = self.get_nearest_food_coords_by_radius(coords, 1)
-
-        return bool(food_coords)
+        return self._food_index.is_near(coords)
 
     def update(self) -> None:
         self._ticks += 1
+        self._births_count = 0
+        self._deaths_count = 0
+
+        # objects act in row-major order of their positions at the start of the
+        # tick, sleeping objects are skipped
+        to_update = self._sleep_scheduler.iter_updates(self._ticks)
+        profiler = self._profiler
+
+        with self._phase("objects"):
+            if profiler is None:
+                for obj in to_update:
+                    # skip objects which were eaten or died earlier in this tick
+                    if obj in self._objects:
+                        obj.update()
+
+                        if obj.can_sleep():
+                            self._sleep_scheduler.sleep(obj)
+            else:
+                # every object update is a phase named after its type, kept out
+                # of the loop above so unprofiled ticks don't pay for it
+                for obj in to_update:
+                    if obj in self._objects:
+                        with profiler.phase(type(obj).__name__):
+                            obj.update()
+
+                            if obj.can_sleep():
+                                self._sleep_scheduler.sleep(obj)
+
+        with self._phase("factories"):
+            for factory in self._factories:
+                with self._phase(type(factory).__name__):
+                    factory.update()
+
+    def catch_up(self, game_object: GameObject) -> None:
+        """
+        Bring the state of a sleeping object up to date, objects call it when
+        their decaying values are read
+
+        Args:
+            game_object (GameObject): sleeping object
+        """
+        self._sleep_scheduler.catch_up(game_object)
+
+    def get_sleeping_count(self) -> int:
+        """
+        Get amount of objects which are skipped by updates until something
+        comes close to them
+
+        Returns:
+            int: amount of sleeping objects
+        """
+        return self._sleep_scheduler.get_sleeping_count()
 
-        to_update = []
+    def set_profiler(self, profiler: TickProfiler | None) -> None:
+        self._profiler = profiler
 
-        for row in self._map:
-            for obj in row:
-                if obj:
-                    to_update.append(obj)
+    def track_dirty_cells(self) -> None:
+        if self._dirty_cells is None:
+            self._dirty_cells = set()
 
-        for obj in to_update:
-            if obj not in self._removed:
-                obj.update()
+    def pop_dirty_cells(self) -> set[tuple[int, int]]:
+        dirty_cells = self._dirty_cells or set()
+        self._dirty_cells = set()
+
+        return dirty_cells
+
+    def save_snapshot(self, file_path: str) -> None:
+        """
+        Save the full state of the scene, its objects and factories to a binary
+        file, so a run can be continued from it
+
+        Args:
+            file_path (str): path of the snapshot file
+
+        Raises:
+            ValueError: the scene has objects or factories of unknown types
+        """
+        columns = {name: array(typecode) for name, typecode in _SNAPSHOT_COLUMNS}
+
+        for obj in self._objects:
+            x, y = obj.get_coords()
+
+            if isinstance(obj, Agent):
+                kind = _SNAPSHOT_AGENT
+                amount = obj.get_saturation()
+                experience = obj.get_experience()
+                walk = _encode_walk(obj._random_walk_vector)
+            elif isinstance(obj, Food):
+                kind = _SNAPSHOT_FOOD
+                amount = obj.get_capacity()
+                experience = 0
+                walk = _SNAPSHOT_NO_WALK
+            else:
+                raise ValueError(f"Can't save {type(obj).__name__} to a snapshot")
+
+            columns["kind"].append(kind)
+            columns["x"].append(x)
+            columns["y"].append(y)
+            columns["level"].append(obj.get_level())
+            columns["amount"].append(amount)
+            columns["experience"].append(experience)
+            columns["walk"].append(walk)
+
+        header = json.dumps(
+            {
+                "config": asdict(self._config)
+                | {"telemetry": sorted(g.value for g in self._config.telemetry)},
+                "ticks": self._ticks,
+                "agents_ate_count": self._agents_ate_count,
+                "spawned_from_count": self._spawned_from_count,
+                "births_count": self._births_count,
+                "deaths_count": self._deaths_count,
+                "random_state": self._random.getstate(),
+                "factories": [_save_factory(factory) for factory in self._factories],
+                "objects": len(self._objects),
+            }
+        ).encode()
+
+        with open(file_path, "wb") as file:
+            file.write(
+                _SNAPSHOT_PREFIX.pack(_SNAPSHOT_MAGIC, _SNAPSHOT_VERSION, len(header))
+            )
+            file.write(header)
 
-        self._removed.clear()
+            for column in columns.values():
+                if sys.byteorder == "big":
+                    column.byteswap()
 
-        for factory in self._factories:
-            factory.update()
+                column.tofile(file)
+
+    @classmethod
+    def load_snapshot(cls, file_path: str, seed: int | None = None) -> "Scene":
+        """
+        Create a scene with its objects and factories from a snapshot
+
+        Args:
+            file_path (str): path of the snapshot file
+            seed (int | None, optional): new seed of the scene's random
+                generator to fork a different run from the snapshot, the saved
+                generator state is restored if None. Defaults to None.
+
+        Raises:
+            InvalidSnapshotException: the file isn't a snapshot, is truncated,
+                has an unsupported version or a header with missing or invalid
+                values
+
+        Returns:
+            Scene: restored scene
+        """
+        with open(file_path, "rb") as file:
+            data = file.read()
+
+        if len(data) < _SNAPSHOT_PREFIX.size:
+            raise InvalidSnapshotException(f"{file_path} is not a scene snapshot")
+
+        magic, version, header_size = _SNAPSHOT_PREFIX.unpack_from(data)
+
+        if magic != _SNAPSHOT_MAGIC:
+            raise InvalidSnapshotException(f"{file_path} is not a scene snapshot")
+
+        if version != _SNAPSHOT_VERSION:
+            raise InvalidSnapshotException(
+                f"Unsupported snapshot version {version}, expected {_SNAPSHOT_VERSION}"
+            )
+
+        offset = _SNAPSHOT_PREFIX.size
+
+        try:
+            header = json.loads(data[offset : offset + header_size])
+        except ValueError as error:
+            raise InvalidSnapshotException(
+                f"Snapshot {file_path} has a broken header"
+            ) from error
+
+        if not isinstance(header, dict) or any(
+            not isinstance(header.get(key), value_type)
+            for key, value_type in _SNAPSHOT_HEADER.items()
+        ):
+            raise InvalidSnapshotException(f"Snapshot {file_path} has a broken header")
+
+        offset += header_size
+
+        columns = []
+
+        for _, typecode in _SNAPSHOT_COLUMNS:
+            column = array(typecode)
+            end = offset + header["objects"] * column.itemsize
+            column.frombytes(data[offset:end])
+            offset = end
+
+            if len(column) != header["objects"]:
+                raise InvalidSnapshotException(f"Snapshot {file_path} is truncated")
+
+            if sys.byteorder == "big":
+                column.byteswap()
+
+            columns.append(column.tolist())
+
+        try:
+            config = header["config"]
+            config["telemetry"] = frozenset(
+                TelemetryGroup(value) for value in config["telemetry"]
+            )
+            scene = cls(SceneConfig(**config))
+            agent_factory = None
+
+            for kind, state in header["factories"]:
+                if kind == AgentFactory.__name__:
+                    agent_factory = AgentFactory(scene)
+                elif kind == FoodFactory.__name__:
+                    FoodFactory(scene).set_spawn_accumulator(state)
+                else:
+                    raise InvalidSnapshotException(
+                        f"Unknown factory {kind} in snapshot"
+                    )
+        except (KeyError, TypeError, ValueError, InvalidSceneConfigException) as error:
+            raise InvalidSnapshotException(
+                f"Snapshot {file_path} has a broken header"
+            ) from error
+
+        objects = []
+        # every object created here stays alive, so garbage collections triggered
+        # by the allocations would only rescan them over and over
+        is_gc_enabled = gc.isenabled()
+        gc.disable()
+
+        try:
+            for kind, x, y, level, amount, experience, walk in zip(
+                *columns, strict=True
+            ):
+                if kind == _SNAPSHOT_AGENT:
+                    obj = Agent.restore(
+                        (x, y),
+                        scene,
+                        agent_factory,
+                        level,
+                        amount,
+                        experience,
+                        _decode_walk(walk),
+                    )
+                else:
+                    obj = Food.restore((x, y), level, scene, amount)
+
+                objects.append(obj)
+
+            scene.add_game_objects(objects)
+        finally:
+            if is_gc_enabled:
+                gc.enable()
+
+        scene._ticks = header["ticks"]
+        scene._agents_ate_count = header["agents_ate_count"]
+        scene._spawned_from_count = header["spawned_from_count"]
+        scene._births_count = header["births_count"]
+        scene._deaths_count = header["deaths_count"]
+
+        if seed is None:
+            try:
+                version, state, gauss_next = header["random_state"]
+                scene._random.setstate((version, tuple(state), gauss_next))
+            except (TypeError, ValueError) as error:
+                raise InvalidSnapshotException(
+                    f"Snapshot {file_path} has a broken random state"
+                ) from error
+        else:
+            scene._random.seed(seed)
+
+        return scene
+
+    def _phase(self, name: str) -> AbstractContextManager:
+        if self._profiler is None:
+            return _NO_PHASE
+
+        return self._profiler.phase(name)
+
+    def _register_agent_level(self, level: int) -> None:
+        self._agents_levels[level] = self._agents_levels.get(level, 0) + 1
+
+        if level > self._max_agents_level:
+            self._max_agents_level = level
+
+    def _unregister_agent_level(self, level: int) -> None:
+        self._agents_levels[level] -= 1
+
+        if self._agents_levels[level] == 0:
+            del self._agents_levels[level]
+
+        while (
+            self._max_agents_level > 0
+            and self._max_agents_level not in self._agents_levels
+        ):
+            self._max_agents_level -= 1
+
+    def _get_spatial_index(self, game_object: GameObject) -> SpatialIndex | None:
+        if isinstance(game_object, Food):
+            return self._food_index
+
+        if isinstance(game_object, Agent):
+            return self._agents_index
+
+        return None
 
     def _get_objects_in_square(
         self, coords: tuple[int, int], radius: int = 1
@@ -188,59 +721,172 @@ class Scene(AbstractScene):
         return all objects marked like "x" in upper diagram
         """
 
-        square_coords = self.get_square_coords(coords, radius)
-        square_coords = list(
-            filter(
-                lambda c: _is_in_bound(c[0], self._field_width)
-                and _is_in_bound(c[1], self._field_height),
-                square_coords,
-            )
-        )
-
-        # print(square_coords)
-
-        objects = [self._map[c[1]][c[0]] for c in square_coords]
+        square_coords = self.get_square_coords_in_bounds(coords, radius)
+        objects = [
+            self._cells.get(c[1] * self._field_width + c[0]) for c in square_coords
+        ]
 
         return objects
 
     def get_square_coords(
         self, middle_coords: tuple[int, int], radius: int = 1
     ) -> list[tuple[int, int]]:
-        perms = product(range(-radius, radius + 1), repeat=2)
-        coords = [
-            (middle_coords[0] + perm[0], middle_coords[1] + perm[1]) for perm in perms
-        ]
+        return get_ring_coords(middle_coords, radius)
+
+    def get_square_coords_in_bounds(
+        self, middle_coords: tuple[int, int], radius: int = 1
+    ) -> list[tuple[int, int]]:
+        return get_ring_coords_in_bounds(
+            middle_coords, radius, self._field_width, self._field_height
+        )
+
+
+# while at least 1/_SPARSE_FREE_RATIO of the map is free, empty cells are found
+# by sampling random cells, which takes _SPARSE_FREE_RATIO attempts at most on average
+_SPARSE_FREE_RATIO = 8
+_REJECTION_ATTEMPTS = 4 * _SPARSE_FREE_RATIO
 
-        current_radius = radius - 1
-        while current_radius >= 0:
-            excluded_perms = product(
-                range(-current_radius, current_radius + 1), repeat=2
-            )
-            excluded_coords = [
-                (middle_coords[0] + perm[0], middle_coords[1] + perm[1])
-                for perm in excluded_perms
-            ]
 
-            # print(excluded_coords)
-            coords = [v for v in coords if v not in excluded_coords]
+def _save_factory(factory) -> tuple[str, float | None]:
+    if isinstance(factory, AgentFactory):
+        return AgentFactory.__name__, None
 
-            current_radius -= 1
+    if isinstance(factory, FoodFactory):
+        return FoodFactory.__name__, factory.get_spawn_accumulator()
 
-        return coords
+    raise ValueError(f"Can't save {type(factory).__name__} to a snapshot")
+
+
+def _encode_walk(vector: tuple[int, int] | None) -> int:
+    if vector is None:
+        return _SNAPSHOT_NO_WALK
+
+    if vector == (0, 0):
+        return _SNAPSHOT_STUCK_WALK
+
+    return _WALKING_VECTORS.index(vector)
+
+
+def _decode_walk(walk: int) -> tuple[int, int] | None:
+    if walk == _SNAPSHOT_NO_WALK:
+        return None
+
+    if walk == _SNAPSHOT_STUCK_WALK:
+        return (0, 0)
+
+    return _WALKING_VECTORS[walk]
 
 
 class RandomCellPicker:
+    """
+    Picks random empty cells of the scene.
+
+    The picker keeps count of free cells, which the scene updates on every add
+    and remove. While the map is sparse, random cells are sampled until an empty
+    one is hit. Once the map is nearly full, a random rank among the empty cells
+    is drawn and the cell is found by counting empty cells row by row.
+    """
+
     def __init__(self, scene: Scene) -> None:
         self._scene = scene
+        self._kinds = scene.get_cell_kinds()
+        self._random = scene.get_random()
+        self._area = scene.get_width() * scene.get_height()
+        self._free_count = self._area
+
+    def get_free_count(self) -> int:
+        return self._free_count
+
+    def mark_taken(self, coords: tuple[int, int]) -> None:
+        self._free_count -= 1
+
+    def mark_free(self, coords: tuple[int, int]) -> None:
+        self._free_count += 1
 
     def get_random_cell(self) -> tuple[int, int] | None:
-        scene_map = self._scene.get_map()
+        if self._free_count == 0:
+            return None
+
+        if self._is_sparse():
+            for _ in range(_REJECTION_ATTEMPTS):
+                coords = self._get_random_coords()
+
+                if self._is_free(coords):
+                    return coords
+
+        return self._get_empty_cell_by_rank(self._random.randrange(self._free_count))
+
+    def get_random_cells(self, amount: int) -> list[tuple[int, int]]:
+        """
+        Get distinct random empty cells
+
+        Args:
+            amount (int): amount of cells to pick
+
+        Returns:
+            list[tuple[int, int]]: coordinates of empty cells, fewer than amount
+            if the map hasn't got enough of them
+        """
+        amount = min(amount, self._free_count)
+
+        if amount <= 0:
+            return []
+
+        if amount == 1:
+            return [self.get_random_cell()]
+
+        if not self._is_sparse(taken=amount):
+            return self._random.sample(self._get_empty_cells(), amount)
+
+        picked: dict[tuple[int, int], None] = {}
+
+        while len(picked) < amount:
+            coords = self._get_random_coords()
+
+            if coords not in picked and self._is_free(coords):
+                picked[coords] = None
+
+        return list(picked)
+
+    def _is_sparse(self, taken: int = 0) -> bool:
+        return (self._free_count - taken) * _SPARSE_FREE_RATIO >= self._area
+
+    def _get_random_coords(self) -> tuple[int, int]:
+        return (
+            self._random.randrange(self._scene.get_width()),
+            self._random.randrange(self._scene.get_height()),
+        )
+
+    def _is_free(self, coords: tuple[int, int]) -> bool:
+        return self._kinds[coords[1] * self._scene.get_width() + coords[0]] == EMPTY
+
+    def _get_empty_cell_by_rank(self, rank: int) -> tuple[int, int]:
+        width = self._scene.get_width()
+
+        for row_start in range(0, self._area, width):
+            row_end = row_start + width
+            row_free_count = self._kinds.count(EMPTY, row_start, row_end)
+
+            if rank >= row_free_count:
+                rank -= row_free_count
+                continue
+
+            cell = self._kinds.index(EMPTY, row_start, row_end)
+
+            for _ in range(rank):
+                cell = self._kinds.index(EMPTY, cell + 1, row_end)
+
+            return cell % width, cell // width
+
+        raise ValueError("Rank is out of range of the empty cells")
 
+    def _get_empty_cells(self) -> list[tuple[int, int]]:
+        width = self._scene.get_width()
         empty_cells_coords: list[tuple[int, int]] = []
+        cell = self._kinds.find(EMPTY)
 
-        for y, row in enumerate(scene_map):
-            for x, game_object in enumerate(row):
-                if not game_object:
-                    empty_cells_coords.append((x, y))
+        while cell != -1:
+            empty_cells_coords.append((cell % width, cell // width))
+            cell = self._kinds.find(EMPTY, cell + 1)
 
-        return choice(empty_cells_coords) if empty_cells_coords else None
+        return empty_cells_coords
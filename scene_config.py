@@ -0,0 +1,60 @@
+from dataclasses import dataclass, field
+from enum import Enum
+
+
+class InvalidSceneConfigException(Exception): ...
+
+
+class TelemetryGroup(Enum):
+    """
+    Optional groups of stats dumped every tick
+    """
+
+    AGENTS_LEVELS = "agents_levels"
+    FOOD_LEVELS = "food_levels"
+    MEAN_SATURATION = "mean_saturation"
+    BIRTHS_AND_DEATHS = "births_and_deaths"
+    TICK_TIME = "tick_time"
+
+
+@dataclass(frozen=True)
+class SceneConfig:
+    """
+    Parameters of the simulated world
+
+    Attributes:
+        width (int): map width in cells
+        height (int): map height in cells
+        initial_agents (int): amount of agents spawned before the first tick
+        initial_food (int): amount of food spawned before the first tick
+        food_spawn_rate (float): amount of food spawned every tick, fractional
+            rates are accumulated between ticks
+        seed (int | None): seed of the random generator, random run if None
+        telemetry (frozenset[TelemetryGroup]): optional stats to collect, the
+            scene doesn't count stats of disabled groups
+    """
+
+    width: int = 20
+    height: int = 20
+    initial_agents: int = 10
+    initial_food: int = 16
+    food_spawn_rate: float = 1.0
+    seed: int | None = None
+    telemetry: frozenset[TelemetryGroup] = field(default_factory=frozenset)
+
+    def __post_init__(self) -> None:
+        if self.width <= 0 or self.height <= 0:
+            raise InvalidSceneConfigException(
+                f"Map dimensions should be positive, got {self.width}x{self.height}"
+            )
+
+        if self.initial_agents < 0 or self.initial_food < 0:
+            raise InvalidSceneConfigException("Initial population can't be negative")
+
+        if self.initial_agents + self.initial_food > self.width * self.height:
+            raise InvalidSceneConfigException(
+                "Initial population doesn't fit into the map"
+            )
+
+        if self.food_spawn_rate < 0:
+            raise InvalidSceneConfigException("Food spawn rate can't be negative")
@@ -0,0 +1,287 @@
+"""
+Scheduling of object updates of the Scene with sleeping objects.
+
+An object which would only decay on its next updates is put to sleep after its
+update: the scene stops updating it, and the decay of the skipped updates is
+applied at once when the object is read or woken. Sleeping objects are woken
+when an agent steps next to them, when food appears in the field of view of a
+sleeping agent and on the update which would kill them. A woken object whose
+cell is later in the update order than the object being updated still acts in
+the current tick, so a run is the same as if every object was updated every
+tick, while the cost of a tick follows the amount of awake objects.
+"""
+
+import heapq
+from collections.abc import Iterator
+
+from agent import Agent
+from game_object import GameObject
+from spatial_index import SpatialIndex
+from square_rings import get_ring_coords_in_bounds
+
+
+class SleepScheduler:
+    """
+    Awake and sleeping objects of a scene, in which the scene updates objects
+    and reports objects stepping or being put next to sleeping ones
+    """
+
+    def __init__(self, width: int, height: int) -> None:
+        self._width = width
+        self._height = height
+        self._awake: dict[GameObject, None] = {}
+        # last tick whose update was applied to a sleeping object and the tick
+        # of the update it must not skip
+        self._sleeping: dict[GameObject, tuple[int, int]] = {}
+        self._wake_ticks: dict[int, list[GameObject]] = {}
+        # sleeping objects by index of their cell, amount of sleeping objects
+        # next to every cell and positions of sleeping agents
+        self._cells: dict[int, GameObject] = {}
+        self._watchers = bytearray(width * height)
+        self._agents_index = SpatialIndex()
+        self._max_fov = 0
+        # waiting hunger of sleeping agents and its sum weighted by the last
+        # tick applied to every agent, the hunger they have skipped so far is
+        # tick * rate - offset
+        self._hunger_rate = 0.0
+        self._hunger_offset = 0.0
+
+        self._tick = 0
+        # cell index of the object being updated, None outside of object updates
+        self._turn: int | None = None
+        # objects woken in this tick before their turn, by cell index
+        self._woken: list[tuple[int, GameObject]] = []
+
+    def get_sleeping_count(self) -> int:
+        return len(self._sleeping)
+
+    def add(self, game_object: GameObject) -> None:
+        """
+        Start updating a new object from the next tick
+
+        Args:
+            game_object (GameObject): object added to the scene
+        """
+        self._awake[game_object] = None
+
+    def remove(self, game_object: GameObject) -> None:
+        """
+        Stop updating an object removed from the scene
+
+        Args:
+            game_object (GameObject): removed object
+        """
+        if game_object in self._sleeping:
+            self._forget(game_object)
+        else:
+            self._awake.pop(game_object, None)
+
+    def get_skipped_hunger(self) -> float:
+        """
+        Get saturation sleeping agents have lost on the updates they have
+        skipped so far, which isn't applied to them yet. Exact between ticks.
+
+        Returns:
+            float: total saturation lost by sleeping agents
+        """
+        return self._tick * self._hunger_rate - self._hunger_offset
+
+    def iter_updates(self, tick: int) -> Iterator[GameObject]:
+        """
+        Wake objects which can't skip this tick and iterate over awake objects
+        in row-major order of their positions at the start of the tick, with
+        objects woken during the tick merged in
+
+        Args:
+            tick (int): number of the tick
+
+        Yields:
+            GameObject: object to update, which may be removed by the time
+        """
+        self._tick = tick
+        width = self._width
+        to_update = []
+
+        for game_object in self._awake:
+            x, y = game_object.get_coords()
+            to_update.append((y * width + x, game_object))
+
+        # objects never share a cell, so only the cells are compared
+        to_update.sort()
+        self._turn = -1
+
+        for game_object in self._wake_ticks.pop(tick, ()):
+            record = self._sleeping.get(game_object)
+
+            if record is not None and record[1] == tick:
+                self._wake(game_object)
+
+        woken = self._woken
+
+        for cell, game_object in to_update:
+            while woken and woken[0][0] < cell:
+                self._turn, woken_object = heapq.heappop(woken)
+                yield woken_object
+
+            self._turn = cell
+            yield game_object
+
+        while woken:
+            self._turn, woken_object = heapq.heappop(woken)
+            yield woken_object
+
+        self._turn = None
+
+    def get_watchers(self) -> bytearray:
+        """
+        Get amounts of sleeping objects next to every cell, an agent stepping
+        to a watched cell wakes them. The grid is owned by the scheduler and
+        must not be changed.
+
+        Returns:
+            bytearray: amounts of sleeping objects in row-major order
+        """
+        return self._watchers
+
+    def sleep(self, game_object: GameObject) -> None:
+        """
+        Put the updated object, which can sleep, to sleep until the update it
+        can't skip
+
+        Args:
+            game_object (GameObject): updated object
+        """
+        if game_object not in self._awake:
+            return
+
+        turns = game_object.get_sleep_turns()
+
+        if turns == 0:
+            return
+
+        wake_tick = self._tick + turns + 1
+        x, y = game_object.get_coords()
+        cell = y * self._width + x
+
+        del self._awake[game_object]
+        self._sleeping[game_object] = (self._tick, wake_tick)
+        self._wake_ticks.setdefault(wake_tick, []).append(game_object)
+        self._cells[cell] = game_object
+        game_object.set_asleep(True)
+
+        for nx, ny in self._get_neighbours((x, y)):
+            self._watchers[ny * self._width + nx] += 1
+
+        if isinstance(game_object, Agent):
+            self._agents_index.add((x, y))
+            self._max_fov = max(self._max_fov, round(game_object.get_fov()))
+
+            waiting_hunger = game_object.get_waitng_hunger()
+            self._hunger_rate += waiting_hunger
+            self._hunger_offset += self._tick * waiting_hunger
+
+    def catch_up(self, game_object: GameObject) -> None:
+        """
+        Apply decay of the updates the sleeping object has skipped so far
+
+        Args:
+            game_object (GameObject): sleeping object
+        """
+        last_tick, wake_tick = self._sleeping[game_object]
+        turns = self._tick - last_tick
+
+        if turns > 0 and self._is_turn_ahead(game_object):
+            turns -= 1
+
+        # the record is moved first, so reading the object while it decays
+        # doesn't apply the turns again
+        self._sleeping[game_object] = (last_tick + turns, wake_tick)
+        game_object.decay(turns)
+
+        if turns and isinstance(game_object, Agent):
+            self._hunger_offset += turns * game_object.get_waitng_hunger()
+
+    def wake_near_agent(self, coords: tuple[int, int]) -> None:
+        """
+        Wake objects next to the cell an agent has stepped or been put to
+
+        Args:
+            coords (tuple[int, int]): coordinates of the agent
+        """
+        if not self._watchers[coords[1] * self._width + coords[0]]:
+            return
+
+        for x, y in self._get_neighbours(coords):
+            game_object = self._cells.get(y * self._width + x)
+
+            if game_object is not None:
+                self._wake(game_object)
+
+    def wake_near_food(self, coords: tuple[int, int]) -> None:
+        """
+        Wake agents which see the cell food has been put to
+
+        Args:
+            coords (tuple[int, int]): coordinates of the food
+        """
+        if not self._agents_index:
+            return
+
+        x, y = coords
+
+        for agent_x, agent_y in self._agents_index.get_in_square(coords, self._max_fov):
+            agent = self._cells[agent_y * self._width + agent_x]
+            distance = max(abs(agent_x - x), abs(agent_y - y))
+
+            if distance <= round(agent.get_fov()):
+                self._wake(agent)
+
+    def _wake(self, game_object: GameObject) -> None:
+        self.catch_up(game_object)
+
+        last_tick = self._sleeping[game_object][0]
+
+        self._forget(game_object)
+        self._awake[game_object] = None
+
+        if last_tick < self._tick and self._is_turn_ahead(game_object):
+            heapq.heappush(self._woken, (self._get_cell(game_object), game_object))
+
+    def _is_turn_ahead(self, game_object: GameObject) -> bool:
+        """
+        Check if the turn of an object, which hasn't been updated in the current
+        tick, is still ahead in the tick. An object which went to sleep in the
+        current tick has had its turn, even if it has stepped further in the
+        update order.
+        """
+        return self._turn is not None and self._get_cell(game_object) > self._turn
+
+    def _forget(self, game_object: GameObject) -> None:
+        last_tick = self._sleeping.pop(game_object)[0]
+        game_object.set_asleep(False)
+
+        coords = game_object.get_coords()
+        del self._cells[self._get_cell(game_object)]
+
+        for x, y in self._get_neighbours(coords):
+            self._watchers[y * self._width + x] -= 1
+
+        if isinstance(game_object, Agent):
+            self._agents_index.remove(coords)
+
+            if self._agents_index:
+                waiting_hunger = game_object.get_waitng_hunger()
+                self._hunger_rate -= waiting_hunger
+                self._hunger_offset -= last_tick * waiting_hunger
+            else:
+                # no rounding errors are left behind the last sleeping agent
+                self._hunger_rate = 0.0
+                self._hunger_offset = 0.0
+
+    def _get_neighbours(self, coords: tuple[int, int]) -> list[tuple[int, int]]:
+        return get_ring_coords_in_bounds(coords, 1, self._width, self._height)
+
+    def _get_cell(self, game_object: GameObject) -> int:
+        x, y = game_object.get_coords()
+
+        return y * self._width + x
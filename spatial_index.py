@@ -0,0 +1,177 @@
+from square_rings import get_ring_offsets
+
+_DEFAULT_BUCKET_SIZE = 8
+
+# oxo
+# x x
+# oxo
+_NEIGHBOUR_OFFSETS = get_ring_offsets(1)
+
+
+class SpatialIndex:
+    """
+    Uniform bucket grid over the occupied cells of one type of game objects.
+
+    Cells are grouped into square buckets, so a neighborhood query only visits
+    the buckets overlapping the queried square and costs close to the number of
+    objects around, not the area of the square.
+    """
+
+    def __init__(self, bucket_size: int = _DEFAULT_BUCKET_SIZE) -> None:
+        self._bucket_size = bucket_size
+        self._cells: set[tuple[int, int]] = set()
+        self._buckets: dict[tuple[int, int], set[tuple[int, int]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._cells)
+
+    def __contains__(self, coords: tuple[int, int]) -> bool:
+        return coords in self._cells
+
+    def add(self, coords: tuple[int, int]) -> None:
+        """
+        Mark the cell as occupied
+
+        Args:
+            coords (tuple[int, int]): coordinates of the cell
+        """
+        self._cells.add(coords)
+
+        bucket_key = self._get_bucket_key(coords)
+        bucket = self._buckets.get(bucket_key)
+
+        if bucket is None:
+            self._buckets[bucket_key] = {coords}
+        else:
+            bucket.add(coords)
+
+    def remove(self, coords: tuple[int, int]) -> None:
+        """
+        Mark the cell as free
+
+        Args:
+            coords (tuple[int, int]): coordinates of the cell
+        """
+        if coords not in self._cells:
+            return
+
+        self._cells.remove(coords)
+
+        bucket_key = self._get_bucket_key(coords)
+        bucket = self._buckets[bucket_key]
+        bucket.remove(coords)
+
+        if not bucket:
+            del self._buckets[bucket_key]
+
+    def move(self, last_coords: tuple[int, int], new_coords: tuple[int, int]) -> None:
+        """
+        Move the occupied cell to the new coordinates
+
+        Args:
+            last_coords (tuple[int, int]): last coordinates of the cell
+            new_coords (tuple[int, int]): new coordinates of the cell
+        """
+        self.remove(last_coords)
+        self.add(new_coords)
+
+    def is_near(self, coords: tuple[int, int]) -> bool:
+        """
+        Check if any of 8 cells around the coordinates is occupied
+
+        Args:
+            coords (tuple[int, int]): coordinates of the center
+
+        Returns:
+            bool: is there an occupied cell near the coordinates
+        """
+        cells = self._cells
+        x, y = coords
+
+        for dx, dy in _NEIGHBOUR_OFFSETS:
+            if (x + dx, y + dy) in cells:
+                return True
+
+        return False
+
+    def get_in_square(
+        self, coords: tuple[int, int], radius: int
+    ) -> list[tuple[int, int]]:
+        """
+        Get all occupied cells in the square of the given radius
+
+        Args:
+            coords (tuple[int, int]): coordinates of the square center
+            radius (int): square radius
+
+        Returns:
+            list[tuple[int, int]]: coordinates of the cells in no particular order
+        """
+        x, y = coords
+        size = self._bucket_size
+        cells = []
+
+        for bucket_x in range((x - radius) // size, (x + radius) // size + 1):
+            for bucket_y in range((y - radius) // size, (y + radius) // size + 1):
+                for cell in self._buckets.get((bucket_x, bucket_y), ()):
+                    if abs(cell[0] - x) <= radius and abs(cell[1] - y) <= radius:
+                        cells.append(cell)
+
+        return cells
+
+    def get_nearest(
+        self, coords: tuple[int, int], radius: int
+    ) -> tuple[int, int] | None:
+        """
+        Get the nearest occupied cell in the square of the given radius.
+
+        Distance is measured in square rings (the center itself is skipped).
+        Cells in the same ring are ordered by x offset and then by y offset, so
+        the result is the same as scanning the rings one by one.
+
+        Args:
+            coords (tuple[int, int]): coordinates of the square center
+            radius (int): square radius
+
+        Returns:
+            tuple[int, int] | None: coordinates of the nearest cell or nothing
+        """
+        if radius < 1 or not self._cells:
+            return None
+
+        x, y = coords
+        size = self._bucket_size
+
+        min_bucket_x = (x - radius) // size
+        max_bucket_x = (x + radius) // size
+        min_bucket_y = (y - radius) // size
+        max_bucket_y = (y + radius) // size
+
+        best_key = None
+        best_coords = None
+
+        for bucket_x in range(min_bucket_x, max_bucket_x + 1):
+            for bucket_y in range(min_bucket_y, max_bucket_y + 1):
+                bucket = self._buckets.get((bucket_x, bucket_y))
+
+                if not bucket:
+                    continue
+
+                for cell in bucket:
+                    dx = cell[0] - x
+                    dy = cell[1] - y
+                    distance = max(abs(dx), abs(dy))
+
+                    if distance == 0 or distance > radius:
+                        continue
+
+                    key = (distance, dx, dy)
+
+                    if best_key is None or key < best_key:
+                        best_key = key
+                        best_coords = cell
+
+        return best_coords
+
+    def _get_bucket_key(self, coords: tuple[int, int]) -> tuple[int, int]:
+        return coords[0] // self._bucket_size, coords[1] // self._bucket_size
@@ -0,0 +1,124 @@
+"""
+Spatial distributions of spawned objects.
+
+A distribution picks distinct empty cells of the scene in one pass, so
+factories may create all objects first and add them to the scene at once.
+Random choices are drawn from the scene's generator, so seeded runs stay
+reproducible.
+"""
+
+import heapq
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+
+from abstract_scene import AbstractScene
+
+# attempts to place an object around the clusters before giving up on it
+_CLUSTER_ATTEMPTS = 32
+
+
+class SpawnDistribution(ABC):
+    @abstractmethod
+    def sample(self, scene: AbstractScene, amount: int) -> list[tuple[int, int]]:
+        """
+        Pick distinct empty cells
+
+        Args:
+            scene (AbstractScene): scene to spawn on
+            amount (int): amount of cells
+
+        Returns:
+            list[tuple[int, int]]: coordinates of empty cells, fewer than amount
+            if the distribution hasn't got enough of them
+        """
+        ...
+
+
+class UniformDistribution(SpawnDistribution):
+    """
+    Every empty cell of the map is equally likely
+    """
+
+    def sample(self, scene: AbstractScene, amount: int) -> list[tuple[int, int]]:
+        return scene.get_random_empty_cells(amount)
+
+
+class ClusteredDistribution(SpawnDistribution):
+    """
+    Cells around random centers, offsets from a center are normally distributed.
+
+    A cell which is taken or off the map is drawn again. Drawing stops after a
+    few attempts per asked object, so crowded clusters get fewer objects than
+    asked instead of spreading them over the map.
+    """
+
+    def __init__(self, clusters: int, spread: float) -> None:
+        """
+        Args:
+            clusters (int): amount of cluster centers
+            spread (float): standard deviation of offsets from a center in cells
+        """
+        if clusters < 1:
+            raise ValueError("Distribution should have at least one cluster")
+
+        self._clusters = clusters
+        self._spread = spread
+
+    def sample(self, scene: AbstractScene, amount: int) -> list[tuple[int, int]]:
+        random = scene.get_random()
+        width = scene.get_width()
+        height = scene.get_height()
+
+        centers = [
+            (random.randrange(width), random.randrange(height))
+            for _ in range(self._clusters)
+        ]
+        picked: dict[tuple[int, int], None] = {}
+
+        for _ in range(amount * _CLUSTER_ATTEMPTS):
+            if len(picked) == amount:
+                break
+
+            center_x, center_y = random.choice(centers)
+            coords = (
+                round(random.gauss(center_x, self._spread)),
+                round(random.gauss(center_y, self._spread)),
+            )
+
+            if coords not in picked and scene.is_cell_empty(coords):
+                picked[coords] = None
+
+        return list(picked)
+
+
+class DensityMaskDistribution(SpawnDistribution):
+    """
+    Cells are picked with probabilities proportional to weights of the mask,
+    cells of zero weight are never picked
+    """
+
+    def __init__(self, mask: Sequence[Sequence[float]]) -> None:
+        """
+        Args:
+            mask (Sequence[Sequence[float]]): rows of non-negative weights of
+                cells, of the same size as the map
+        """
+        self._mask = mask
+
+    def sample(self, scene: AbstractScene, amount: int) -> list[tuple[int, int]]:
+        if len(self._mask) != scene.get_height() or any(
+            len(row) != scene.get_width() for row in self._mask
+        ):
+            raise ValueError("Density mask should be of the same size as the map")
+
+        random = scene.get_random()
+        keys = []
+
+        # weighted sampling without replacement: every candidate gets a random
+        # key u ** (1 / weight) and the cells with the largest keys are taken
+        for y, row in enumerate(self._mask):
+            for x, weight in enumerate(row):
+                if weight > 0 and scene.is_cell_empty((x, y)):
+                    keys.append((random.random() ** (1 / weight), x, y))
+
+        return [(x, y) for _, x, y in heapq.nlargest(amount, keys)]
@@ -0,0 +1,88 @@
+"""
+Offsets of square rings around a cell, computed once per radius.
+
+A ring of radius r is the border of the square of side 2r + 1 around the cell,
+the ring of radius 0 is the cell itself. Cells of a ring are ordered by x
+offset and then by y offset, the order in which scenes scan rings.
+"""
+
+from functools import cache
+
+
+@cache
+def get_ring_offsets(radius: int) -> tuple[tuple[int, int], ...]:
+    """
+    Get offsets of the square ring cells
+
+    Args:
+        radius (int): square radius
+
+    Returns:
+        tuple[tuple[int, int], ...]: x and y offsets
+    """
+    offsets = []
+
+    for dx in range(-radius, radius + 1):
+        if abs(dx) == radius:
+            offsets.extend((dx, dy) for dy in range(-radius, radius + 1))
+        else:
+            offsets.append((dx, -radius))
+            offsets.append((dx, radius))
+
+    return tuple(offsets)
+
+
+def get_ring_coords(coords: tuple[int, int], radius: int) -> list[tuple[int, int]]:
+    """
+    Get coordinates of the square ring cells, including cells out of the map
+
+    Args:
+        coords (tuple[int, int]): coordinates of the square center
+        radius (int): square radius
+
+    Returns:
+        list[tuple[int, int]]: coordinates of the ring cells
+    """
+    x, y = coords
+
+    return [(x + dx, y + dy) for dx, dy in get_ring_offsets(radius)]
+
+
+def get_ring_coords_in_bounds(
+    coords: tuple[int, int], radius: int, width: int, height: int
+) -> list[tuple[int, int]]:
+    """
+    Get coordinates of the square ring cells which are on the map
+
+    Args:
+        coords (tuple[int, int]): coordinates of the square center
+        radius (int): square radius
+        width (int): width of the map
+        height (int): height of the map
+
+    Returns:
+        list[tuple[int, int]]: coordinates of the ring cells
+    """
+    x, y = coords
+    offsets = _get_clipped_ring_offsets(
+        radius,
+        max(-x, -radius),
+        min(width - 1 - x, radius),
+        max(-y, -radius),
+        min(height - 1 - y, radius),
+    )
+
+    return [(x + dx, y + dy) for dx, dy in offsets]
+
+
+@cache
+def _get_clipped_ring_offsets(
+    radius: int, min_dx: int, max_dx: int, min_dy: int, max_dy: int
+) -> tuple[tuple[int, int], ...]:
+    # cells far from the edges share the key of the whole ring, so there are
+    # only a few clipped tables per radius
+    return tuple(
+        (dx, dy)
+        for dx, dy in get_ring_offsets(radius)
+        if min_dx <= dx <= max_dx and min_dy <= dy <= max_dy
+    )
@@ -0,0 +1,291 @@
+"""
+Runs headless games for every combination of scene config parameters.
+
+The grid is a JSON object mapping SceneConfig fields to lists of values, e.g.
+{"width": [20, 50], "initial_agents": [10, 40], "food_spawn_rate": [1, 2]}.
+Every combination is run --repeats times with its own seed, runs are spread
+over worker processes and the summary of every finished run is appended to the
+results file as a JSON line. Runs already in the results file are skipped, so
+an interrupted sweep continues where it stopped, as long as it's continued with
+the same ticks, stop condition and scene.
+
+Usage:
+    python sweep.py [--ticks N] [--until-extinct] [--repeats N] [--seed N]
+        [--workers N] [--numpy] grid results
+"""
+
+import argparse
+import itertools
+import json
+import os
+import zlib
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, fields
+
+from data_dumper import NullDataDumper
+from game import Game
+from null_client import NullGraphicalClient
+from numpy_scene import NumpyScene
+from scene import Scene
+from scene_config import SceneConfig
+
+# fields of the config which are set by the sweep itself
+_RESERVED_FIELDS = {"seed", "telemetry"}
+
+
+class InvalidGridException(Exception): ...
+
+
+class InvalidResultsException(Exception): ...
+
+
+@dataclass(frozen=True)
+class SweepRun:
+    """
+    Attributes:
+        run_id (str): id of the run, stable between sweeps of the same grid
+        params (dict): values of the swept config fields
+        seed (int): seed of the run
+    """
+
+    run_id: str
+    params: dict
+    seed: int
+
+    def get_config(self) -> SceneConfig:
+        return SceneConfig(**self.params, seed=self.seed)
+
+
+def expand_grid(
+    grid: dict[str, list], repeats: int = 1, seed: int = 0
+) -> list[SweepRun]:
+    """
+    Make runs of every combination of the grid values
+
+    Args:
+        grid (dict[str, list]): values of SceneConfig fields
+        repeats (int, optional): amount of runs of every combination.
+            Defaults to 1.
+        seed (int, optional): seed of the sweep, seeds of the runs are derived
+            from it and ids of the runs. Defaults to 0.
+
+    Raises:
+        InvalidGridException: the grid has an unknown or reserved field, or
+            a combination isn't a valid config
+
+    Returns:
+        list[SweepRun]: runs of the sweep
+    """
+    known_fields = {f.name for f in fields(SceneConfig)} - _RESERVED_FIELDS
+
+    for name, values in grid.items():
+        if name not in known_fields:
+            raise InvalidGridException(f"Unknown config field {name} in the grid")
+
+        if not isinstance(values, list) or not values:
+            raise InvalidGridException(f"Values of {name} should be a non-empty list")
+
+    names = sorted(grid)
+    runs = []
+
+    for values in itertools.product(*(grid[name] for name in names)):
+        params = dict(zip(names, values, strict=True))
+
+        for repeat in range(repeats):
+            run_id = ",".join(
+                [f"{name}={value}" for name, value in params.items()]
+                + [f"repeat={repeat}"]
+            )
+            run = SweepRun(run_id, params, zlib.crc32(f"{seed}:{run_id}".encode()))
+
+            try:
+                run.get_config()
+            except Exception as error:
+                raise InvalidGridException(f"Invalid run {run_id}: {error}") from error
+
+            runs.append(run)
+
+    return runs
+
+
+def run_sweep(
+    runs: list[SweepRun],
+    results_path: str,
+    max_ticks: int,
+    until_extinct: bool = False,
+    workers: int | None = None,
+    scene_class: type = Scene,
+) -> int:
+    """
+    Run the runs missing from the results file and append their summaries to it
+
+    Args:
+        runs (list[SweepRun]): runs of the sweep
+        results_path (str): path of the JSON lines results file
+        max_ticks (int): amount of ticks of every run
+        until_extinct (bool, optional): stop runs when there are no agents
+            left. Defaults to False.
+        workers (int | None, optional): amount of worker processes, runs in
+            this process if 1. Defaults to the amount of available cores.
+        scene_class (type, optional): scene to simulate. Defaults to Scene.
+
+    Raises:
+        InvalidResultsException: the results file has runs of a sweep with
+            other ticks, stop condition or scene
+
+    Returns:
+        int: amount of runs done
+    """
+    completed = _load_completed(
+        results_path, _get_settings(max_ticks, until_extinct, scene_class)
+    )
+    pending = [run for run in runs if run.run_id not in completed]
+    workers = min(workers or get_available_cores(), max(len(pending), 1))
+
+    with open(results_path, "a") as file:
+        for result in _run_all(pending, max_ticks, until_extinct, workers, scene_class):
+            # a line per run, so a sweep stopped at any point keeps finished runs
+            file.write(json.dumps(result) + "\n")
+            file.flush()
+
+    return len(pending)
+
+
+def get_available_cores() -> int:
+    """
+    Get amount of cores this process may run on
+
+    Returns:
+        int: amount of cores
+    """
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+
+    return os.cpu_count() or 1
+
+
+def _run_all(
+    runs: list[SweepRun],
+    max_ticks: int,
+    until_extinct: bool,
+    workers: int,
+    scene_class: type,
+) -> Iterator[dict]:
+    if workers == 1:
+        for run in runs:
+            yield _run_one(run, max_ticks, until_extinct, scene_class)
+
+        return
+
+    executor = ProcessPoolExecutor(max_workers=workers)
+
+    try:
+        futures = [
+            executor.submit(_run_one, run, max_ticks, until_extinct, scene_class)
+            for run in runs
+        ]
+
+        for future in as_completed(futures):
+            yield future.result()
+    finally:
+        # queued runs are dropped if the sweep stops on an error or an interrupt
+        executor.shutdown(cancel_futures=True)
+
+
+def _run_one(
+    run: SweepRun, max_ticks: int, until_extinct: bool, scene_class: type
+) -> dict:
+    game = Game(NullGraphicalClient(), NullDataDumper(), run.get_config(), scene_class)
+    summary = game.run(max_ticks=max_ticks, until_extinct=until_extinct)
+
+    result = {"run_id": run.run_id, "params": run.params, "seed": run.seed}
+    result.update(_get_settings(max_ticks, until_extinct, scene_class))
+    result.update(asdict(summary))
+
+    return result
+
+
+def _get_settings(max_ticks: int, until_extinct: bool, scene_class: type) -> dict:
+    # settings of the sweep shared by all its runs, which aren't in their ids
+    return {
+        "max_ticks": max_ticks,
+        "until_extinct": until_extinct,
+        "scene": scene_class.__name__,
+    }
+
+
+def _load_completed(results_path: str, settings: dict) -> set[str]:
+    """
+    Read ids of the runs in the results file. A line cut by an interrupted
+    write is removed from the file.
+
+    Args:
+        results_path (str): path of the JSON lines results file
+        settings (dict): settings of the sweep the runs should have
+
+    Raises:
+        InvalidResultsException: a run has other settings
+
+    Returns:
+        set[str]: ids of the finished runs
+    """
+    if not os.path.exists(results_path):
+        return set()
+
+    completed = set()
+    complete_size = 0
+
+    with open(results_path, "rb") as file:
+        for line in file:
+            if not line.endswith(b"\n"):
+                break
+
+            result = json.loads(line)
+
+            for name, value in settings.items():
+                if result.get(name) != value:
+                    raise InvalidResultsException(
+                        f"Run {result['run_id']} in {results_path} has {name} "
+                        f"{result.get(name)}, the sweep has {value}"
+                    )
+
+            completed.add(result["run_id"])
+            complete_size += len(line)
+
+    if complete_size != os.path.getsize(results_path):
+        os.truncate(results_path, complete_size)
+
+    return completed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("grid", help="path of the JSON grid")
+    parser.add_argument("results", help="path of the JSON lines results")
+    parser.add_argument("--ticks", type=int, default=1000)
+    parser.add_argument("--until-extinct", action="store_true")
+    parser.add_argument("--repeats", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--numpy", action="store_true")
+    args = parser.parse_args()
+
+    with open(args.grid) as file:
+        grid = json.load(file)
+
+    runs = expand_grid(grid, args.repeats, args.seed)
+    done = run_sweep(
+        runs,
+        args.results,
+        args.ticks,
+        args.until_extinct,
+        args.workers,
+        NumpyScene if args.numpy else Scene,
+    )
+
+    print(f"{done} runs done, {len(runs) - done} skipped as already finished")
+
+
+if __name__ == "__main__":
+    main()
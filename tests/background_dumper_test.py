@@ -0,0 +1,172 @@
+import threading
+import unittest
+
+from background_dumper import (
+    BackgroundDataDumper,
+    BackpressurePolicy,
+    DumperClosedException,
+)
+from data_dumper import DataDumper, DataDumpInfo
+
+
+class GatedDumper(DataDumper):
+    """Keeps dumped records, waits for the gate to open before every dump"""
+
+    def __init__(self) -> None:
+        self.rows: list[int] = []
+        self.records: list[DataDumpInfo] = []
+        self.flushes = 0
+        self.closed = False
+        self.gate = threading.Event()
+        self.gate.set()
+        self.started = threading.Semaphore(0)
+
+    def dump(self, data: DataDumpInfo) -> None:
+        self.started.release()
+        self.gate.wait()
+
+        if data.agents_left < 0:
+            raise OSError("Disk is full")
+
+        self.rows.append(data.agents_left)
+        self.records.append(data)
+
+    def flush(self) -> None:
+        self.flushes += 1
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def _info(agents_left, births=None, deaths=None):
+    return DataDumpInfo(agents_left, 0, 0, 1, births=births, deaths=deaths)
+
+
+class TestBackgroundDataDumper(unittest.TestCase):
+    def _fill(self, policy):
+        """Block the writer on the first record and fill the queue of 2 records"""
+        dumper = GatedDumper()
+        dumper.gate.clear()
+        background = BackgroundDataDumper(dumper, queue_size=2, policy=policy)
+
+        background.dump(_info(0))
+        dumper.started.acquire()
+
+        for tick in range(1, 3):
+            background.dump(_info(tick))
+
+        return dumper, background
+
+    def test_passes_all_records_in_order(self):
+        dumper = GatedDumper()
+
+        with BackgroundDataDumper(dumper, queue_size=3) as background:
+            for tick in range(100):
+                background.dump(_info(tick))
+
+        self.assertEqual(dumper.rows, list(range(100)))
+        self.assertTrue(dumper.closed)
+        self.assertLessEqual(background.get_max_queue_depth(), 3)
+        self.assertEqual(background.get_queue_depth(), 0)
+
+    def test_drop_policy(self):
+        dumper, background = self._fill(BackpressurePolicy.DROP)
+
+        background.dump(_info(3))
+        background.dump(_info(4))
+
+        self.assertEqual(background.get_queue_depth(), 2)
+        self.assertEqual(background.get_dropped_count(), 2)
+
+        dumper.gate.set()
+        background.close()
+
+        self.assertEqual(dumper.rows, [0, 1, 2])
+
+    def test_coalesce_policy(self):
+        dumper, background = self._fill(BackpressurePolicy.COALESCE)
+
+        background.dump(_info(3))
+        background.dump(_info(4))
+
+        self.assertEqual(background.get_coalesced_count(), 2)
+
+        dumper.gate.set()
+        background.close()
+
+        self.assertEqual(dumper.rows, [0, 1, 4])
+
+    def test_coalesced_records_add_up_per_tick_stats(self):
+        dumper = GatedDumper()
+        dumper.gate.clear()
+        background = BackgroundDataDumper(
+            dumper, queue_size=1, policy=BackpressurePolicy.COALESCE
+        )
+
+        background.dump(_info(10, births=0, deaths=0))
+        dumper.started.acquire()
+
+        # the queued record of the second tick takes in the next two
+        background.dump(_info(12, births=3, deaths=1))
+        background.dump(_info(11, births=1, deaths=2))
+        background.dump(_info(14, births=4, deaths=1))
+
+        dumper.gate.set()
+        background.close()
+
+        self.assertEqual(dumper.records[0], _info(10, births=0, deaths=0))
+        self.assertEqual(dumper.records[1], _info(14, births=8, deaths=4))
+        self.assertEqual(len(dumper.records), 2)
+
+    def test_block_policy(self):
+        dumper, background = self._fill(BackpressurePolicy.BLOCK)
+
+        blocked = threading.Thread(target=background.dump, args=(_info(3),))
+        blocked.start()
+        blocked.join(0.05)
+
+        self.assertTrue(blocked.is_alive())
+
+        dumper.gate.set()
+        blocked.join()
+        background.close()
+
+        self.assertEqual(dumper.rows, [0, 1, 2, 3])
+
+    def test_flush_waits_for_queue(self):
+        dumper = GatedDumper()
+        background = BackgroundDataDumper(dumper)
+
+        for tick in range(10):
+            background.dump(_info(tick))
+
+        background.flush()
+
+        self.assertEqual(len(dumper.rows), 10)
+        self.assertEqual(dumper.flushes, 1)
+        background.close()
+
+    def test_writer_error_is_raised(self):
+        dumper = GatedDumper()
+        background = BackgroundDataDumper(dumper)
+
+        background.dump(_info(-1))
+
+        with self.assertRaises(OSError):
+            background.close()
+
+        self.assertTrue(dumper.closed)
+
+        with self.assertRaises(OSError):
+            background.dump(_info(1))
+
+    def test_dump_after_close(self):
+        background = BackgroundDataDumper(GatedDumper())
+        background.close()
+
+        with self.assertRaises(DumperClosedException):
+            background.dump(_info(1))
+
+
+if __name__ == "__main__":
+    unittest.main()
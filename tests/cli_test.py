@@ -0,0 +1,90 @@
+import io
+import os
+import unittest
+from unittest.mock import patch
+
+from agent import Agent, AgentFactory
+from cli import CliAgentGame, CliView
+from food import Food, FoodFactory
+from scene import Scene
+from scene_config import SceneConfig
+
+_TERMINAL_SIZE = os.terminal_size((30, 16))
+
+
+@patch("shutil.get_terminal_size", return_value=_TERMINAL_SIZE)
+class TestCliAgentGame(unittest.TestCase):
+    def setUp(self):
+        self.scene = Scene(SceneConfig(seed=2))
+        AgentFactory(self.scene).spawn_initial()
+        FoodFactory(self.scene).spawn_initial()
+        self.stream = io.StringIO()
+
+    def _update(self, client: CliAgentGame) -> str:
+        self.stream.seek(0)
+        self.stream.truncate()
+        client.update()
+
+        return self.stream.getvalue()
+
+    def test_writes_only_changed_lines(self, _):
+        client = CliAgentGame(self.scene, stream=self.stream)
+
+        first = self._update(client)
+        unchanged = self._update(client)
+
+        self.assertTrue(first.startswith("\x1b[2J"))
+        self.assertEqual(first.count("\x1b[K"), 10 + 5)
+        self.assertEqual(unchanged.count("\x1b[K"), 0)
+
+        self.scene.update()
+
+        self.assertIn("Ticks past", self._update(client))
+
+    def test_viewport_fits_terminal(self, _):
+        client = CliAgentGame(self.scene, origin=(15, 100), stream=self.stream)
+        client.update()
+
+        scene_map = self.scene.get_map()
+
+        self.assertEqual(len(client._lines[0]), _TERMINAL_SIZE.columns)
+
+        # the origin is moved back so the viewport stays on the map
+        agent = next(
+            (x, y)
+            for y, row in enumerate(scene_map[10:], start=10)
+            for x, obj in enumerate(row[6:], start=6)
+            if isinstance(obj, Agent)
+        )
+        line = client._lines[agent[1] - 10]
+
+        self.assertEqual(line[1 + (agent[0] - 6) * 2], "A")
+
+    def test_downsampled_counts_follow_scene(self, _):
+        client = CliAgentGame(self.scene, CliView.DOWNSAMPLED, stream=self.stream)
+
+        for _ in range(30):
+            client.update()
+            self.scene.update()
+
+        client.update()
+
+        self.assertEqual(client._block_size, 2)
+        self.assertEqual(len(client._lines), 10 + 5)
+
+        agents = [0] * 100
+        food = [0] * 100
+
+        for y, row in enumerate(self.scene.get_map()):
+            for x, obj in enumerate(row):
+                if isinstance(obj, Agent):
+                    agents[y // 2 * 10 + x // 2] += 1
+                elif isinstance(obj, Food):
+                    food[y // 2 * 10 + x // 2] += 1
+
+        self.assertEqual(client._agents_counts, agents)
+        self.assertEqual(client._food_counts, food)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import csv
+import os
+import tempfile
+import unittest
+
+from csv_dumper import CSVDumper
+from data_dumper import DataDumpInfo
+
+
+def _read_rows(file_path):
+    with open(file_path, newline="") as csv_file:
+        return list(csv.reader(csv_file))
+
+
+class TestCSVDumper(unittest.TestCase):
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self._file_path = os.path.join(self._directory.name, "stat.csv")
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def test_creates_missing_file(self):
+        with CSVDumper(self._file_path) as dumper:
+            dumper.dump(DataDumpInfo(10, 1, 2, 3))
+
+        self.assertEqual(
+            _read_rows(self._file_path),
+            [
+                ["agents_left", "eaten_agents", "spawned_agents", "max_agents_level"],
+                ["10", "1", "2", "3"],
+            ],
+        )
+
+    def test_overwrites_existing_file(self):
+        with open(self._file_path, "w") as old_file:
+            old_file.write("old\ndata\nrows\n")
+
+        CSVDumper(self._file_path).close()
+
+        self.assertEqual(len(_read_rows(self._file_path)), 1)
+
+    def test_writes_full_buffers(self):
+        dumper = CSVDumper(self._file_path, flush_every=3, flush_interval=None)
+
+        for tick in range(7):
+            dumper.dump(DataDumpInfo(tick, 0, 0, 1))
+
+        self.assertEqual(len(_read_rows(self._file_path)), 7)
+
+        dumper.flush()
+        self.assertEqual(len(_read_rows(self._file_path)), 8)
+
+        dumper.dump(DataDumpInfo(7, 0, 0, 1))
+        dumper.close()
+
+        rows = _read_rows(self._file_path)
+        self.assertEqual([row[0] for row in rows[1:]], [str(t) for t in range(8)])
+
+    def test_flushes_after_interval(self):
+        dumper = CSVDumper(self._file_path, flush_every=100, flush_interval=0)
+
+        dumper.dump(DataDumpInfo(1, 0, 0, 1))
+
+        self.assertEqual(len(_read_rows(self._file_path)), 2)
+        dumper.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
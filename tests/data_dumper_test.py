@@ -0,0 +1,37 @@
+import unittest
+
+from data_dumper import BASE_COLUMNS, DataDumpInfo, make_histogram
+
+
+class TestDataDumpInfo(unittest.TestCase):
+    def test_base_row(self):
+        data = DataDumpInfo(10, 1, 2, 3)
+
+        self.assertEqual(data.get_columns(), list(BASE_COLUMNS))
+        self.assertEqual(data.to_row(), [10, 1, 2, 3])
+
+    def test_optional_stats_are_flattened(self):
+        data = DataDumpInfo(
+            10, 1, 2, 3, food_levels=(4, 3, 2, 1, 0), mean_saturation=5.5
+        )
+
+        self.assertEqual(
+            data.get_columns()[4:],
+            [
+                "food_levels_1",
+                "food_levels_2",
+                "food_levels_3",
+                "food_levels_4",
+                "food_levels_5",
+                "mean_saturation",
+            ],
+        )
+        self.assertEqual(data.to_row(), [10, 1, 2, 3, 4, 3, 2, 1, 0, 5.5])
+        self.assertEqual(len(DataDumpInfo.get_all_columns()), 23)
+
+    def test_histogram_counts_high_levels_in_last_bucket(self):
+        self.assertEqual(make_histogram({1: 2, 3: 1, 4: 5, 9: 1}, 3), (2, 0, 7))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,151 @@
+import os
+import tempfile
+import unittest
+from itertools import pairwise
+
+from data_dumper import DataDumper, DataDumpInfo
+from game import Game
+from null_client import NullGraphicalClient
+from scene_config import SceneConfig, TelemetryGroup
+
+
+class ListDumper(DataDumper):
+    def __init__(self) -> None:
+        self.rows: list[DataDumpInfo] = []
+        self.closed = False
+
+    def dump(self, data: DataDumpInfo) -> None:
+        self.rows.append(data)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class FrameRecordingClient(NullGraphicalClient):
+    """Records ticks of the scene at every rendered frame"""
+
+    def __init__(self, ticks_per_frame: int) -> None:
+        super().__init__()
+        self.ticks_per_frame = ticks_per_frame
+        self.frames: list[int] = []
+
+    def update(self) -> None:
+        self.frames.append(self._scene.get_ticks())
+
+
+class TestHeadlessGame(unittest.TestCase):
+    def test_runs_given_amount_of_ticks(self):
+        dumper = ListDumper()
+        game = Game(NullGraphicalClient(), dumper, SceneConfig(seed=3))
+
+        summary = game.run(max_ticks=50)
+
+        self.assertEqual(summary.ticks, 50)
+        self.assertEqual(len(dumper.rows), 50)
+        self.assertTrue(dumper.closed)
+
+    def test_stops_when_extinct(self):
+        dumper = ListDumper()
+        game = Game(NullGraphicalClient(), dumper, SceneConfig(initial_agents=0))
+
+        summary = game.run(max_ticks=50, until_extinct=True)
+
+        self.assertEqual(summary.ticks, 0)
+        self.assertEqual(summary.agents_left, 0)
+        self.assertTrue(dumper.closed)
+
+    def test_same_seed_same_run(self):
+        config = SceneConfig(seed=7)
+
+        first = Game(NullGraphicalClient(), ListDumper(), config).run(max_ticks=200)
+        second = Game(NullGraphicalClient(), ListDumper(), config).run(max_ticks=200)
+
+        self.assertEqual(
+            (first.agents_left, first.eaten_agents, first.spawned_agents),
+            (second.agents_left, second.eaten_agents, second.spawned_agents),
+        )
+
+    def test_runs_ticks_per_frame(self):
+        config = SceneConfig(seed=7)
+        client = FrameRecordingClient(ticks_per_frame=8)
+        dumper = ListDumper()
+
+        summary = Game(client, dumper, config).run(max_ticks=50)
+        plain = Game(NullGraphicalClient(), ListDumper(), config).run(max_ticks=50)
+
+        self.assertEqual(len(client.frames), 7)
+        self.assertEqual({b - a for a, b in pairwise(client.frames)}, {8})
+        self.assertEqual(summary.ticks, 50)
+        self.assertEqual(len(dumper.rows), 50)
+        self.assertEqual(
+            (summary.agents_left, summary.eaten_agents, summary.spawned_agents),
+            (plain.agents_left, plain.eaten_agents, plain.spawned_agents),
+        )
+
+    def test_dumps_enabled_telemetry(self):
+        telemetry = frozenset(
+            {TelemetryGroup.AGENTS_LEVELS, TelemetryGroup.BIRTHS_AND_DEATHS}
+        )
+        dumper = ListDumper()
+
+        Game(
+            NullGraphicalClient(), dumper, SceneConfig(seed=3, telemetry=telemetry)
+        ).run(max_ticks=30)
+
+        first = dumper.rows[0]
+
+        self.assertEqual(first.agents_levels, (10,) + (0,) * 9)
+        self.assertEqual(first.births, 10)
+        self.assertIsNone(first.food_levels)
+        self.assertIsNone(first.tick_time)
+
+        for row in dumper.rows:
+            self.assertEqual(sum(row.agents_levels), row.agents_left)
+
+        for last, row in pairwise(dumper.rows):
+            self.assertEqual(
+                row.agents_left - last.agents_left, row.births - row.deaths
+            )
+
+    def test_snapshot_with_config(self):
+        with self.assertRaises(ValueError):
+            Game(
+                NullGraphicalClient(),
+                ListDumper(),
+                SceneConfig(seed=8),
+                snapshot="scene.snapshot",
+            )
+
+    def test_continues_from_snapshot(self):
+        config = SceneConfig(seed=8)
+        whole = Game(NullGraphicalClient(), ListDumper(), config)
+        whole_summary = whole.run(max_ticks=120)
+
+        first = Game(NullGraphicalClient(), ListDumper(), config)
+        first.run(max_ticks=60)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "scene.snapshot")
+            first.get_scene().save_snapshot(path)
+
+            second = Game(NullGraphicalClient(), ListDumper(), snapshot=path)
+            second_summary = second.run(max_ticks=60)
+
+        self.assertEqual(second.get_scene().get_ticks(), whole.get_scene().get_ticks())
+        self.assertEqual(second.get_scene().get_config(), config)
+        self.assertEqual(
+            (
+                whole_summary.agents_left,
+                whole_summary.eaten_agents,
+                whole_summary.spawned_agents,
+            ),
+            (
+                second_summary.agents_left,
+                second_summary.eaten_agents,
+                second_summary.spawned_agents,
+            ),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from data_dumper import DataDumpInfo
+from npy_dumper import InvalidStatsException, NPYDumper, read_npy_stats
+
+
+class TestNPYDumper(unittest.TestCase):
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self._stats_directory = os.path.join(self._directory.name, "stats")
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def test_columns_are_read_back(self):
+        with NPYDumper(self._stats_directory, flush_every=4) as dumper:
+            for tick in range(10):
+                dumper.dump(DataDumpInfo(tick, tick * 2, 0, 1))
+
+        columns = read_npy_stats(self._stats_directory)
+
+        self.assertEqual(
+            list(columns),
+            ["agents_left", "eaten_agents", "spawned_agents", "max_agents_level"],
+        )
+        self.assertTrue(np.array_equal(columns["agents_left"], np.arange(10)))
+        self.assertTrue(np.array_equal(columns["eaten_agents"], np.arange(10) * 2))
+        self.assertIsInstance(columns["max_agents_level"], np.memmap)
+
+    def test_flushed_rows_are_readable_while_running(self):
+        dumper = NPYDumper(self._stats_directory, flush_every=100)
+
+        self.assertEqual(len(read_npy_stats(self._stats_directory)["agents_left"]), 0)
+
+        for tick in range(3):
+            dumper.dump(DataDumpInfo(tick, 0, 0, 1))
+
+        dumper.flush()
+        dumper.dump(DataDumpInfo(3, 0, 0, 1))
+
+        self.assertEqual(len(read_npy_stats(self._stats_directory)["agents_left"]), 3)
+
+        dumper.close()
+
+        self.assertEqual(len(read_npy_stats(self._stats_directory)["agents_left"]), 4)
+
+    def test_dtypes_follow_stats_types(self):
+        with NPYDumper(self._stats_directory, flush_every=2) as dumper:
+            for saturation in [2, 4, 2.5]:
+                dumper.dump(
+                    DataDumpInfo(np.int64(1), 0, 0, True, mean_saturation=saturation)
+                )
+
+        columns = read_npy_stats(self._stats_directory)
+
+        self.assertEqual(columns["agents_left"].dtype, np.int64)
+        self.assertEqual(columns["max_agents_level"].dtype, np.int64)
+        self.assertEqual(columns["mean_saturation"].dtype, np.float64)
+        self.assertEqual(list(columns["mean_saturation"]), [2.0, 4.0, 2.5])
+
+    def test_columns_of_earlier_run_are_removed(self):
+        with NPYDumper(self._stats_directory) as dumper:
+            for tick in range(5):
+                dumper.dump(DataDumpInfo(tick, 0, 0, 1, mean_saturation=1.5))
+
+        with NPYDumper(self._stats_directory) as dumper:
+            for tick in range(2):
+                dumper.dump(DataDumpInfo(tick, 0, 0, 1))
+
+        columns = read_npy_stats(self._stats_directory)
+
+        self.assertNotIn("mean_saturation", columns)
+        self.assertEqual(len(columns["agents_left"]), 2)
+
+    def test_missing_stats(self):
+        with self.assertRaises(InvalidStatsException):
+            read_npy_stats(self._directory.name)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,286 @@
+import unittest
+
+import numpy as np
+
+from agent import Agent, AgentFactory
+from food import Food, FoodFactory
+from numpy_scene import AGENT, EMPTY, FOOD, NumpyScene
+from scene import Scene
+from scene_config import SceneConfig
+
+_CONFIG = SceneConfig(width=12, height=10, initial_agents=0, initial_food=0)
+
+
+def _snapshot(scene):
+    objects = []
+
+    for row in scene.get_map():
+        for obj in row:
+            if isinstance(obj, Agent):
+                objects.append(
+                    (
+                        obj.get_coords(),
+                        "agent",
+                        obj.get_level(),
+                        round(obj.get_saturation(), 9),
+                        obj.get_experience(),
+                    )
+                )
+            elif isinstance(obj, Food):
+                objects.append(
+                    (obj.get_coords(), "food", obj.get_level(), obj.get_capacity())
+                )
+
+    return (
+        objects,
+        scene.get_agents_count(),
+        scene.get_agents_ate_count(),
+        scene.get_spawned_from(),
+        scene.get_max_agents_level(),
+    )
+
+
+def _make_scene(scene_class, agents, food):
+    scene = scene_class(_CONFIG)
+    agent_factory = AgentFactory(scene)
+
+    for coords, level, saturation, experience in agents:
+        agent = Agent(coords, scene, agent_factory, level=level)
+        agent._saturation = saturation
+        agent._experience = experience
+        agent_factory.spawn(coords, agent)
+
+    for coords, level in food:
+        scene.add_game_object(Food(coords, level, scene), coords)
+
+    return scene
+
+
+class TestNumpySceneMatchesScene(unittest.TestCase):
+    """
+    Scenarios without random choices play out the same on both scenes.
+    Food is placed after agents in row-major order, as NumpyScene updates agents
+    before food.
+    """
+
+    def assert_same_run(self, ticks, agents=(), food=()):
+        reference = _make_scene(Scene, agents, food)
+        scene = _make_scene(NumpyScene, agents, food)
+
+        for tick in range(ticks):
+            with self.subTest(tick=tick):
+                self.assertEqual(_snapshot(scene), _snapshot(reference))
+
+            reference.update()
+            scene.update()
+
+    def test_food_decays_and_disappears(self):
+        self.assert_same_run(60, food=[((3, 3), 1), ((8, 2), 4)])
+
+    def test_food_near_agent_is_eaten(self):
+        # agent in the corner is walled in by food and can't move
+        self.assert_same_run(
+            15,
+            agents=[((11, 9), 2, 1.0, 0)],
+            food=[((10, 9), 5), ((11, 8), 4), ((10, 8), 5)],
+        )
+
+    def test_agent_walks_to_food(self):
+        self.assert_same_run(6, agents=[((1, 1), 1, 5.0, 0)], food=[((4, 4), 5)])
+
+    def test_exhausted_agent_starves(self):
+        self.assert_same_run(40, agents=[((5, 5), 1, 0.2, 0)])
+
+    def test_hunting(self):
+        self.assert_same_run(
+            2,
+            agents=[((4, 4), 3, 10.0, 7), ((4, 5), 2, 4.0, 11), ((0, 0), 1, 0.5, 0)],
+        )
+
+    def test_level_up(self):
+        self.assert_same_run(
+            3,
+            agents=[((0, 0), 1, 1.0, 9)],
+            food=[((1, 0), 2), ((0, 1), 2), ((1, 1), 2)],
+        )
+
+    def test_spawn_into_the_only_free_cell(self):
+        food = [((x, y), 5) for x in range(3) for y in range(3) if (x, y) != (1, 1)]
+        food.remove(((2, 2), 5))
+
+        self.assert_same_run(2, agents=[((1, 1), 1, 9.5, 3)], food=food)
+
+
+class TestNumpySceneStatistics(unittest.TestCase):
+    """
+    Agents of NumpyScene act in batches, so runs with random choices diverge
+    from Scene, but the statistics of a few seeds stay within the tolerance.
+    """
+
+    _TOLERANCE = 0.15
+
+    def _collect(self, scene_class):
+        eaten = spawned = agents = 0
+
+        for seed in range(3):
+            scene = scene_class(
+                SceneConfig(
+                    width=30,
+                    height=30,
+                    initial_agents=90,
+                    initial_food=60,
+                    food_spawn_rate=2,
+                    seed=seed,
+                )
+            )
+            AgentFactory(scene).spawn_initial()
+            FoodFactory(scene).spawn_initial()
+
+            for _ in range(100):
+                scene.update()
+                agents += scene.get_agents_count()
+
+            eaten += scene.get_agents_ate_count()
+            spawned += scene.get_spawned_from()
+
+        return {"eaten": eaten, "spawned": spawned, "mean agents": agents / 300}
+
+    def test_statistics_match_scene(self):
+        reference = self._collect(Scene)
+        statistics = self._collect(NumpyScene)
+
+        for name, value in reference.items():
+            with self.subTest(name=name):
+                self.assertAlmostEqual(
+                    statistics[name], value, delta=value * self._TOLERANCE
+                )
+
+
+class TestNumpyScene(unittest.TestCase):
+    def _run(self, seed, ticks):
+        config = SceneConfig(width=40, height=40, seed=seed, food_spawn_rate=4)
+        scene = NumpyScene(config)
+        AgentFactory(scene).spawn_initial()
+        FoodFactory(scene).spawn_initial()
+
+        for _ in range(ticks):
+            scene.update()
+
+            self.assertEqual(
+                scene.get_agents_count(), np.count_nonzero(scene._kind == AGENT)
+            )
+            self.assertEqual(scene._free_count, np.count_nonzero(scene._kind == EMPTY))
+
+        return scene
+
+    def test_counters_follow_grids(self):
+        self._run(seed=1, ticks=150)
+
+    def test_same_seed_same_run(self):
+        first = self._run(seed=5, ticks=100)
+        second = self._run(seed=5, ticks=100)
+
+        self.assertTrue(np.array_equal(first._kind, second._kind))
+        self.assertTrue(np.array_equal(first._amount, second._amount))
+
+    def test_telemetry_follows_grids(self):
+        scene = NumpyScene(SceneConfig(width=40, height=40, seed=2, food_spawn_rate=4))
+        AgentFactory(scene).spawn_initial()
+        FoodFactory(scene).spawn_initial()
+
+        self.assertEqual(scene.get_births_count(), 10)
+
+        for _ in range(100):
+            agents_count = scene.get_agents_count()
+            scene.update()
+
+            self.assertEqual(
+                scene.get_agents_count() - agents_count,
+                scene.get_births_count() - scene.get_deaths_count(),
+            )
+            self.assertEqual(
+                sum(scene.get_agents_levels().values()), scene.get_agents_count()
+            )
+            self.assertEqual(
+                sum(scene.get_food_levels().values()),
+                np.count_nonzero(scene._kind == FOOD),
+            )
+
+    def test_dirty_cells_cover_changes(self):
+        scene = NumpyScene(SceneConfig(width=40, height=40, seed=3, food_spawn_rate=4))
+        AgentFactory(scene).spawn_initial()
+        FoodFactory(scene).spawn_initial()
+
+        self.assertEqual(scene.pop_dirty_cells(), set())
+
+        kind = scene._kind.copy()
+        level = scene._level.copy()
+
+        for _ in range(60):
+            scene.update()
+            changed = np.flatnonzero((kind != scene._kind) | (level != scene._level))
+            width = scene.get_width()
+
+            self.assertEqual(
+                scene.pop_dirty_cells(),
+                {(int(i % width), int(i // width)) for i in changed},
+            )
+
+            kind = scene._kind.copy()
+            level = scene._level.copy()
+
+    def test_queries(self):
+        scene = _make_scene(
+            NumpyScene, agents=[((5, 5), 1, 5.0, 0)], food=[((7, 6), 1), ((5, 8), 2)]
+        )
+
+        self.assertEqual(scene.get_nearest_food_coords_by_radius((5, 5), 4), (7, 6))
+        self.assertIsNone(scene.get_nearest_food_coords_by_radius((5, 5), 1))
+        self.assertTrue(scene.is_food_near_coords((6, 7)))
+        self.assertTrue(scene.is_agent_near((4, 4)))
+        self.assertIsNone(scene.get_agent_in_coords((7, 6)))
+        self.assertEqual(scene.get_agent_in_coords((5, 5)).get_saturation(), 5.0)
+
+    def test_nearest_food_follows_food_changes(self):
+        scene = _make_scene(NumpyScene, agents=[], food=[((7, 6), 1)])
+
+        self.assertEqual(scene.get_nearest_food_coords_by_radius((5, 5), 4), (7, 6))
+
+        scene.add_game_object(Food((5, 6), 1, scene), (5, 6))
+        self.assertEqual(scene.get_nearest_food_coords_by_radius((5, 5), 4), (5, 6))
+
+        scene.remove_game_object(scene.get_map()[6][5])
+        scene.remove_game_object(scene.get_map()[6][7])
+        self.assertIsNone(scene.get_nearest_food_coords_by_radius((5, 5), 4))
+
+    def test_stale_copy_is_not_removed(self):
+        scene = _make_scene(NumpyScene, agents=[((5, 5), 2, 5.0, 0)], food=[])
+        agent = scene.get_map()[5][5]
+
+        scene.remove_game_object(agent)
+        scene.add_game_object(Food((5, 5), 3, scene), (5, 5))
+        scene.remove_game_object(agent)
+
+        self.assertEqual(scene.get_map()[5][5].get_level(), 3)
+
+        scene.remove_game_object(Food((5, 5), 2, scene))
+
+        self.assertEqual(scene.get_map()[5][5].get_level(), 3)
+        self.assertEqual(scene._free_count, np.count_nonzero(scene._kind == EMPTY))
+
+    def test_map_view(self):
+        scene = _make_scene(NumpyScene, agents=[((5, 5), 2, 5.0, 0)], food=[])
+        scene_map = scene.get_map()
+
+        self.assertEqual((len(scene_map), len(scene_map[0])), (10, 12))
+        self.assertEqual(scene_map[5][5].get_level(), 2)
+        self.assertIsNone(scene_map[5][4])
+
+        scene.move_game_object((5, 5), (5, 6))
+
+        self.assertIsNone(scene_map[5][5])
+        self.assertEqual(scene_map[6][5].get_coords(), (5, 6))
+
+
+if __name__ == "__main__":
+    unittest.main()
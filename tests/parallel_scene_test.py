@@ -0,0 +1,67 @@
+import unittest
+
+import numpy as np
+
+from agent import AgentFactory
+from food import FoodFactory
+from numpy_scene import AGENT, EMPTY
+from parallel_scene import ParallelNumpyScene
+from scene_config import SceneConfig
+
+_CONFIG = SceneConfig(
+    width=50, height=40, initial_agents=60, initial_food=80, food_spawn_rate=5, seed=3
+)
+
+
+class TestParallelNumpyScene(unittest.TestCase):
+    def _run(self, workers, ticks):
+        with ParallelNumpyScene(_CONFIG, workers=workers, tile_size=12) as scene:
+            AgentFactory(scene).spawn_initial()
+            FoodFactory(scene).spawn_initial()
+
+            for _ in range(ticks):
+                scene.update()
+
+                self.assertEqual(
+                    scene.get_agents_count(), np.count_nonzero(scene._kind == AGENT)
+                )
+                self.assertEqual(
+                    scene._free_count, np.count_nonzero(scene._kind == EMPTY)
+                )
+
+            return (
+                scene._kind.copy(),
+                scene._amount.copy(),
+                scene.get_agents_ate_count(),
+                scene.get_spawned_from(),
+            )
+
+    def test_run_does_not_depend_on_workers(self):
+        serial = self._run(workers=1, ticks=60)
+        parallel = self._run(workers=2, ticks=60)
+
+        self.assertTrue(np.array_equal(serial[0], parallel[0]))
+        self.assertTrue(np.array_equal(serial[1], parallel[1]))
+        self.assertEqual(serial[2:], parallel[2:])
+        self.assertGreater(serial[2], 0)
+
+    def test_interior_is_far_from_inner_tile_edges(self):
+        config = SceneConfig(width=13, height=6, initial_agents=0, initial_food=0)
+
+        with ParallelNumpyScene(config, workers=1, tile_size=6) as scene:
+            is_interior = scene._is_interior.reshape(6, 13)
+
+            # tiles split the row at x=6 and x=12, the map isn't split vertically
+            self.assertEqual(
+                is_interior[0].tolist(),
+                [True] * 4 + [False] * 4 + [True] * 2 + [False] * 3,
+            )
+            self.assertTrue(is_interior[:, 0].all())
+
+    def test_tile_size_is_validated(self):
+        with self.assertRaises(ValueError):
+            ParallelNumpyScene(_CONFIG, tile_size=4)
+
+
+if __name__ == "__main__":
+    unittest.main()
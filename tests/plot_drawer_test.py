@@ -0,0 +1,53 @@
+import os
+import tempfile
+import unittest
+
+import matplotlib.pyplot as plt
+
+from csv_dumper import CSVDumper
+from data_dumper import DataDumpInfo
+from plot_drawer import CSVPlotDrawer
+
+
+class TestCSVPlotDrawer(unittest.TestCase):
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self._file_path = os.path.join(self._directory.name, "stat.csv")
+        self._plot_directory = os.path.join(self._directory.name, "plots")
+
+    def tearDown(self):
+        plt.close("all")
+        self._directory.cleanup()
+
+    def test_plots_every_column(self):
+        with CSVDumper(self._file_path) as dumper:
+            for tick in range(5):
+                dumper.dump(DataDumpInfo(tick, tick * 2, 0, 1))
+
+        CSVPlotDrawer(self._file_path, self._plot_directory).draw()
+
+        self.assertEqual(
+            sorted(os.listdir(self._plot_directory)),
+            [
+                "agents_left.png",
+                "combined.png",
+                "eaten_agents.png",
+                "max_agents_level.png",
+                "spawned_agents.png",
+            ],
+        )
+
+    def test_single_column(self):
+        with open(self._file_path, "w") as file:
+            file.write("agents_left\n3\n2\n1.5\n")
+
+        CSVPlotDrawer(self._file_path, self._plot_directory).draw()
+
+        self.assertEqual(
+            sorted(os.listdir(self._plot_directory)),
+            ["agents_left.png", "combined.png"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
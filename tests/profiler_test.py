@@ -0,0 +1,161 @@
+import os
+import tempfile
+import unittest
+
+from agent import Agent
+from data_dumper import NullDataDumper
+from food import Food
+from game import Game
+from null_client import NullGraphicalClient
+from numpy_scene import NumpyScene
+from profiler import TickProfiler
+from scene import Scene
+from scene_config import SceneConfig
+
+
+class TestTickProfiler(unittest.TestCase):
+    def test_records_nested_phases(self):
+        profiler = TickProfiler()
+
+        for _ in range(3):
+            with profiler.phase("tick"):
+                with profiler.phase("scene"):
+                    pass
+
+                profiler.start("dump")
+                profiler.stop()
+
+        calls = profiler.get_calls()
+        totals = profiler.get_totals()
+        self_times = profiler.get_self_times()
+
+        self.assertEqual(
+            calls, {("tick",): 3, ("tick", "scene"): 3, ("tick", "dump"): 3}
+        )
+        self.assertGreaterEqual(
+            totals[("tick",)], totals[("tick", "scene")] + totals[("tick", "dump")]
+        )
+        self.assertAlmostEqual(
+            self_times[("tick",)],
+            totals[("tick",)] - totals[("tick", "scene")] - totals[("tick", "dump")],
+        )
+
+    def test_phase_is_stopped_on_error(self):
+        profiler = TickProfiler()
+
+        with self.assertRaises(ValueError):
+            with profiler.phase("tick"):
+                raise ValueError()
+
+        with profiler.phase("next"):
+            pass
+
+        self.assertEqual(profiler.get_calls(), {("tick",): 1, ("next",): 1})
+
+    def test_counts_instrumented_queries(self):
+        config = SceneConfig(width=5, height=5, initial_agents=0, initial_food=1)
+        scene = Scene(config)
+        other_scene = Scene(config)
+        scene.add_game_object(Food((3, 3), 1, scene), (3, 3))
+
+        profiler = TickProfiler()
+        profiler.instrument_queries(scene)
+
+        with profiler.phase("tick"):
+            self.assertEqual(scene.get_nearest_food_coords_by_radius((1, 1), 2), (3, 3))
+            self.assertTrue(scene.is_food_near_coords((2, 2)))
+            other_scene.is_food_near_coords((2, 2))
+
+        self.assertEqual(
+            profiler.get_calls(),
+            {
+                ("tick",): 1,
+                ("tick", "get_nearest_food_coords_by_radius"): 1,
+                ("tick", "is_food_near_coords"): 1,
+            },
+        )
+        self.assertIn("get_nearest_food_coords_by_radius", profiler.get_summary())
+
+    def test_exports_folded_stacks(self):
+        profiler = TickProfiler()
+        profiler._totals = {("tick",): 0.003, ("tick", "scene"): 0.002}
+        profiler._calls = {("tick",): 1, ("tick", "scene"): 1}
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "profile.folded")
+            profiler.export_folded(path)
+
+            with open(path) as file:
+                self.assertEqual(file.read(), "tick 1000\ntick;scene 2000\n")
+
+
+class TestProfiledGame(unittest.TestCase):
+    def test_records_phases_of_scene(self):
+        profiler = TickProfiler()
+
+        Game(
+            NullGraphicalClient(),
+            NullDataDumper(),
+            SceneConfig(seed=3),
+            profiler=profiler,
+        ).run(max_ticks=20)
+
+        calls = profiler.get_calls()
+
+        self.assertEqual(calls[("setup",)], 1)
+        self.assertEqual(calls[("frame",)], 20)
+        self.assertEqual(calls[("frame", "tick")], 20)
+
+        for phase in ["render", "delay"]:
+            self.assertEqual(calls[("frame", phase)], 20)
+
+        for phase in ["dump", "scene"]:
+            self.assertEqual(calls[("frame", "tick", phase)], 20)
+
+        scene_phase = ("frame", "tick", "scene")
+
+        self.assertEqual(calls[(*scene_phase, "objects")], 20)
+        self.assertEqual(calls[(*scene_phase, "factories")], 20)
+        self.assertIn((*scene_phase, "objects", Agent.__name__), calls)
+        self.assertIn(
+            (
+                *scene_phase,
+                "objects",
+                Agent.__name__,
+                "get_nearest_food_coords_by_radius",
+            ),
+            calls,
+        )
+
+    def test_profiling_does_not_change_run(self):
+        config = SceneConfig(seed=5)
+
+        plain = Game(NullGraphicalClient(), NullDataDumper(), config).run(max_ticks=100)
+        profiled = Game(
+            NullGraphicalClient(), NullDataDumper(), config, profiler=TickProfiler()
+        ).run(max_ticks=100)
+
+        self.assertEqual(
+            (plain.agents_left, plain.eaten_agents, plain.spawned_agents),
+            (profiled.agents_left, profiled.eaten_agents, profiled.spawned_agents),
+        )
+
+    def test_records_phases_of_numpy_scene(self):
+        profiler = TickProfiler()
+
+        Game(
+            NullGraphicalClient(),
+            NullDataDumper(),
+            SceneConfig(seed=3),
+            NumpyScene,
+            profiler,
+        ).run(max_ticks=10)
+
+        calls = profiler.get_calls()
+
+        for phase in ["agents", "food", "factories"]:
+            self.assertEqual(calls[("frame", "tick", "scene", phase)], 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+import os
+import unittest
+from unittest.mock import patch
+
+from agent import AgentFactory
+from food import Food
+from pygame_client import _AGENT_COLOR, _MIN_CELL_SIZE, PygameClient
+from scene import Scene
+from scene_config import SceneConfig
+
+
+# the display is opened without a window
+@patch.dict(os.environ, {"SDL_VIDEODRIVER": "dummy"})
+class TestPygameClient(unittest.TestCase):
+    def test_map_larger_than_surface(self):
+        scene = Scene(
+            SceneConfig(width=1000, height=1000, initial_agents=0, initial_food=0)
+        )
+        agent_factory = AgentFactory(scene)
+        agent_factory.spawn((2, 3))
+        scene.add_game_object(Food((900, 900), 1, scene), (900, 900))
+
+        client = PygameClient(scene)
+        client.update()
+
+        self.assertEqual(client._get_grid_dims(), (_MIN_CELL_SIZE, _MIN_CELL_SIZE))
+        self.assertEqual(client._get_visible_size(), (150, 150))
+
+        cell_colors = {
+            tuple(client._scene_surface.get_at((x, y)))[:3]
+            for x in range(2 * _MIN_CELL_SIZE, 3 * _MIN_CELL_SIZE)
+            for y in range(3 * _MIN_CELL_SIZE, 4 * _MIN_CELL_SIZE)
+        }
+        self.assertIn(_AGENT_COLOR, cell_colors)
+
+        # changes out of the viewport are skipped
+        agent_factory.spawn((999, 999))
+        scene.add_game_object(Food((1, 1), 1, scene), (1, 1))
+        client.update()
+
+
+if __name__ == "__main__":
+    unittest.main()
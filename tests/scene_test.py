@@ -1,6 +1,17 @@
+import json
+import os
+import random
+import struct
+import tempfile
 import unittest
+from itertools import product
 
-from scene import Scene
+from agent import Agent, AgentFactory
+from food import Food, FoodFactory
+from game_object import GameObject
+from occupancy_grid import AGENT, EMPTY, FOOD
+from scene import InvalidSnapshotException, Scene
+from scene_config import InvalidSceneConfigException, SceneConfig, TelemetryGroup
 
 scene = Scene()
 
@@ -8,7 +19,7 @@ scene = Scene()
 class TestScene(unittest.TestCase):
     def test_square_coords_rad_one(self):
         self.assertListEqual(
-            sorted(scene._get_square_coords((0, 0), 1)),
+            sorted(scene.get_square_coords((0, 0), 1)),
             sorted(
                 [
                     (-1, -1),
@@ -25,11 +36,11 @@ class TestScene(unittest.TestCase):
 
     def test_square_coords_rad_two(self):
         print(
-            scene._get_square_coords((0, 0), 2),
+            scene.get_square_coords((0, 0), 2),
         )
 
         self.assertListEqual(
-            sorted(scene._get_square_coords((0, 0), 2)),
+            sorted(scene.get_square_coords((0, 0), 2)),
             sorted(
                 [
                     (-2, -2),
@@ -52,6 +63,628 @@ class TestScene(unittest.TestCase):
             ),
         )
 
+    def test_square_coords_keep_scan_order(self):
+        for radius in range(4):
+            expected = [
+                (5 + dx, 7 + dy)
+                for dx, dy in product(range(-radius, radius + 1), repeat=2)
+                if max(abs(dx), abs(dy)) == radius
+            ]
+
+            with self.subTest(radius=radius):
+                self.assertEqual(scene.get_square_coords((5, 7), radius), expected)
+
+    def test_square_coords_in_bounds(self):
+        small_scene = Scene(SceneConfig(width=6, height=4, initial_food=0))
+
+        for coords, radius in product(product(range(6), range(4)), range(1, 4)):
+            expected = [
+                (x, y)
+                for x, y in small_scene.get_square_coords(coords, radius)
+                if 0 <= x < 6 and 0 <= y < 4
+            ]
+
+            with self.subTest(coords=coords, radius=radius):
+                self.assertEqual(
+                    small_scene.get_square_coords_in_bounds(coords, radius), expected
+                )
+
+
+class TestSceneNeighborhood(unittest.TestCase):
+    def setUp(self):
+        self.scene = Scene()
+        self.agent_factory = AgentFactory(self.scene)
+
+    def _add_food(self, coords):
+        self.scene.add_game_object(Food(coords, 1, self.scene), coords)
+
+    def test_nearest_food_prefers_closest_ring(self):
+        self._add_food((10, 14))
+        self._add_food((12, 11))
+
+        self.assertEqual(
+            self.scene.get_nearest_food_coords_by_radius((10, 10), 5), (12, 11)
+        )
+
+    def test_nearest_food_keeps_ring_scan_order(self):
+        self._add_food((11, 9))
+        self._add_food((9, 11))
+        self._add_food((10, 9))
+
+        self.assertEqual(
+            self.scene.get_nearest_food_coords_by_radius((10, 10), 1), (9, 11)
+        )
+
+    def test_nearest_food_out_of_radius(self):
+        self._add_food((15, 10))
+
+        self.assertIsNone(self.scene.get_nearest_food_coords_by_radius((10, 10), 4))
+        self.assertEqual(
+            self.scene.get_nearest_food_coords_by_radius((10, 10), 5), (15, 10)
+        )
+
+    def test_food_near_follows_removal(self):
+        self._add_food((0, 1))
+        food = self.scene.get_map()[1][0]
+
+        self.assertTrue(self.scene.is_food_near_coords((1, 1)))
+
+        self.scene.remove_game_object(food)
+
+        self.assertFalse(self.scene.is_food_near_coords((1, 1)))
+
+    def test_agent_near_follows_moves(self):
+        self.agent_factory.spawn((5, 5))
+        agent = self.scene.get_map()[5][5]
+
+        self.assertTrue(self.scene.is_agent_near((6, 6)))
+        self.assertFalse(self.scene.is_agent_near((5, 5)))
+
+        agent._coords = (5, 6)
+        self.scene.move_game_object((5, 5), (5, 6))
+
+        self.assertFalse(self.scene.is_agent_near((5, 8)))
+        self.assertTrue(self.scene.is_agent_near((5, 7)))
+        self.assertIsInstance(self.scene.get_agent_in_coords((5, 6)), Agent)
+
+
+class TestSceneGrid(unittest.TestCase):
+    def setUp(self):
+        self.scene = Scene(SceneConfig(width=5, height=4, initial_agents=0))
+        self.agent_factory = AgentFactory(self.scene)
+
+    def test_cell_kinds_follow_objects(self):
+        food = Food((3, 0), 1, self.scene)
+        self.scene.add_game_object(food, (3, 0))
+        self.agent_factory.spawn((1, 2))
+        agent = self.scene.get_agent_in_coords((1, 2))
+
+        agent._coords = (2, 2)
+        self.scene.move_game_object((1, 2), (2, 2))
+
+        kinds = self.scene.get_cell_kinds()
+
+        self.assertEqual(kinds[3], FOOD)
+        self.assertEqual(kinds[2 * 5 + 1], EMPTY)
+        self.assertEqual(kinds[2 * 5 + 2], AGENT)
+        self.assertEqual(kinds.count(EMPTY), 18)
+
+        self.scene.remove_game_object(food)
+
+        self.assertEqual(kinds[3], EMPTY)
+        self.assertFalse(self.scene.is_cell_empty((2, 2)))
+        self.assertFalse(self.scene.is_cell_empty((5, 0)))
+
+    def test_map_view(self):
+        self.agent_factory.spawn((1, 2))
+        scene_map = self.scene.get_map()
+        agent = self.scene.get_agent_in_coords((1, 2))
+
+        self.assertEqual((len(scene_map), len(scene_map[0])), (4, 5))
+        self.assertIs(scene_map[2][1], agent)
+        self.assertIs(scene_map[-2][-4], agent)
+        self.assertEqual(list(scene_map[2]), [None, agent, None, None, None])
+        self.assertEqual(scene_map[2][1:3], [agent, None])
+        self.assertEqual([row[1] for row in scene_map[1:3]], [None, agent])
+
+        with self.assertRaises(IndexError):
+            scene_map[4]
+
+        with self.assertRaises(IndexError):
+            scene_map[0][5]
+
+        self.scene.remove_game_object(agent)
+
+        self.assertIsNone(scene_map[2][1])
+
+
+class TestSceneCounters(unittest.TestCase):
+    def setUp(self):
+        self.scene = Scene()
+        self.agent_factory = AgentFactory(self.scene)
+
+    def _spawn(self, coords, level):
+        agent = Agent(coords, self.scene, self.agent_factory, level=level)
+        self.agent_factory.spawn(coords, agent)
+
+        return agent
+
+    def test_count_and_max_level_follow_removal(self):
+        self._spawn((0, 0), 1)
+        first = self._spawn((5, 5), 3)
+        second = self._spawn((7, 7), 3)
+
+        self.assertEqual(self.scene.get_agents_count(), 3)
+        self.assertEqual(self.scene.get_max_agents_level(), 3)
+
+        self.scene.remove_game_object(first)
+        self.assertEqual(self.scene.get_max_agents_level(), 3)
+
+        self.scene.remove_game_object(second)
+        self.assertEqual(self.scene.get_agents_count(), 1)
+        self.assertEqual(self.scene.get_max_agents_level(), 1)
+
+    def test_max_level_follows_levelup(self):
+        agent = self._spawn((0, 0), 1)
+        self._spawn((5, 5), 2)
+
+        agent._levelup()
+        agent._levelup()
+
+        self.assertEqual(self.scene.get_max_agents_level(), 3)
+
+        self.scene.remove_game_object(agent)
+        agent._levelup()
+
+        self.assertEqual(self.scene.get_max_agents_level(), 2)
+
+    def test_removing_twice_counts_once(self):
+        agent = self._spawn((0, 0), 1)
+
+        self.scene.remove_game_object(agent)
+        self.scene.remove_game_object(agent)
+
+        self.assertEqual(self.scene.get_agents_count(), 0)
+        self.assertEqual(self.scene.get_max_agents_level(), 0)
+
+    def test_telemetry_counters(self):
+        self.scene = Scene(SceneConfig(telemetry=frozenset(TelemetryGroup)))
+        self.agent_factory = AgentFactory(self.scene)
+
+        first = self._spawn((0, 0), 1)
+        self._spawn((5, 5), 3)
+        food = Food((9, 9), 2, self.scene)
+        self.scene.add_game_object(food, (9, 9))
+        self.scene.add_game_object(Food((9, 8), 2, self.scene), (9, 8))
+
+        self.assertEqual(self.scene.get_births_count(), 2)
+        self.assertEqual(self.scene.get_food_levels(), {2: 2})
+        self.assertEqual(self.scene.get_agents_levels(), {1: 1, 3: 1})
+        self.assertAlmostEqual(self.scene.get_mean_saturation(), (8 + 24) / 2)
+
+        # counters of a tick are reset at its start
+        first._saturation = 0
+        self.scene.remove_game_object(food)
+        self.scene.update()
+
+        self.assertEqual(self.scene.get_births_count(), 0)
+        self.assertEqual(self.scene.get_deaths_count(), 1)
+        self.assertEqual(self.scene.get_food_levels(), {2: 1})
+
+    def test_disabled_telemetry_isnt_counted(self):
+        self._spawn((0, 0), 1)
+        self.scene.add_game_object(Food((9, 9), 2, self.scene), (9, 9))
+
+        self.assertEqual(self.scene.get_births_count(), 0)
+        self.assertEqual(self.scene.get_food_levels(), {})
+        self.assertEqual(self.scene.get_mean_saturation(), 0.0)
+        self.assertEqual(self.scene._saturation_sum, 0.0)
+
+
+class TestRandomCellPicker(unittest.TestCase):
+    def setUp(self):
+        self.scene = Scene(SceneConfig(width=6, height=5))
+
+    def _fill_except(self, free_cells):
+        for y in range(self.scene.get_height()):
+            for x in range(self.scene.get_width()):
+                if (x, y) not in free_cells:
+                    self.scene.add_game_object(Food((x, y), 1, self.scene), (x, y))
+
+    def test_random_cells_are_distinct_and_empty(self):
+        self._fill_except({(0, 0), (1, 0), (2, 0), (3, 4), (5, 4)})
+
+        cells = self.scene.get_random_empty_cells(4)
+
+        self.assertEqual(len(set(cells)), 4)
+        self.assertTrue(all(self.scene.is_cell_empty(c) for c in cells))
+
+    def test_nearly_full_map(self):
+        self._fill_except({(4, 3)})
+
+        self.assertEqual(self.scene.get_random_empty_cell(), (4, 3))
+        self.assertEqual(self.scene.get_random_empty_cells(3), [(4, 3)])
+
+    def test_full_map(self):
+        self._fill_except(set())
+
+        self.assertIsNone(self.scene.get_random_empty_cell())
+        self.assertEqual(self.scene.get_random_empty_cells(2), [])
+
+    def test_freed_cell_can_be_picked(self):
+        self._fill_except(set())
+        food = self.scene.get_map()[2][1]
+
+        self.scene.remove_game_object(food)
+
+        self.assertEqual(self.scene.get_random_empty_cell(), (1, 2))
+
+    def test_sparse_map(self):
+        scene = Scene(SceneConfig(width=100, height=100))
+
+        cells = scene.get_random_empty_cells(50)
+
+        self.assertEqual(len(set(cells)), 50)
+
+
+class ScriptedObject(GameObject):
+    def __init__(self, coords, scene, log, action=None):
+        super().__init__(coords)
+        self.scene = scene
+        self.log = log
+        self.action = action
+
+    def update(self):
+        self.log.append(self.get_coords())
+
+        if self.action:
+            self.action()
+
+
+class TestSceneUpdateOrder(unittest.TestCase):
+    def setUp(self):
+        self.scene = Scene()
+        self.log = []
+
+    def _add(self, coords, action=None):
+        game_object = ScriptedObject(coords, self.scene, self.log, action)
+        self.scene.add_game_object(game_object, coords)
+
+        return game_object
+
+    def test_row_major_order(self):
+        self._add((3, 1))
+        self._add((0, 2))
+        self._add((5, 0))
+
+        self.scene.update()
+
+        self.assertEqual(self.log, [(5, 0), (3, 1), (0, 2)])
+
+    def test_removed_object_does_not_act(self):
+        victim = self._add((4, 4))
+        self._add((0, 0), lambda: self.scene.remove_game_object(victim))
+
+        self.scene.update()
+
+        self.assertEqual(self.log, [(0, 0)])
+
+    def test_added_object_acts_next_tick(self):
+        spawner = self._add((1, 0), lambda: self._add((0, 5)))
+
+        self.scene.update()
+        self.assertEqual(self.log, [(1, 0)])
+
+        spawner.action = None
+        self.log.clear()
+        self.scene.update()
+        self.assertEqual(self.log, [(1, 0), (0, 5)])
+
+
+class TestSceneSleeping(unittest.TestCase):
+    def setUp(self):
+        self.scene = Scene(SceneConfig(food_spawn_rate=0))
+        self.agent_factory = AgentFactory(self.scene)
+
+    def _spawn(self, coords, saturation):
+        agent = Agent(coords, self.scene, self.agent_factory)
+        agent._saturation = saturation
+        self.agent_factory.spawn(coords, agent)
+
+        return agent
+
+    def test_lonely_food_decays_asleep(self):
+        food = Food((5, 5), 2, self.scene)
+        self.scene.add_game_object(food, (5, 5))
+        capacity = food.get_capacity()
+
+        self.scene.update()
+        capacity -= food.get_exhaustion()
+        self.assertEqual(self.scene.get_sleeping_count(), 1)
+
+        while capacity - food.get_exhaustion() > 0:
+            self.scene.update()
+            capacity -= food.get_exhaustion()
+            self.assertEqual(food.get_capacity(), capacity)
+
+        self.scene.update()
+
+        self.assertIsNone(self.scene.get_map()[5][5])
+        self.assertEqual(self.scene.get_sleeping_count(), 0)
+
+    def test_agent_wakes_food_next_to_it(self):
+        self.scene.add_game_object(Food((5, 5), 2, self.scene), (5, 5))
+        self.scene.update()
+
+        self._spawn((9, 9), 5)
+        self.assertEqual(self.scene.get_sleeping_count(), 1)
+
+        self._spawn((6, 6), 5)
+        self.assertEqual(self.scene.get_sleeping_count(), 0)
+
+    def test_food_in_sight_wakes_exhausted_agent(self):
+        agent = self._spawn((2, 2), 1)
+        saturation = 1
+
+        for _ in range(4):
+            self.scene.update()
+            saturation -= agent.get_waitng_hunger()
+
+        self.assertEqual(self.scene.get_sleeping_count(), 1)
+        self.assertEqual(agent.get_saturation(), saturation)
+
+        self.scene.add_game_object(Food((7, 2), 1, self.scene), (7, 2))
+        self.assertEqual(self.scene.get_sleeping_count(), 1)
+
+        self.scene.add_game_object(Food((6, 2), 1, self.scene), (6, 2))
+        self.assertEqual(self.scene.get_sleeping_count(), 0)
+
+        self.scene.update()
+        self.assertEqual(agent.get_coords(), (3, 2))
+
+    def test_mean_saturation_counts_skipped_hunger(self):
+        telemetry = frozenset({TelemetryGroup.MEAN_SATURATION})
+        self.scene = Scene(SceneConfig(food_spawn_rate=0, telemetry=telemetry))
+        self.agent_factory = AgentFactory(self.scene)
+
+        sleeping = self._spawn((2, 2), 2)
+        awake = self._spawn((15, 15), 5)
+        sleeping_saturation = 2
+
+        for _ in range(5):
+            self.scene.update()
+            sleeping_saturation -= sleeping.get_waitng_hunger()
+
+        self.assertEqual(self.scene.get_sleeping_count(), 1)
+        self.assertAlmostEqual(
+            self.scene.get_mean_saturation(),
+            (sleeping_saturation + awake.get_saturation()) / 2,
+        )
+
+        self.scene.remove_game_object(sleeping)
+
+        self.assertAlmostEqual(self.scene.get_mean_saturation(), awake.get_saturation())
+
+    def test_sleeping_agent_dies_on_time(self):
+        self._spawn((2, 2), 0.02)
+
+        for _ in range(3):
+            self.scene.update()
+
+        self.assertEqual(self.scene.get_agents_count(), 1)
+
+        self.scene.update()
+
+        self.assertEqual(self.scene.get_agents_count(), 0)
+        self.assertEqual(self.scene.get_sleeping_count(), 0)
+
+
+class TestSceneConfig(unittest.TestCase):
+    def test_scene_dimensions(self):
+        scene = Scene(SceneConfig(width=30, height=12))
+
+        self.assertEqual(scene.get_width(), 30)
+        self.assertEqual(scene.get_height(), 12)
+        self.assertEqual(len(scene.get_map()), 12)
+        self.assertEqual(len(scene.get_map()[0]), 30)
+
+    def test_population_should_fit_map(self):
+        with self.assertRaises(InvalidSceneConfigException):
+            SceneConfig(width=3, height=3, initial_agents=5, initial_food=5)
+
+    def test_fractional_food_spawn_rate(self):
+        scene = Scene(SceneConfig(initial_agents=0, food_spawn_rate=0.5))
+        FoodFactory(scene)
+
+        scene.update()
+        self.assertEqual(len(scene._food_index), 0)
+
+        scene.update()
+        self.assertEqual(len(scene._food_index), 1)
+
+    def test_seeded_run_does_not_depend_on_global_random(self):
+        def run(global_seed):
+            random.seed(global_seed)
+            scene = Scene(SceneConfig(seed=4))
+            AgentFactory(scene).spawn_initial()
+            FoodFactory(scene).spawn_initial()
+
+            for _ in range(50):
+                scene.update()
+
+            return [
+                [(type(obj), obj.get_level()) if obj else None for obj in row]
+                for row in scene.get_map()
+            ]
+
+        self.assertEqual(run(global_seed=1), run(global_seed=2))
+
+    def test_scenes_have_independent_randoms(self):
+        first = Scene(SceneConfig(seed=4))
+        second = Scene(SceneConfig(seed=4))
+
+        first.get_random().random()
+
+        self.assertNotEqual(
+            first.get_random().getstate(), second.get_random().getstate()
+        )
+
+
+def _get_state(scene: Scene) -> tuple:
+    objects = [
+        (
+            type(obj).__name__,
+            obj.get_coords(),
+            obj.get_level(),
+            obj.get_saturation() if isinstance(obj, Agent) else obj.get_capacity(),
+            obj.get_experience() if isinstance(obj, Agent) else None,
+        )
+        for row in scene.get_map()
+        for obj in row
+        if obj
+    ]
+
+    return (
+        objects,
+        scene.get_ticks(),
+        scene.get_agents_count(),
+        scene.get_agents_ate_count(),
+        scene.get_spawned_from(),
+        scene.get_agents_levels(),
+        scene.get_food_levels(),
+        scene.get_births_count(),
+        scene.get_deaths_count(),
+    )
+
+
+class TestSceneDirtyCells(unittest.TestCase):
+    def _get_cells(self, scene: Scene) -> dict:
+        return {
+            (x, y): (type(obj), obj.get_level())
+            for y, row in enumerate(scene.get_map())
+            for x, obj in enumerate(row)
+            if obj
+        }
+
+    def test_dirty_cells_cover_changes(self):
+        scene = Scene(SceneConfig(seed=4, food_spawn_rate=2))
+        AgentFactory(scene).spawn_initial()
+        FoodFactory(scene).spawn_initial()
+
+        self.assertEqual(scene.pop_dirty_cells(), set())
+
+        scene.track_dirty_cells()
+        cells = self._get_cells(scene)
+
+        for _ in range(60):
+            scene.update()
+            current = self._get_cells(scene)
+            changed = {
+                coords
+                for coords in cells.keys() | current.keys()
+                if cells.get(coords) != current.get(coords)
+            }
+
+            self.assertLessEqual(changed, scene.pop_dirty_cells())
+            self.assertEqual(scene.pop_dirty_cells(), set())
+
+            cells = current
+
+
+class TestSceneSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "scene.snapshot")
+
+        telemetry = frozenset(
+            {TelemetryGroup.FOOD_LEVELS, TelemetryGroup.BIRTHS_AND_DEATHS}
+        )
+        self.scene = Scene(
+            SceneConfig(seed=6, food_spawn_rate=1.5, telemetry=telemetry)
+        )
+        AgentFactory(self.scene).spawn_initial()
+        FoodFactory(self.scene).spawn_initial()
+
+        for _ in range(40):
+            self.scene.update()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _run(self, scene: Scene, ticks: int) -> tuple:
+        for _ in range(ticks):
+            scene.update()
+
+        return _get_state(scene)
+
+    def test_restored_scene_continues_the_run(self):
+        self.scene.save_snapshot(self.path)
+        restored = Scene.load_snapshot(self.path)
+
+        self.assertEqual(restored.get_config(), self.scene.get_config())
+        self.assertEqual(_get_state(restored), _get_state(self.scene))
+        self.assertEqual(self._run(restored, 100), self._run(self.scene, 100))
+
+    def test_forks_with_new_seed(self):
+        self.scene.save_snapshot(self.path)
+
+        first = Scene.load_snapshot(self.path, seed=1)
+        second = Scene.load_snapshot(self.path, seed=1)
+
+        self.assertEqual(self._run(first, 50), self._run(second, 50))
+
+    def test_invalid_snapshots(self):
+        self.scene.save_snapshot(self.path)
+
+        with open(self.path, "rb") as file:
+            data = file.read()
+
+        version = struct.pack("<H", 99)
+        invalid_data = [b"", b"not a snapshot", data[:8] + version + data[10:]]
+        invalid_data.append(data[:-1])
+        invalid_data.append(data[:20])
+
+        for invalid in invalid_data:
+            with open(self.path, "wb") as file:
+                file.write(invalid)
+
+            with self.subTest(data=invalid[:12]):
+                with self.assertRaises(InvalidSnapshotException):
+                    Scene.load_snapshot(self.path)
+
+    def test_invalid_headers(self):
+        self.scene.save_snapshot(self.path)
+
+        with open(self.path, "rb") as file:
+            data = file.read()
+
+        (header_size,) = struct.unpack_from("<I", data, 10)
+        header = json.loads(data[14 : 14 + header_size])
+        objects = data[14 + header_size :]
+
+        invalid_headers = [
+            [],
+            {key: value for key, value in header.items() if key != "objects"},
+            {key: value for key, value in header.items() if key != "config"},
+            header | {"ticks": "40"},
+            header | {"config": header["config"] | {"speed": 1}},
+            header | {"config": header["config"] | {"width": -1}},
+            header | {"config": header["config"] | {"telemetry": ["unknown"]}},
+            header | {"factories": [["AgentFactory"]]},
+            header | {"random_state": [3]},
+        ]
+
+        for invalid in invalid_headers:
+            encoded = json.dumps(invalid).encode()
+
+            with open(self.path, "wb") as file:
+                file.write(data[:10] + struct.pack("<I", len(encoded)))
+                file.write(encoded + objects)
+
+            with self.subTest(header=invalid):
+                with self.assertRaises(InvalidSnapshotException):
+                    Scene.load_snapshot(self.path)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,104 @@
+import unittest
+
+from agent import Agent, AgentFactory
+from food import Food, FoodFactory
+from numpy_scene import NumpyScene
+from scene import Scene
+from scene_config import SceneConfig
+from spawn_distribution import (
+    ClusteredDistribution,
+    DensityMaskDistribution,
+    UniformDistribution,
+)
+
+_CONFIG = SceneConfig(width=30, height=20, initial_agents=0, initial_food=0, seed=4)
+
+
+class TestSpawnDistributions(unittest.TestCase):
+    def setUp(self):
+        self.scene = Scene(_CONFIG)
+        FoodFactory(self.scene).spawn_bunch(100)
+
+    def _assert_empty_and_distinct(self, cells):
+        self.assertEqual(len(set(cells)), len(cells))
+        self.assertTrue(all(self.scene.is_cell_empty(c) for c in cells))
+
+    def test_uniform(self):
+        cells = UniformDistribution().sample(self.scene, 50)
+
+        self.assertEqual(len(cells), 50)
+        self._assert_empty_and_distinct(cells)
+
+    def test_clustered(self):
+        cells = ClusteredDistribution(clusters=1, spread=1.5).sample(self.scene, 8)
+        center_x = sum(x for x, _ in cells) / len(cells)
+        center_y = sum(y for _, y in cells) / len(cells)
+
+        self.assertEqual(len(cells), 8)
+        self._assert_empty_and_distinct(cells)
+        self.assertTrue(
+            all(abs(x - center_x) < 8 and abs(y - center_y) < 8 for x, y in cells)
+        )
+
+    def test_crowded_cluster_gets_fewer_objects(self):
+        cells = ClusteredDistribution(clusters=1, spread=0.1).sample(self.scene, 5)
+
+        self.assertLessEqual(len(cells), 1)
+
+    def test_density_mask(self):
+        mask = [[1.0 if x < 5 else 0.0 for x in range(30)] for _ in range(20)]
+        cells = DensityMaskDistribution(mask).sample(self.scene, 1000)
+        free_cells = [
+            (x, y)
+            for y in range(20)
+            for x in range(5)
+            if self.scene.is_cell_empty((x, y))
+        ]
+
+        self.assertEqual(sorted(cells), sorted(free_cells))
+
+    def test_density_mask_should_fit_map(self):
+        with self.assertRaises(ValueError):
+            DensityMaskDistribution([[1.0] * 30]).sample(self.scene, 1)
+
+
+class TestBulkSpawn(unittest.TestCase):
+    def test_factories_spawn_by_distribution(self):
+        for scene_class in [Scene, NumpyScene]:
+            scene = scene_class(_CONFIG)
+            mask = [[float(y == 3) for _ in range(30)] for y in range(20)]
+
+            AgentFactory(scene).spawn_radom(10, DensityMaskDistribution(mask))
+            FoodFactory(scene).spawn_bunch(15, ClusteredDistribution(2, 3.0))
+
+            agents = [
+                (x, y)
+                for y, row in enumerate(scene.get_map())
+                for x, obj in enumerate(row)
+                if isinstance(obj, Agent)
+            ]
+
+            with self.subTest(scene=scene_class.__name__):
+                self.assertEqual(scene.get_agents_count(), 10)
+                self.assertTrue(all(y == 3 for _, y in agents))
+
+    def test_failed_batch_adds_nothing(self):
+        for scene_class in [Scene, NumpyScene]:
+            scene = scene_class(_CONFIG)
+            scene.add_game_object(Food((2, 2), 1, scene), (2, 2))
+            agent_factory = AgentFactory(scene)
+
+            for objects in [
+                [Agent((1, 1), scene, agent_factory), Food((2, 2), 1, scene)],
+                [Agent((1, 1), scene, agent_factory), Food((1, 1), 1, scene)],
+            ]:
+                with self.subTest(scene=scene_class.__name__):
+                    with self.assertRaises(ValueError):
+                        scene.add_game_objects(objects)
+
+                    self.assertTrue(scene.is_cell_empty((1, 1)))
+                    self.assertEqual(scene.get_agents_count(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
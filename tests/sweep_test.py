@@ -0,0 +1,111 @@
+import json
+import os
+import tempfile
+import unittest
+
+from numpy_scene import NumpyScene
+from sweep import (
+    InvalidGridException,
+    InvalidResultsException,
+    expand_grid,
+    run_sweep,
+)
+
+_GRID = {"initial_agents": [5, 10], "food_spawn_rate": [1.0, 2.0]}
+
+
+class TestExpandGrid(unittest.TestCase):
+    def test_every_combination_is_repeated(self):
+        runs = expand_grid(_GRID, repeats=3)
+
+        self.assertEqual(len(runs), 12)
+        self.assertEqual(len({run.run_id for run in runs}), 12)
+        self.assertEqual(len({run.seed for run in runs}), 12)
+
+    def test_seeds_are_stable(self):
+        first = expand_grid(_GRID, repeats=2, seed=1)
+        second = expand_grid(_GRID, repeats=2, seed=1)
+        other = expand_grid(_GRID, repeats=2, seed=2)
+
+        self.assertEqual(first, second)
+        self.assertNotEqual([run.seed for run in first], [run.seed for run in other])
+
+    def test_invalid_grids(self):
+        for grid in [
+            {"speed": [1]},
+            {"seed": [1, 2]},
+            {"width": []},
+            {"width": [2], "height": [2]},
+        ]:
+            with self.subTest(grid=grid), self.assertRaises(InvalidGridException):
+                expand_grid(grid)
+
+
+class TestRunSweep(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "results.jsonl")
+        self.runs = expand_grid(_GRID, repeats=2)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _read(self) -> list[dict]:
+        with open(self.path) as file:
+            return [json.loads(line) for line in file]
+
+    def test_writes_a_line_per_run(self):
+        done = run_sweep(self.runs, self.path, max_ticks=20, workers=2)
+        results = self._read()
+
+        self.assertEqual(done, 8)
+        self.assertEqual(
+            sorted(result["run_id"] for result in results),
+            sorted(run.run_id for run in self.runs),
+        )
+        self.assertTrue(all(result["ticks"] == 20 for result in results))
+
+    def test_results_do_not_depend_on_workers(self):
+        run_sweep(self.runs, self.path, max_ticks=30, workers=2)
+        parallel = {result["run_id"]: result for result in self._read()}
+        os.remove(self.path)
+
+        run_sweep(self.runs, self.path, max_ticks=30, workers=1)
+        serial = {result["run_id"]: result for result in self._read()}
+
+        for run_id, result in serial.items():
+            self.assertEqual(result["agents_left"], parallel[run_id]["agents_left"])
+            self.assertEqual(result["eaten_agents"], parallel[run_id]["eaten_agents"])
+
+    def test_resumes_interrupted_sweep(self):
+        run_sweep(self.runs[:3], self.path, max_ticks=10, workers=1)
+
+        # a line cut by an interrupted write
+        with open(self.path, "a") as file:
+            file.write('{"run_id": "initial_ag')
+
+        done = run_sweep(self.runs, self.path, max_ticks=10, workers=1)
+        results = self._read()
+
+        self.assertEqual(done, 5)
+        self.assertEqual(len(results), 8)
+        self.assertEqual(run_sweep(self.runs, self.path, max_ticks=10, workers=1), 0)
+
+    def test_refuses_to_resume_other_sweep(self):
+        run_sweep(self.runs[:3], self.path, max_ticks=10, workers=1)
+
+        for settings in [
+            {"max_ticks": 20},
+            {"max_ticks": 10, "until_extinct": True},
+            {"max_ticks": 10, "scene_class": NumpyScene},
+        ]:
+            with self.subTest(settings=settings):
+                with self.assertRaises(InvalidResultsException):
+                    run_sweep(self.runs, self.path, workers=1, **settings)
+
+        self.assertEqual(len(self._read()), 3)
+        self.assertTrue(all(result["max_ticks"] == 10 for result in self._read()))
+
+
+if __name__ == "__main__":
+    unittest.main()